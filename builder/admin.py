@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     CV, Experience, Education, Skill, Project, Certification, 
-    Language, Award, UploadedCV, AICoverLetter, CVAnalysis, Template
+    Language, Award, UploadedCV, AICoverLetter, CVAnalysis, Template, ProcessedDocument,
+    StoredBlob
 )
 
 @admin.register(CV)
@@ -35,6 +36,19 @@ class TemplateAdmin(admin.ModelAdmin):
     list_filter = ['type', 'style', 'is_default']
     search_fields = ['name', 'description']
 
+@admin.register(ProcessedDocument)
+class ProcessedDocumentAdmin(admin.ModelAdmin):
+    list_display = ['content_hash', 'mime_type', 'extractor_version', 'analyzer_version', 'hit_count', 'last_used_at']
+    list_filter = ['mime_type', 'extractor_version', 'analyzer_version']
+    search_fields = ['content_hash']
+    readonly_fields = ['created_at', 'last_used_at']
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'created_at']
+    search_fields = ['name']
+    readonly_fields = ['created_at']
+
 admin.site.register(Skill)
 admin.site.register(Certification)
 admin.site.register(Language)
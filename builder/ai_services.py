@@ -1,13 +1,29 @@
 from openai import OpenAI
 import os
+import re
 import logging
-import json
+import time
 from typing import Dict, List, Any
 import httpx
+from .model_router import get_router
+from .llm_schema import LLMSchema, CV_INSIGHTS_SCHEMA, CV_ANALYSIS_SCHEMA, record_metric
+from .cv_sections import CVSections, SECTION_NAMES
+from .keywords import (
+    MOCK_ANALYSIS_KEYWORDS, INDUSTRY_FOCUS_KEYWORDS, SENIORITY_KEYWORDS, MID_SENIOR_YEARS,
+    MID_YEARS, EDUCATION_LEVELS, scan_keywords
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Bump when analysis prompts or schemas change so cached analyses are redone
+ANALYZER_VERSION = '2'
+
+# Router route for field-repair follow-ups, kept apart so they don't skew the main routes' p95
+REPAIR_ROUTE = 'repair_json_fields'
+
+ACHIEVEMENT_NUMBER_PATTERN = re.compile(r'\d+%|\d+\s*years?|\d+\s*months?')
+
 class EnhancedAICoverLetterService:
     """Enhanced AI service for cover letter generation with CV analysis"""
     
@@ -28,9 +44,59 @@ class EnhancedAICoverLetterService:
         else:
             logger.warning("OPENAI_API_KEY is not configured or is a placeholder. Using mock AI services.")
 
-
+    def _chat_completion(self, route: str, prompt: str, input_text: str, temperature: float,
+                         max_tokens: int = None) -> str:
+        """Run a chat completion with the model and max_tokens picked by the router"""
+        router = get_router()
+        decision = router.route(route, input_text)
+        if max_tokens:
+            decision.max_tokens = max_tokens
+        start = time.monotonic()
+        try:
+            response = self.client.chat.completions.create(
+                model=decision.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=decision.max_tokens,
+                temperature=temperature
+            )
+        except Exception:
+            router.record(decision, (time.monotonic() - start) * 1000, ok=False)
+            raise
+        router.record(decision, (time.monotonic() - start) * 1000)
+        return response.choices[0].message.content
+    
+    def _complete_json(self, route: str, prompt: str, input_text: str, schema: LLMSchema,
+                       temperature: float) -> Dict[str, Any]:
+        """
+        Request JSON and validate it against a schema, keeping every valid field.
+        Missing or invalid fields are re-requested once with a small follow-up
+        prompt on REPAIR_ROUTE; anything still missing falls back to the schema
+        default, so every schema field is present and coerced to its type.
+        """
+        content = self._chat_completion(route, prompt, input_text, temperature)
+        result, missing = schema.parse(content)
+        if not missing:
+            record_metric(schema.name, 'complete')
+            return result
+        
+        logger.warning(f"{schema.name}: re-requesting missing fields {missing}")
+        record_metric(schema.name, 'field_repair')
+        try:
+            repair_content = self._chat_completion(
+                REPAIR_ROUTE, schema.repair_prompt(missing, input_text), input_text,
+                temperature, max_tokens=60 * len(missing) + 40
+            )
+            repaired, missing = schema.parse(repair_content, names=missing)
+            result.update(repaired)
+        except Exception as e:
+            logger.error(f"{schema.name}: field repair request failed: {str(e)}")
+        
+        if missing:
+            record_metric(schema.name, 'defaulted')
+            result.update(schema.defaults(missing))
+        return result
     
-    def extract_cv_insights(self, cv_text: str) -> Dict[str, Any]:
+    def extract_cv_insights(self, cv_text: str, sections: Dict[str, Any] = None) -> Dict[str, Any]:
         """Extract key insights from CV text using OpenAI"""
         if not cv_text:
             return {
@@ -52,6 +118,7 @@ class EnhancedAICoverLetterService:
                     'summary': 'Experienced full-stack developer with strong backend skills and leadership experience'
                 }
             
+            cv_excerpt = CVSections(cv_text, sections).for_prompt(2000)
             prompt = f"""
             Analyze the following CV text and extract structured information. Return a JSON response with:
             - skills: list of technical and soft skills
@@ -60,28 +127,15 @@ class EnhancedAICoverLetterService:
             - achievements: list of quantifiable achievements
             - summary: brief professional summary
             
-            CV Text: {cv_text[:2000]}
+            CV Text: {cv_excerpt}
             
             Return only valid JSON.
             """
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.3
+            return self._complete_json(
+                'extract_cv_insights', prompt, cv_excerpt, CV_INSIGHTS_SCHEMA, temperature=0.3
             )
             
-            result = json.loads(response.choices[0].message.content)
-            
-            # Validate required fields
-            required_fields = ['skills', 'experience', 'education', 'achievements', 'summary']
-            for field in required_fields:
-                if field not in result:
-                    result[field] = []
-                    
-            return result
-            
         except Exception as e:
             logger.error(f"CV analysis failed: {str(e)}")
             return {
@@ -186,14 +240,10 @@ Sincerely,
             - Address to "Dear Hiring Manager"
             """
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                temperature=0.7
+            content = self._chat_completion(
+                'generate_tailored_cover_letter', prompt, job_description[:1000], temperature=0.7
             )
-            
-            generated_letter = response.choices[0].message.content.strip()
+            generated_letter = content.strip()
             logger.info(f"Cover letter generated successfully: {len(generated_letter)} characters")
             return generated_letter
             
@@ -211,7 +261,7 @@ I would welcome the opportunity to discuss how my experience and enthusiasm can
 Sincerely,
 [Your Name]"""
     
-    def analyze_cv_comprehensive(self, cv_text: str) -> Dict[str, Any]:
+    def analyze_cv_comprehensive(self, cv_text: str, sections: Dict[str, Any] = None) -> Dict[str, Any]:
         """Comprehensive CV analysis with scoring and recommendations"""
         if not cv_text:
             return self._get_default_analysis()
@@ -221,6 +271,7 @@ Sincerely,
             if not self.client:
                 return self._get_mock_analysis(cv_text)
             
+            cv_excerpt = CVSections(cv_text, sections).for_prompt(3000)
             prompt = f"""
             Analyze the following CV and provide a comprehensive assessment. Return a JSON response with:
             
@@ -235,42 +286,15 @@ Sincerely,
             9. industry: Primary industry focus
             10. education_level: Education level identified
             
-            CV Text: {cv_text[:3000]}
+            CV Text: {cv_excerpt}
             
             Return only valid JSON.
             """
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1200,
-                temperature=0.3
+            return self._complete_json(
+                'analyze_cv_comprehensive', prompt, cv_excerpt, CV_ANALYSIS_SCHEMA, temperature=0.3
             )
             
-            result = json.loads(response.choices[0].message.content)
-            
-            # Validate and ensure all required fields
-            required_fields = [
-                'overall_score', 'ats_score', 'keyword_score', 'strengths', 
-                'weaknesses', 'recommendations', 'skills', 'experience_level', 
-                'industry', 'education_level'
-            ]
-            
-            for field in required_fields:
-                if field not in result:
-                    if field.endswith('_score'):
-                        result[field] = 75
-                    elif field in ['experience_level', 'industry', 'education_level']:
-                        result[field] = 'Not specified'
-                    else:
-                        result[field] = []
-            
-            # Ensure scores are integers
-            for score_field in ['overall_score', 'ats_score', 'keyword_score']:
-                result[score_field] = int(result.get(score_field, 75))
-                
-            return result
-            
         except Exception as e:
             logger.error(f"CV comprehensive analysis failed: {str(e)}")
             return self._get_mock_analysis(cv_text)
@@ -278,9 +302,7 @@ Sincerely,
     def _get_mock_analysis(self, cv_text: str) -> Dict[str, Any]:
         """Generate mock analysis when AI is not available"""
         # Simple keyword analysis for mock scoring
-        keywords = ['python', 'javascript', 'sql', 'project', 'management', 'team', 'leadership', 'experience']
-        text_lower = cv_text.lower()
-        keyword_matches = sum(1 for keyword in keywords if keyword in text_lower)
+        keyword_matches = len(scan_keywords(cv_text).matched(MOCK_ANALYSIS_KEYWORDS))
         
         # Calculate mock scores based on content length and keywords
         overall_score = min(95, max(60, 70 + keyword_matches * 3))
@@ -335,22 +357,52 @@ Sincerely,
 class CVAnalysisService:
     """Enhanced service for comprehensive CV analysis and optimization"""
     
-    def __init__(self):
-        self.ai_service = EnhancedAICoverLetterService()
+    def __init__(self, ai_service: EnhancedAICoverLetterService = None):
+        self.ai_service = ai_service or EnhancedAICoverLetterService()
+    
+    def local_scores(self, cv_text: str, job_description: str = None,
+                     sections: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Scores that can be computed without the LLM, for immediate rendering"""
+        if not cv_text or not isinstance(cv_text, str):
+            return {
+                'overall_score': 0,
+                'ats_score': 0,
+                'keyword_score': 0,
+                'section_scores': {},
+                'skills': []
+            }
+        
+        from .file_handlers import CVTextProcessor
+        
+        cv_sections = CVSections(cv_text, sections)
+        ats_score = self._calculate_ats_score(cv_sections)
+        keyword_score = self._calculate_keyword_score(cv_text, job_description)
+        section_scores = self._calculate_section_scores(cv_sections)
+        section_coverage = sum(section_scores.values()) // len(section_scores)
+        
+        return {
+            'overall_score': (ats_score + keyword_score + section_coverage) // 3,
+            'ats_score': ats_score,
+            'keyword_score': keyword_score,
+            'section_scores': section_scores,
+            'skills': CVTextProcessor.extract_skills(cv_text)
+        }
     
-    def analyze_cv_comprehensive(self, cv_text: str, job_title: str = None, job_description: str = None) -> Dict[str, Any]:
+    def analyze_cv_comprehensive(self, cv_text: str, job_title: str = None, job_description: str = None,
+                                 sections: Dict[str, Any] = None) -> Dict[str, Any]:
         """Comprehensive CV analysis with job matching capabilities"""
         if not cv_text or not isinstance(cv_text, str):
             return self._get_default_analysis()
         
         try:
+            cv_sections = CVSections(cv_text, sections)
             # Extract CV insights using existing AI service
-            cv_insights = self.ai_service.extract_cv_insights(cv_text)
+            cv_insights = self.ai_service.extract_cv_insights(cv_text, sections=sections)
             
             # Calculate comprehensive scores
             analysis = {
                 'overall_score': self._calculate_overall_score(cv_insights),
-                'ats_score': self._calculate_ats_score(cv_text),
+                'ats_score': self._calculate_ats_score(cv_sections),
                 'keyword_score': self._calculate_keyword_score(cv_text, job_description),
                 'skills': cv_insights.get('skills', []),
                 'experience': cv_insights.get('experience', []),
@@ -358,7 +410,7 @@ class CVAnalysisService:
                 'achievements': cv_insights.get('achievements', []),
                 'summary': cv_insights.get('summary', ''),
                 'strengths': self._identify_strengths(cv_insights),
-                'weaknesses': self._identify_weaknesses(cv_text, cv_insights),
+                'weaknesses': self._identify_weaknesses(cv_sections, cv_insights),
                 'recommendations': self._generate_recommendations(cv_insights, job_description),
                 'experience_level': self._determine_experience_level(cv_insights),
                 'industry': self._determine_industry(cv_insights),
@@ -389,21 +441,19 @@ class CVAnalysisService:
         
         return min(100, score)
     
-    def _calculate_ats_score(self, cv_text: str) -> int:
+    def _calculate_ats_score(self, cv_sections: CVSections) -> int:
         """Calculate ATS compatibility score"""
         score = 60  # Base score
         
-        # Check for ATS-friendly elements
-        text_lower = cv_text.lower()
+        # Standard section headings an ATS looks for
+        ats_sections = ['experience', 'skills', 'education', 'achievements', 'projects', 'certifications']
+        score += sum(5 for section in ats_sections if cv_sections.has(section))
         
-        # Keywords that improve ATS score
-        ats_keywords = ['experience', 'skills', 'education', 'achievements', 'projects', 'certifications']
-        keyword_matches = sum(1 for keyword in ats_keywords if keyword in text_lower)
-        score += keyword_matches * 5
-        
-        # Check for quantifiable achievements (numbers)
-        import re
-        numbers = re.findall(r'\d+%|\d+\s*years?|\d+\s*months?', text_lower)
+        # Quantifiable achievements (numbers) where achievements are described
+        body = '\n'.join(
+            cv_sections.get(section) for section in ('summary', 'experience', 'achievements', 'projects')
+        ) or cv_sections.text
+        numbers = ACHIEVEMENT_NUMBER_PATTERN.findall(body.lower())
         score += min(20, len(numbers) * 3)
         
         return min(100, score)
@@ -429,6 +479,12 @@ class CVAnalysisService:
         
         return min(100, score)
     
+    def _calculate_section_scores(self, cv_sections: CVSections) -> Dict[str, int]:
+        """Score presence of the standard CV sections (0 or 100 each)"""
+        scores = {section: 100 if cv_sections.has(section) else 0 for section in SECTION_NAMES}
+        scores['contact'] = 100 if cv_sections.has_contact_details() else 0
+        return scores
+    
     def _identify_strengths(self, cv_insights: Dict) -> List[str]:
         """Identify key strengths from CV analysis"""
         strengths = []
@@ -450,7 +506,7 @@ class CVAnalysisService:
         
         return strengths[:6]  # Limit to top 6
     
-    def _identify_weaknesses(self, cv_text: str, cv_insights: Dict) -> List[str]:
+    def _identify_weaknesses(self, cv_sections: CVSections, cv_insights: Dict) -> List[str]:
         """Identify areas for improvement"""
         weaknesses = []
         
@@ -460,9 +516,13 @@ class CVAnalysisService:
         if not cv_insights.get('achievements'):
             weaknesses.append("Missing quantifiable achievements")
         
-        if len(cv_text.split()) < 200:
+        if len(cv_sections.text.split()) < 200:
             weaknesses.append("Content may be too brief")
         
+        for section in ('summary', 'experience', 'skills', 'education'):
+            if not cv_sections.has(section):
+                weaknesses.append(f"No clearly headed {section.title()} section")
+        
         weaknesses.extend([
             "Could benefit from more specific metrics",
             "Consider adding relevant certifications",
@@ -492,33 +552,25 @@ class CVAnalysisService:
             return "Entry Level"
         
         # Simple heuristic based on experience descriptions
-        exp_text = ' '.join(experience).lower()
-        if 'senior' in exp_text or 'lead' in exp_text or 'manager' in exp_text:
+        hits = scan_keywords(' '.join(experience))
+        if hits.any(SENIORITY_KEYWORDS):
             return "Senior Level"
-        elif any(year in exp_text for year in ['5 years', '6 years', '7 years', '8 years']):
+        elif hits.any(MID_SENIOR_YEARS):
             return "Mid-Senior Level"
-        elif any(year in exp_text for year in ['2 years', '3 years', '4 years']):
+        elif hits.any(MID_YEARS):
             return "Mid Level"
         else:
             return "Entry-Mid Level"
     
     def _determine_industry(self, cv_insights: Dict) -> str:
         """Determine primary industry focus"""
-        skills = ' '.join(cv_insights.get('skills', [])).lower()
-        experience = ' '.join(cv_insights.get('experience', [])).lower()
+        skills = ' '.join(cv_insights.get('skills', []))
+        experience = ' '.join(cv_insights.get('experience', []))
         
-        combined_text = skills + ' ' + experience
+        hits = scan_keywords(skills + ' ' + experience)
         
-        industry_keywords = {
-            'Technology': ['python', 'javascript', 'software', 'developer', 'programming'],
-            'Finance': ['finance', 'accounting', 'banking', 'investment', 'financial'],
-            'Healthcare': ['medical', 'health', 'patient', 'clinical', 'healthcare'],
-            'Marketing': ['marketing', 'digital', 'campaign', 'brand', 'social media'],
-            'Engineering': ['engineer', 'mechanical', 'electrical', 'civil', 'design']
-        }
-        
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in combined_text for keyword in keywords):
+        for industry, keywords in INDUSTRY_FOCUS_KEYWORDS.items():
+            if hits.any(keywords):
                 return industry
         
         return "General Business"
@@ -529,18 +581,12 @@ class CVAnalysisService:
         if not education:
             return "Not specified"
         
-        education_text = ' '.join(education).lower()
+        hits = scan_keywords(' '.join(education))
         
-        if any(level in education_text for level in ['phd', 'doctorate', 'doctoral']):
-            return "Doctorate"
-        elif any(level in education_text for level in ['master', 'mba', 'msc']):
-            return "Master's Degree"
-        elif any(level in education_text for level in ['bachelor', 'bs', 'ba', 'bsc']):
-            return "Bachelor's Degree"
-        elif any(level in education_text for level in ['associate', 'diploma']):
-            return "Associate Degree"
-        else:
-            return "High School or Equivalent"
+        for level, keywords in EDUCATION_LEVELS.items():
+            if hits.any(keywords):
+                return level
+        return "High School or Equivalent"
     
     def _get_default_analysis(self) -> Dict[str, Any]:
         """Return default analysis for invalid input"""
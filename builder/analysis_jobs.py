@@ -0,0 +1,305 @@
+"""
+Progressive CV analysis for the analyzer pages.
+
+Local scores (ATS, keyword, sections) are computed inline so the page can
+render immediately; the LLM-derived sections are produced by a background
+worker and polled through the analysis status endpoint. Cover letters work
+the same way: a template draft is returned at once and replaced by the
+LLM-tailored letter when the background job finishes.
+
+Uploads can go one step further: the view only stores the file, and
+extraction and analysis run here while UploadedCV.processing_state moves
+through queued -> extracting -> analysing -> done (or failed).
+
+An upload that nearly duplicates one of the user's earlier analysed uploads
+skips the LLM pass and gets that analysis adjusted for its text instead (see
+builder/near_duplicates.py).
+"""
+
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import close_old_connections
+
+from .ai_services import EnhancedAICoverLetterService, CVAnalysisService
+from .document_cache import store_analysis, validate_and_extract
+from .file_handlers import TextExtractionError, ExtractionUnavailableError
+from .models import AICoverLetter, CVAnalysis, UploadedCV
+from .near_duplicates import reuse_analysis, index_upload
+
+logger = logging.getLogger(__name__)
+
+JOB_CACHE_PREFIX = 'analysis_job:'
+UPLOAD_JOB_CACHE_PREFIX = 'upload_analysis_job:'
+JOB_TTL_SECONDS = 60 * 60
+UPLOAD_MAX_CHARS = 3000  # budget the analyzer upload used when it extracted inline
+
+# Sections only the LLM can fill in; rendered as placeholders while pending
+LLM_FIELDS = (
+    'strengths', 'weaknesses', 'recommendations',
+    'experience_level', 'industry', 'education_level'
+)
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cv-analysis')
+
+
+def _job_key(job_id: str) -> str:
+    return f"{JOB_CACHE_PREFIX}{job_id}"
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return the stored job state, or None if unknown or expired"""
+    return cache.get(_job_key(job_id))
+
+
+def analysis_row_fields(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """CVAnalysis field values for a completed analysis"""
+    return {
+        'overall_score': analysis.get('overall_score', 75),
+        'strengths': analysis.get('strengths', []),
+        'improvements': analysis.get('weaknesses', []),
+        'keywords': {'present': analysis.get('skills', []), 'missing': []},
+        'experience_level': analysis.get('experience_level', 'Mid-level'),
+        'ats_compatibility': analysis.get('ats_score', 80),
+    }
+
+
+def start_analysis(cv_text: str, user_id: int, cv_analysis_id: int = None,
+                   content_hash: str = None, sections: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Compute local scores and queue the LLM analysis in the background
+
+    Args:
+        cv_text: Extracted CV text
+        user_id: Owner of the job; only this user may poll it
+        cv_analysis_id: Optional CVAnalysis row to fill with local scores now
+            and with the LLM result when it finishes
+        content_hash: Upload hash; the finished analysis is cached against it
+        sections: Segments stored at extraction time (UploadedCV.sections)
+
+    Returns:
+        dict: Partial analysis with local scores, plus 'job_id' and 'pending';
+            complete straight away when a near-duplicate's analysis is reused
+    """
+    service = EnhancedAICoverLetterService()
+    scorer = CVAnalysisService(ai_service=service)
+    analysis = scorer.local_scores(cv_text, sections=sections)
+    job_id = uuid.uuid4().hex
+
+    uploaded_cv = UploadedCV.objects.filter(cvanalysis=cv_analysis_id).first() if cv_analysis_id else None
+    if uploaded_cv:
+        reused = reuse_analysis(uploaded_cv, analysis, scorer)
+        if reused:
+            # A lightly edited version of an upload analysed before
+            reused.update(job_id=job_id, pending=False)
+            _complete_job(job_id, user_id, reused, cv_analysis_id)
+            return reused
+
+    for field in LLM_FIELDS:
+        analysis[field] = [] if field in ('strengths', 'weaknesses', 'recommendations') else ''
+
+    if cv_analysis_id:
+        CVAnalysis.objects.filter(pk=cv_analysis_id).update(
+            overall_score=analysis['overall_score'],
+            keywords={'present': analysis['skills'], 'missing': []},
+            ats_compatibility=analysis['ats_score']
+        )
+
+    analysis['job_id'] = job_id
+    analysis['pending'] = True
+
+    cache.set(_job_key(job_id), {
+        'user_id': user_id,
+        'status': 'pending',
+        'analysis': analysis,
+    }, JOB_TTL_SECONDS)
+
+    _executor.submit(_run_llm_analysis, job_id, service, cv_text, user_id, cv_analysis_id, content_hash, sections)
+    return analysis
+
+
+def _complete_job(job_id: str, user_id: int, analysis: Dict[str, Any], cv_analysis_id: int = None) -> None:
+    """Store a finished analysis on its CVAnalysis row and publish it to pollers"""
+    if cv_analysis_id:
+        CVAnalysis.objects.filter(pk=cv_analysis_id).update(
+            analysis_status='complete', **analysis_row_fields(analysis)
+        )
+        UploadedCV.objects.filter(cvanalysis=cv_analysis_id, processing_state='analysing').update(
+            processing_state='done'
+        )
+    cache.set(_job_key(job_id), {
+        'user_id': user_id,
+        'status': 'complete',
+        'analysis': analysis,
+    }, JOB_TTL_SECONDS)
+
+
+def _run_llm_analysis(job_id: str, service: EnhancedAICoverLetterService, cv_text: str,
+                      user_id: int, cv_analysis_id: int = None, content_hash: str = None,
+                      sections: Dict[str, Any] = None) -> None:
+    """Worker body: run the LLM analysis and publish the merged result"""
+    close_old_connections()
+    try:
+        analysis = service.analyze_cv_comprehensive(cv_text, sections=sections)
+        analysis['pending'] = False
+
+        if service.client:
+            store_analysis(content_hash, analysis)
+        _complete_job(job_id, user_id, analysis, cv_analysis_id)
+        logger.info(f"Background CV analysis {job_id} completed")
+
+    except Exception as e:
+        logger.error(f"Background CV analysis {job_id} failed: {str(e)}")
+        if cv_analysis_id:
+            CVAnalysis.objects.filter(pk=cv_analysis_id).update(analysis_status='failed')
+            UploadedCV.objects.filter(cvanalysis=cv_analysis_id, processing_state='analysing').update(
+                processing_state='failed', processing_error='Analysis failed. Please try again.'
+            )
+        job = get_job(job_id) or {'user_id': user_id, 'analysis': {}}
+        job['status'] = 'failed'
+        cache.set(_job_key(job_id), job, JOB_TTL_SECONDS)
+
+    finally:
+        close_old_connections()
+
+
+def start_upload_processing(uploaded_cv_id, user_id: int) -> None:
+    """Queue extraction and analysis for a stored upload in processing_state 'queued'"""
+    _executor.submit(_run_upload_processing, uploaded_cv_id, user_id)
+
+
+def get_upload_job_id(uploaded_cv_id) -> Optional[str]:
+    """Analysis job started for an upload by the background pipeline, if any"""
+    return cache.get(f"{UPLOAD_JOB_CACHE_PREFIX}{uploaded_cv_id}")
+
+
+def _set_processing_state(uploaded_cv_id, state: str, error: str = '', **fields) -> None:
+    UploadedCV.objects.filter(pk=uploaded_cv_id).update(processing_state=state, processing_error=error, **fields)
+
+
+def _run_upload_processing(uploaded_cv_id, user_id: int) -> None:
+    """Worker body: extract the stored file, then start (or reuse) its analysis"""
+    close_old_connections()
+    try:
+        uploaded_cv = UploadedCV.objects.get(pk=uploaded_cv_id)
+        _set_processing_state(uploaded_cv_id, 'extracting')
+        try:
+            with uploaded_cv.file.open('rb') as f:
+                source = File(f, name=uploaded_cv.original_filename)
+                # Hash taken by the upload handler; saves reading the file again
+                source.content_hash = uploaded_cv.content_hash or None
+                extraction = validate_and_extract(source, max_chars=UPLOAD_MAX_CHARS)
+        except ValidationError as e:
+            _set_processing_state(uploaded_cv_id, 'failed', f"File validation failed: {e.messages[0]}")
+            return
+        except ExtractionUnavailableError as e:
+            logger.warning(f"Extraction unavailable for {uploaded_cv.original_filename}: {str(e)}")
+            _set_processing_state(uploaded_cv_id, 'failed', e.user_message)
+            return
+        except TextExtractionError as e:
+            logger.error(f"Text extraction failed for {uploaded_cv.original_filename}: {str(e)}")
+            _set_processing_state(
+                uploaded_cv_id, 'failed', 'Failed to extract text from the CV. Please try a different file.'
+            )
+            return
+        if not extraction.text:
+            _set_processing_state(uploaded_cv_id, 'failed', 'No text found in the uploaded file.')
+            return
+
+        _set_processing_state(
+            uploaded_cv_id, 'analysing',
+            extracted_text=extraction.text,
+            content_hash=extraction.content_hash,
+            sections=extraction.sections,
+            processed=True
+        )
+        analysis = extraction.analysis
+        if analysis:
+            # Identical bytes were analysed before
+            CVAnalysis.objects.create(uploaded_cv_id=uploaded_cv_id, **analysis_row_fields(analysis))
+            uploaded_cv.extracted_text = extraction.text
+            index_upload(uploaded_cv)
+            job_id = uuid.uuid4().hex
+            cache.set(_job_key(job_id), {
+                'user_id': user_id,
+                'status': 'complete',
+                'analysis': dict(analysis, job_id=job_id, pending=False),
+            }, JOB_TTL_SECONDS)
+            _set_processing_state(uploaded_cv_id, 'done')
+        else:
+            cv_analysis = CVAnalysis.objects.create(uploaded_cv_id=uploaded_cv_id, analysis_status='pending')
+            job_id = start_analysis(
+                extraction.text, user_id, cv_analysis_id=cv_analysis.pk,
+                content_hash=extraction.content_hash, sections=extraction.sections
+            )['job_id']
+        cache.set(f"{UPLOAD_JOB_CACHE_PREFIX}{uploaded_cv_id}", job_id, JOB_TTL_SECONDS)
+
+    except Exception as e:
+        logger.error(f"Background processing of upload {uploaded_cv_id} failed: {str(e)}")
+        _set_processing_state(uploaded_cv_id, 'failed', 'Upload failed. Please try again.')
+
+    finally:
+        close_old_connections()
+
+
+def start_cover_letter(ai_cover_letter_id, user_id: int, draft: str, cv_text: str,
+                       job_title: str, job_description: str, tone: str = 'professional',
+                       template_type: str = 'standard') -> str:
+    """
+    Queue LLM generation for a cover letter that currently holds a template draft
+
+    Returns:
+        str: Job ID to poll; the job holds the draft until the LLM letter is ready
+    """
+    job_id = uuid.uuid4().hex
+    cache.set(_job_key(job_id), {
+        'user_id': user_id,
+        'status': 'pending',
+        'cover_letter': draft,
+    }, JOB_TTL_SECONDS)
+
+    _executor.submit(
+        _run_cover_letter, job_id, ai_cover_letter_id, user_id, draft,
+        cv_text, job_title, job_description, tone, template_type
+    )
+    return job_id
+
+
+def _run_cover_letter(job_id: str, ai_cover_letter_id, user_id: int, draft: str, cv_text: str,
+                      job_title: str, job_description: str, tone: str, template_type: str) -> None:
+    """Worker body: generate the tailored letter and replace the draft"""
+    close_old_connections()
+    try:
+        service = EnhancedAICoverLetterService()
+        cv_insights = service.extract_cv_insights(cv_text)
+        job_match = service.match_cv_to_job(cv_insights, job_title, job_description)
+        cover_letter = service.generate_tailored_cover_letter(
+            cv_insights, job_match, job_title, job_description, tone, template_type
+        )
+
+        # Don't clobber edits the user made to the draft while it was generating
+        AICoverLetter.objects.filter(pk=ai_cover_letter_id, generated_letter=draft).update(
+            generated_letter=cover_letter
+        )
+        cache.set(_job_key(job_id), {
+            'user_id': user_id,
+            'status': 'complete',
+            'cover_letter': cover_letter,
+        }, JOB_TTL_SECONDS)
+        logger.info(f"Background cover letter {job_id} completed")
+
+    except Exception as e:
+        logger.error(f"Background cover letter {job_id} failed: {str(e)}")
+        cache.set(_job_key(job_id), {
+            'user_id': user_id,
+            'status': 'failed',
+            'cover_letter': draft,
+        }, JOB_TTL_SECONDS)
+
+    finally:
+        close_old_connections()
@@ -2,7 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .api_views import (
     CVViewSet, AICoverLetterViewSet, 
-    UploadedCVViewSet, TemplateViewSet, CVAnalysisViewSet
+    UploadedCVViewSet, TemplateViewSet, CVAnalysisViewSet, ChunkedUploadViewSet
 )
 from .api_views_enhanced import EnhancedCVViewSet, EnhancedTemplateViewSet
 
@@ -10,6 +10,7 @@ router = DefaultRouter()
 router.register(r'cvs', CVViewSet, basename='cv')
 router.register(r'ai-cover-letters', AICoverLetterViewSet, basename='aicoverletter')
 router.register(r'uploaded-cvs', UploadedCVViewSet, basename='uploadedcv')
+router.register(r'chunked-uploads', ChunkedUploadViewSet, basename='chunkedupload')
 router.register(r'templates', TemplateViewSet, basename='template')
 router.register(r'cv-analysis', CVAnalysisViewSet, basename='cvanalysis')
 
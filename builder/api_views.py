@@ -1,15 +1,26 @@
-from rest_framework import viewsets, status
+from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
-from .models import CV, AICoverLetter, UploadedCV, Template, CVAnalysis, Experience, Education, Project
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.core.exceptions import ValidationError
+from .models import (
+    CV, AICoverLetter, UploadedCV, Template, CVAnalysis, Experience, Education, Project, ChunkedUpload
+)
 from .serializers import (
     CVSerializer, AICoverLetterSerializer, 
-    UploadedCVSerializer, TemplateSerializer, CVAnalysisSerializer
+    UploadedCVSerializer, TemplateSerializer, CVAnalysisSerializer, ChunkedUploadSerializer
 )
 from .ai_services import EnhancedAICoverLetterService
+from .chunked_uploads import (
+    start_upload, append_chunk, finalize_upload, discard_upload, chunk_size, UploadOffsetMismatch
+)
+from .multi_upload import expand_uploads, ndjson_stream
+from .near_duplicates import find_near_duplicates
+from .upload_handlers import CVUploadHandler, upload_error
 import logging
 import json
 
@@ -183,17 +194,119 @@ class UploadedCVViewSet(viewsets.ModelViewSet):
     serializer_class = UploadedCVSerializer
     permission_classes = [IsAuthenticated]
 
+    # Actions whose uploads are CVs and go through CVUploadHandler
+    cv_upload_actions = ('create', 'bulk_upload')
+
     def get_queryset(self):
         return UploadedCV.objects.filter(user=self.request.user)
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Before DRF wraps the request; its CSRF check runs later, during authentication
+        if self.action_map.get(request.method.lower()) in self.cv_upload_actions:
+            request.upload_handlers = [CVUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[MultiPartParser])
+    def bulk_upload(self, request):
+        """Upload several CVs or zip files; one NDJSON result line is streamed per file as it finishes"""
+        files = request.FILES.getlist('files')
+        rejected = upload_error(request, 'files')
+        if rejected:
+            return Response({'error': rejected}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if not files:
+            return Response({'error': 'No files uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            files = expand_uploads(files)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return StreamingHttpResponse(ndjson_stream(request.user, files), content_type='application/x-ndjson')
+
+    @action(detail=True, methods=['get'], url_path='near-duplicates')
+    def near_duplicates(self, request, pk=None):
+        """The user's other uploads that are near duplicates of this one, closest first"""
+        uploaded_cv = self.get_object()
+        if uploaded_cv.simhash is None:
+            return Response([])
+        return Response([
+            {
+                'id': str(candidate.pk),
+                'original_filename': candidate.original_filename,
+                'uploaded_at': candidate.uploaded_at,
+                'similarity': round(score, 3),
+                # Whether either upload's analysis was adjusted from the other's
+                'reused_this_analysis': candidate.near_duplicate_of_id == uploaded_cv.pk,
+                'is_analysis_source': uploaded_cv.near_duplicate_of_id == candidate.pk,
+            }
+            for candidate, score in find_near_duplicates(request.user.id, uploaded_cv.simhash, exclude=uploaded_cv.pk)
+        ])
+
     @action(detail=True, methods=['post'])
     def placeholder_action(self, request, pk=None):
         """Placeholder action to fix indentation error."""
         pass
 
+class ChunkedUploadViewSet(mixins.RetrieveModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """Resumable uploads: open a session, PUT chunks at offsets, then finalize"""
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ChunkedUpload.objects.filter(user=self.request.user)
+
+    def create(self, request):
+        """Declare filename, size and sha256; returns the session with offset 0"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = start_upload(request.user, **serializer.validated_data)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(upload).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        """Raw bytes for ?offset=N; a mismatched offset answers 409 with the offset to resume from"""
+        try:
+            offset = int(request.query_params.get('offset', ''))
+        except ValueError:
+            return Response({'error': 'offset query parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+        # Refused before the body is read
+        if int(request.META.get('CONTENT_LENGTH') or 0) > chunk_size():
+            return Response(
+                {'error': f"Chunks must be at most {chunk_size()} bytes"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        try:
+            upload = append_chunk(pk, request.user, offset, request.body)
+        except ChunkedUpload.DoesNotExist:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        except UploadOffsetMismatch as e:
+            return Response({'error': str(e), 'offset': e.offset}, status=status.HTTP_409_CONFLICT)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'offset': upload.offset, 'size': upload.size})
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """Verify the hash and queue the CV for extraction and analysis"""
+        try:
+            uploaded_cv = finalize_upload(pk, request.user)
+        except ChunkedUpload.DoesNotExist:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'uploaded_cv': str(uploaded_cv.pk),
+            'processing_state': uploaded_cv.processing_state,
+            'status_url': reverse('builder:upload_status', args=[uploaded_cv.pk]),
+        }, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        discard_upload(instance)
+
 class TemplateViewSet(viewsets.ModelViewSet):
     serializer_class = TemplateSerializer
     permission_classes = [IsAuthenticated]
@@ -0,0 +1,173 @@
+"""
+Batch CV analysis for bulk re-analysis and admin backfills.
+
+Several short CVs are packed into one structured LLM request under a token
+budget, each tagged with its own ID. Per-item results are validated and any
+item that is missing or malformed is retried on its own through
+EnhancedAICoverLetterService.analyze_cv_comprehensive.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Tuple
+
+from .ai_services import EnhancedAICoverLetterService
+from .model_router import estimate_tokens
+from .llm_schema import CV_ANALYSIS_SCHEMA, parse_tolerant, record_metric
+
+logger = logging.getLogger(__name__)
+
+MAX_CV_CHARS = 3000              # same truncation as the single-CV prompt
+DEFAULT_INPUT_TOKEN_BUDGET = 6000
+OUTPUT_TOKENS_PER_ITEM = 450
+MAX_OUTPUT_TOKENS = 4000
+PROMPT_OVERHEAD_TOKENS = 250
+
+BATCH_PROMPT = """
+Analyze each CV below and provide a comprehensive assessment of every one.
+Return a JSON object whose keys are the CV ids and whose values are objects with:
+
+1. overall_score: Overall quality score (0-100)
+2. ats_score: ATS compatibility score (0-100)
+3. keyword_score: Keyword optimization score (0-100)
+4. strengths: List of 4-6 key strengths
+5. weaknesses: List of 4-6 areas for improvement
+6. recommendations: List of 4-6 specific recommendations
+7. skills: List of identified technical and soft skills
+8. experience_level: Brief description of experience level
+9. industry: Primary industry focus
+10. education_level: Education level identified
+
+{items}
+
+Return only valid JSON.
+"""
+
+
+@dataclass
+class BatchAnalysisStats:
+    """Throughput summary for a batch run"""
+    items: int = 0
+    batches: int = 0
+    retried: int = 0
+    elapsed_seconds: float = 0.0
+    retried_ids: List[str] = field(default_factory=list)
+
+    @property
+    def cvs_per_minute(self) -> float:
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.items / self.elapsed_seconds * 60
+
+
+def pack_batches(items: Dict[str, str], token_budget: int = DEFAULT_INPUT_TOKEN_BUDGET) -> List[List[str]]:
+    """
+    Greedily pack item IDs into batches whose estimated input stays under budget
+
+    Output tokens grow with batch size too, so a batch is also closed once its
+    expected response would exceed MAX_OUTPUT_TOKENS.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = PROMPT_OVERHEAD_TOKENS
+    max_items = max(1, MAX_OUTPUT_TOKENS // OUTPUT_TOKENS_PER_ITEM)
+
+    for item_id, cv_text in items.items():
+        item_tokens = estimate_tokens(cv_text[:MAX_CV_CHARS]) + 10
+        if current and (current_tokens + item_tokens > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], PROMPT_OVERHEAD_TOKENS
+        current.append(item_id)
+        current_tokens += item_tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class CVBatchAnalysisService:
+    """Analyse many CVs with as few LLM requests as possible"""
+
+    def __init__(self, ai_service: EnhancedAICoverLetterService = None,
+                 token_budget: int = DEFAULT_INPUT_TOKEN_BUDGET):
+        self.ai_service = ai_service or EnhancedAICoverLetterService()
+        self.token_budget = token_budget
+
+    def analyze(self, items: Dict[str, str]) -> Tuple[Dict[str, Dict[str, Any]], BatchAnalysisStats]:
+        """
+        Analyse CVs keyed by caller-chosen IDs
+
+        Args:
+            items: Mapping of item ID to extracted CV text
+
+        Returns:
+            tuple: (results keyed by item ID, throughput stats)
+        """
+        start = time.monotonic()
+        stats = BatchAnalysisStats(items=len(items))
+        results: Dict[str, Dict[str, Any]] = {}
+
+        # Empty CVs get the default analysis without touching the LLM
+        pending = {}
+        for item_id, cv_text in items.items():
+            if cv_text and cv_text.strip():
+                pending[item_id] = cv_text
+            else:
+                results[item_id] = self.ai_service.analyze_cv_comprehensive(cv_text)
+
+        if self.ai_service.client:
+            for batch_ids in pack_batches(pending, self.token_budget):
+                stats.batches += 1
+                results.update(self._analyze_batch({item_id: pending[item_id] for item_id in batch_ids}))
+
+        for item_id, cv_text in pending.items():
+            if item_id not in results:
+                stats.retried += 1
+                stats.retried_ids.append(item_id)
+                results[item_id] = self.ai_service.analyze_cv_comprehensive(cv_text)
+
+        stats.elapsed_seconds = time.monotonic() - start
+        logger.info(
+            f"Batch analysis: {stats.items} CVs in {stats.batches} batches, "
+            f"{stats.retried} retried individually, {stats.cvs_per_minute:.1f} CVs/min"
+        )
+        return results, stats
+
+    def _analyze_batch(self, batch: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Send one packed request; return only the items that validate"""
+        sections = [
+            f"### CV id={item_id}\n{cv_text[:MAX_CV_CHARS]}"
+            for item_id, cv_text in batch.items()
+        ]
+        prompt = BATCH_PROMPT.format(items='\n\n'.join(sections))
+        max_tokens = min(MAX_OUTPUT_TOKENS, OUTPUT_TOKENS_PER_ITEM * len(batch))
+
+        try:
+            content = self.ai_service._chat_completion(
+                'analyze_cv_batch', prompt, prompt, temperature=0.3, max_tokens=max_tokens
+            )
+        except Exception as e:
+            logger.error(f"Batch CV analysis request failed for {len(batch)} CVs: {str(e)}")
+            return {}
+
+        # Fenced or truncated answers keep every item that still decodes
+        response, path = parse_tolerant(content, list(batch))
+        record_metric('cv_analysis_batch', f"parse_{path}")
+
+        valid = {}
+        for item_id in batch:
+            item = response.get(item_id)
+            if self._is_valid_item(item):
+                valid[item_id], _ = CV_ANALYSIS_SCHEMA.validate(item)
+            else:
+                logger.warning(f"Batch CV analysis returned an invalid result for {item_id}")
+        return valid
+
+    @staticmethod
+    def _is_valid_item(item: Any) -> bool:
+        """An item is valid if every schema field coerces cleanly"""
+        if not isinstance(item, dict):
+            return False
+        _, missing = CV_ANALYSIS_SCHEMA.validate(item)
+        return not missing
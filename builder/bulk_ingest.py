@@ -0,0 +1,334 @@
+"""
+Bulk CV ingestion for onboarding an organisation's existing CVs.
+
+Every file in a directory or zip is validated, extracted, segmented and given
+local scores and a SimHash fingerprint in an ExtractionPool of worker
+processes (with the usual memory cap and per-file timeout). Results are written in batches: blobs go through
+ContentAddressedStorage and UploadedCV/CVAnalysis rows are bulk-inserted in
+one transaction per batch. After each batch the manifest (a JSON file next to
+the source) records which entries are done, so an interrupted run picks up
+where it stopped. CVs already stored for the user with the same bytes and
+filename are skipped, which also covers a crash between a batch commit and
+its manifest write.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Any, Callable, Optional
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+
+from .ai_services import CVAnalysisService
+from .cv_sections import segment_cv
+from .extraction_pool import ExtractionPool
+from .file_handlers import CVFileHandler, TextExtractionError, ExtractionUnavailableError
+from .file_validators import FileValidator
+from .simhash import simhash
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_CHARS = 5000  # same budget as the upload_cv view
+
+_scorer: Optional[CVAnalysisService] = None
+
+# What reading one zip member can raise besides the size check: encrypted
+# (RuntimeError), unsupported compression (NotImplementedError), corrupt or
+# truncated data (zlib.error, BadZipFile on a CRC mismatch, EOFError, OSError)
+UNREADABLE_ENTRY_ERRORS = (RuntimeError, NotImplementedError, zlib.error, zipfile.BadZipFile, EOFError, OSError)
+
+
+def collect_entries(source: str) -> List[str]:
+    """Entry keys for a source: paths relative to a directory, or zip member names"""
+    if zipfile.is_zipfile(source) and not os.path.isdir(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        names = [
+            os.path.relpath(os.path.join(directory, filename), source)
+            for directory, _, filenames in os.walk(source)
+            for filename in filenames
+        ]
+    return sorted(name for name in names if is_cv_entry(name))
+
+
+def is_cv_entry(name: str) -> bool:
+    """False for hidden files and macOS resource forks that archives pick up"""
+    return not name.startswith('__MACOSX/') and not os.path.basename(name).startswith('.')
+
+
+def read_entry(source: str, key: str) -> bytes:
+    """
+    Bytes of one entry, refusing anything over the upload size limit before reading it
+
+    Raises:
+        ValidationError: If the entry is too large
+        UNREADABLE_ENTRY_ERRORS: If a zip member is encrypted or damaged
+    """
+    too_large = ValidationError(
+        f"File size exceeds maximum limit of {FileValidator.MAX_FILE_SIZE // (1024*1024)}MB"
+    )
+    if os.path.isdir(source):
+        path = os.path.join(source, key)
+        if os.path.getsize(path) > FileValidator.MAX_FILE_SIZE:
+            raise too_large
+        with open(path, 'rb') as f:
+            return f.read()
+
+    with zipfile.ZipFile(source) as archive:
+        # The declared size bounds what read() will inflate
+        if archive.getinfo(key).file_size > FileValidator.MAX_FILE_SIZE:
+            raise too_large
+        return archive.read(key)
+
+
+def ingest_job(source: str, key: str, max_chars: int) -> Dict[str, Any]:
+    """Validate, extract, segment and score one entry; runs in a pool worker"""
+    global _scorer
+    try:
+        data = read_entry(source, key)
+    except ValidationError as e:
+        return {'key': key, 'error': e.messages[0]}
+    except UNREADABLE_ENTRY_ERRORS:
+        return {'key': key, 'error': f"{os.path.basename(key)} is password-protected or damaged"}
+    try:
+        upload = SimpleUploadedFile(os.path.basename(key), data)
+        content_hash = hashlib.sha256(data).hexdigest()
+        mime_type = FileValidator.validate(upload).mime_type
+        text = CVFileHandler.extract_text_in_process(data, mime_type, max_chars)
+        if not text:
+            raise TextExtractionError("No text found in the file")
+    except ValidationError as e:
+        return {'key': key, 'error': e.messages[0]}
+    except TextExtractionError as e:
+        return {'key': key, 'error': str(e)}
+
+    if _scorer is None:
+        _scorer = CVAnalysisService()
+    sections = segment_cv(text)
+    return {
+        'key': key,
+        'name': os.path.basename(key),
+        'size': len(data),
+        'content_hash': content_hash,
+        'mime_type': mime_type,
+        'text': text,
+        'sections': sections,
+        'scores': _scorer.local_scores(text, sections=sections),
+        'simhash': simhash(text),
+    }
+
+
+@dataclass
+class IngestStats:
+    """Throughput summary for an ingestion run"""
+    files: int = 0
+    ingested: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    skipped: int = 0   # already done in an earlier run
+    bytes: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1024 / 1024 / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class BulkIngestor:
+    """Ingest a directory or zip of CVs for one user, resumably"""
+
+    def __init__(self, user, source: str, manifest_path: str = None, workers: int = 2,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_chars: int = DEFAULT_MAX_CHARS,
+                 timeout: float = 15, memory_limit_mb: int = 1024, analyzer=None,
+                 retry_failed: bool = False):
+        """
+        Args:
+            user: Owner of the ingested CVs
+            source: Directory or zip file
+            manifest_path: Checkpoint file; defaults to <source>.manifest.json
+            analyzer: Optional CVBatchAnalysisService for full LLM analyses; without
+                one only local scores are stored and the analysis is left pending
+            retry_failed: Process entries that failed in an earlier run again
+        """
+        self.user = user
+        self.source = os.path.abspath(source)
+        self.manifest_path = manifest_path or self.source.rstrip(os.sep) + '.manifest.json'
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.analyzer = analyzer
+        self.retry_failed = retry_failed
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {'version': MANIFEST_VERSION, 'source': self.source, 'user': self.user.username, 'entries': {}}
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('source') != self.source or manifest.get('user') != self.user.username:
+            raise ValueError(
+                f"Manifest {self.manifest_path} belongs to {manifest.get('source')} "
+                f"for {manifest.get('user')}; pass a different manifest path"
+            )
+        return manifest
+
+    def _save_manifest(self) -> None:
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def pending_entries(self, keys: List[str]) -> List[str]:
+        done = {'ingested', 'duplicate'} if self.retry_failed else {'ingested', 'duplicate', 'failed'}
+        entries = self.manifest['entries']
+        return [key for key in keys if entries.get(key, {}).get('status') not in done]
+
+    def run(self, progress: Callable[[IngestStats, int], None] = None) -> IngestStats:
+        """
+        Ingest every pending entry
+
+        Args:
+            progress: Called after each committed batch with the running stats
+                and the number of entries this run is processing
+        """
+        start = time.monotonic()
+        keys = collect_entries(self.source)
+        pending = self.pending_entries(keys)
+        stats = IngestStats(skipped=len(keys) - len(pending))
+
+        pool = ExtractionPool(
+            workers=self.workers, max_queue=self.workers, timeout=self.timeout,
+            memory_limit_mb=self.memory_limit_mb
+        )
+        try:
+            # Twice as many feeders as workers keeps every worker busy while a
+            # batch is being written, without exceeding the pool's admission limit
+            with ThreadPoolExecutor(max_workers=self.workers * 2) as feeders:
+                batch = []
+                for result in feeders.map(lambda key: self._process(pool, key), pending):
+                    batch.append(result)
+                    if len(batch) >= self.batch_size:
+                        self._commit(batch, stats)
+                        batch = []
+                        stats.elapsed_seconds = time.monotonic() - start
+                        if progress:
+                            progress(stats, len(pending))
+                if batch:
+                    self._commit(batch, stats)
+        finally:
+            pool.shutdown()
+
+        stats.elapsed_seconds = time.monotonic() - start
+        if progress:
+            progress(stats, len(pending))
+        logger.info(
+            f"Bulk ingest of {self.source}: {stats.ingested} ingested, {stats.duplicates} duplicates, "
+            f"{stats.failed} failed in {stats.elapsed_seconds:.1f}s ({stats.files_per_second:.1f} files/s)"
+        )
+        return stats
+
+    def _process(self, pool: ExtractionPool, key: str) -> Dict[str, Any]:
+        """The entry's result; a failure is recorded against the entry instead of ending the run"""
+        try:
+            return pool.run(ingest_job, self.source, key, self.max_chars)
+        except ExtractionUnavailableError as e:
+            return {'key': key, 'error': str(e)}
+        except Exception as e:  # e.g. a crashed worker
+            logger.exception(f"Bulk ingest of {key} failed")
+            return {'key': key, 'error': str(e) or e.__class__.__name__}
+
+    def _commit(self, results: List[Dict[str, Any]], stats: IngestStats) -> None:
+        """Store one batch and checkpoint it in the manifest"""
+        # Imported here: pool workers import this module before Django apps are ready
+        from .analysis_jobs import analysis_row_fields
+        from .models import UploadedCV, CVAnalysis, CVFingerprintBand
+        from .near_duplicates import band_rows
+
+        entries = self.manifest['entries']
+        succeeded = []
+        for result in results:
+            stats.files += 1
+            if result.get('error'):
+                stats.failed += 1
+                entries[result['key']] = {'status': 'failed', 'error': result['error']}
+                logger.warning(f"Bulk ingest skipped {result['key']}: {result['error']}")
+            else:
+                stats.bytes += result['size']
+                succeeded.append(result)
+
+        existing = set(UploadedCV.objects.filter(
+            user=self.user, content_hash__in=[result['content_hash'] for result in succeeded]
+        ).values_list('content_hash', 'original_filename'))
+        new = []
+        for result in succeeded:
+            if (result['content_hash'], result['name']) in existing:
+                stats.duplicates += 1
+                entries[result['key']] = {'status': 'duplicate'}
+            else:
+                existing.add((result['content_hash'], result['name']))
+                new.append(result)
+
+        analyses = {}
+        if self.analyzer and new:
+            analyses, _ = self.analyzer.analyze({result['key']: result['text'] for result in new})
+
+        file_field = UploadedCV._meta.get_field('file')
+        with transaction.atomic():
+            uploaded_cvs, cv_analyses, fingerprint_bands = [], [], []
+            for result in new:
+                content = ContentFile(read_entry(self.source, result['key']), name=result['name'])
+                # Lets ContentAddressedStorage skip hashing the bytes again
+                content.content_hash = result['content_hash']
+                uploaded_cv = UploadedCV(
+                    user=self.user,
+                    file=file_field.storage.save(file_field.generate_filename(None, result['name']), content),
+                    original_filename=result['name'],
+                    extracted_text=result['text'],
+                    processed=True,
+                    content_hash=result['content_hash'],
+                    sections=result['sections'],
+                    simhash=result['simhash'],
+                )
+                uploaded_cvs.append(uploaded_cv)
+                if result['simhash'] is not None:
+                    fingerprint_bands.extend(band_rows(uploaded_cv, result['simhash']))
+                analysis = analyses.get(result['key'])
+                if analysis:
+                    cv_analysis = CVAnalysis(
+                        uploaded_cv=uploaded_cv, analysis_status='complete', **analysis_row_fields(analysis)
+                    )
+                else:
+                    cv_analysis = CVAnalysis(
+                        uploaded_cv=uploaded_cv,
+                        overall_score=result['scores']['overall_score'],
+                        keywords={'present': result['scores']['skills'], 'missing': []},
+                        ats_compatibility=result['scores']['ats_score'],
+                        analysis_status='pending',
+                    )
+                cv_analyses.append(cv_analysis)
+            UploadedCV.objects.bulk_create(uploaded_cvs)
+            CVAnalysis.objects.bulk_create(cv_analyses)
+            CVFingerprintBand.objects.bulk_create(fingerprint_bands)
+
+        for result, uploaded_cv in zip(new, uploaded_cvs):
+            entries[result['key']] = {'status': 'ingested', 'uploaded_cv': str(uploaded_cv.pk)}
+        stats.ingested += len(new)
+        self._save_manifest()
@@ -0,0 +1,200 @@
+"""
+Resumable chunked uploads.
+
+A client declares the file (name, size, SHA-256) to start a session, PUTs
+the bytes in chunks at explicit offsets, and finalizes. Each chunk request
+is short: it is appended to a staging file and acknowledged by advancing
+ChunkedUpload.offset, so an interrupted transfer resumes from the last
+acknowledged offset instead of from zero. Finalize checks the staged bytes
+against the declared hash, validates them like any other upload, stores the
+UploadedCV and hands it to the background upload pipeline
+(analysis_jobs.start_upload_processing).
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from datetime import timedelta
+from typing import Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .analysis_jobs import start_upload_processing
+from .file_validators import FileValidator, HEADER_BYTES
+from .models import ChunkedUpload, UploadedCV
+
+logger = logging.getLogger(__name__)
+
+_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadOffsetMismatch(Exception):
+    """A chunk did not start at the session's acknowledged offset"""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Expected a chunk at offset {offset}")
+        self.offset = offset
+
+
+def chunk_size() -> int:
+    """Largest chunk accepted in one request"""
+    return getattr(settings, 'CHUNKED_UPLOAD_CHUNK_SIZE', 512 * 1024)
+
+
+def staging_path(upload: ChunkedUpload) -> str:
+    directory = getattr(settings, 'CHUNKED_UPLOAD_DIR', '') or os.path.join(
+        tempfile.gettempdir(), 'cv-chunked-uploads'
+    )
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{upload.pk}.part")
+
+
+def start_upload(user, filename: str, size: int, sha256: str) -> ChunkedUpload:
+    """
+    Open an upload session
+
+    Raises:
+        ValidationError: If the declared file can't be accepted
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    if not any(extension in extensions for extensions in FileValidator.ALLOWED_MIME_TYPES.values()):
+        raise ValidationError(f"File extension '{extension}' is not supported")
+    if size <= 0:
+        raise ValidationError("Empty file is not allowed")
+    if size > FileValidator.MAX_FILE_SIZE:
+        raise ValidationError(f"File size exceeds maximum limit of {FileValidator.MAX_FILE_SIZE // (1024*1024)}MB")
+    sha256 = (sha256 or '').lower()
+    if not _SHA256_RE.match(sha256):
+        raise ValidationError("sha256 must be the file's SHA-256 as 64 hex characters")
+
+    upload = ChunkedUpload.objects.create(user=user, filename=os.path.basename(filename), size=size, sha256=sha256)
+    open(staging_path(upload), 'wb').close()
+    return upload
+
+
+def append_chunk(upload_id, user, offset: int, data: bytes) -> ChunkedUpload:
+    """
+    Write one chunk at offset and acknowledge it
+
+    Raises:
+        UploadOffsetMismatch: If offset isn't where the session expects the next chunk
+        ValidationError: If the chunk is empty, too large or runs past the declared size,
+            or the session is already finalized
+    """
+    if not data:
+        raise ValidationError("Empty chunk")
+    if len(data) > chunk_size():
+        raise ValidationError(f"Chunks must be at most {chunk_size()} bytes")
+
+    with transaction.atomic():
+        # Serialises chunks for one session, so a retried request can't interleave
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload_id, user=user)
+        if upload.uploaded_cv_id:
+            raise ValidationError("Upload has already been finalized")
+        if offset != upload.offset:
+            raise UploadOffsetMismatch(upload.offset)
+        if offset + len(data) > upload.size:
+            raise ValidationError(f"Chunk runs past the declared size of {upload.size} bytes")
+
+        with open(staging_path(upload), 'r+b') as f:
+            f.seek(offset)
+            f.write(data)
+            # Drops anything left by a write that was never acknowledged
+            f.truncate()
+        upload.offset = offset + len(data)
+        upload.save(update_fields=['offset', 'updated_at'])
+    return upload
+
+
+def _digest(path: str) -> Tuple[str, bytes]:
+    """SHA-256 and header bytes of the staged file, read once"""
+    sha256 = hashlib.sha256()
+    header = b''
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            sha256.update(block)
+            if len(header) < HEADER_BYTES:
+                header += block[:HEADER_BYTES - len(header)]
+    return sha256.hexdigest(), header
+
+
+def finalize_upload(upload_id, user) -> UploadedCV:
+    """
+    Verify the staged bytes and store them as an UploadedCV queued for processing;
+    finalizing an already finalized session returns its UploadedCV
+
+    Raises:
+        ValidationError: If bytes are missing, the hash doesn't match (the session
+            is reset to offset 0) or the file fails validation
+    """
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().select_related('uploaded_cv').get(pk=upload_id, user=user)
+        if upload.uploaded_cv_id:
+            return upload.uploaded_cv
+        if upload.offset != upload.size:
+            raise ValidationError(f"Upload incomplete: {upload.offset} of {upload.size} bytes received")
+
+        path = staging_path(upload)
+        content_hash, header = _digest(path)
+        matched = content_hash == upload.sha256
+        if matched:
+            uploaded_cv = _store(upload, path, content_hash, header)
+        else:
+            logger.warning(f"Chunked upload {upload.pk} failed its checksum; resetting it")
+            open(path, 'wb').close()
+            upload.offset = 0
+            upload.save(update_fields=['offset', 'updated_at'])
+
+    if not matched:
+        raise ValidationError("Checksum mismatch; upload the file again")
+    os.remove(path)
+    return uploaded_cv
+
+
+def _store(upload: ChunkedUpload, path: str, content_hash: str, header: bytes) -> UploadedCV:
+    with open(path, 'rb') as f:
+        staged = File(f, name=upload.filename)
+        # Lets FileValidator and ContentAddressedStorage skip reading the file again
+        staged.content_hash = content_hash
+        staged.header = header
+        FileValidator.validate(staged)
+
+        uploaded_cv = UploadedCV(
+            user=upload.user,
+            original_filename=upload.filename,
+            content_hash=content_hash,
+            processing_state='queued',
+        )
+        uploaded_cv.file.save(upload.filename, staged, save=False)
+        uploaded_cv.save()
+
+    upload.uploaded_cv = uploaded_cv
+    upload.save(update_fields=['uploaded_cv', 'updated_at'])
+    # The worker reads the row from another connection
+    transaction.on_commit(lambda: start_upload_processing(uploaded_cv.pk, upload.user_id))
+    return uploaded_cv
+
+
+def discard_upload(upload: ChunkedUpload) -> None:
+    """Delete a session and its staged bytes"""
+    path = staging_path(upload)
+    if os.path.exists(path):
+        os.remove(path)
+    upload.delete()
+
+
+def clear_stale_uploads(max_age_hours: float) -> int:
+    """Discard unfinished sessions with no chunk for max_age_hours; returns how many"""
+    cutoff = timezone.now() - timedelta(hours=max_age_hours)
+    stale = ChunkedUpload.objects.filter(uploaded_cv__isnull=True, updated_at__lt=cutoff)
+    count = 0
+    for upload in stale:
+        discard_upload(upload)
+        count += 1
+    return count
@@ -0,0 +1,170 @@
+"""
+Instant cover letter drafts from Template(type='cover_letter').
+
+Templates use {{ placeholder }} syntax. Each template is compiled once into
+literal/placeholder segments and cached per process, so a draft is a single
+join over values taken from local CV insights and the parsed job description.
+The LLM-tailored letter is generated separately (see analysis_jobs).
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from .file_handlers import CVTextProcessor
+from .models import Template
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+COMPANY_PATTERNS = [
+    re.compile(r"\bAbout\s+([A-Z][\w&.\-]*(?:\s+[A-Z][\w&.\-]*){0,3})"),
+    re.compile(r"\b([A-Z][\w&.\-]*(?:\s+[A-Z][\w&.\-]*){0,3})\s+is\s+(?:hiring|looking|seeking)"),
+    re.compile(r"\b(?:at|join)\s+([A-Z][\w&.\-]*(?:\s+[A-Z][\w&.\-]*){0,3})"),
+]
+ACHIEVEMENT_PATTERN = re.compile(r"[^\n.]*\b\d+(?:\.\d+)?\s*(?:%|percent|x\b|\+)[^\n.]*")
+EDUCATION_PATTERN = re.compile(
+    r"[^\n]*\b(?:Bachelor|Master|PhD|Doctorate|BSc|MSc|BA|MA|MBA|Diploma|Degree)\b[^\n]*",
+    re.IGNORECASE
+)
+YEARS_PATTERN = re.compile(r"(\d+)\+?\s*years?", re.IGNORECASE)
+
+DEFAULT_DRAFT_TEMPLATE = """Dear Hiring Manager,
+
+I am writing to express my strong interest in the {{ job_title }} position at {{ company }}. With my experience in {{ top_skill }} and proven track record, I believe I would be a valuable addition to your organization.
+
+Throughout my career, I have demonstrated expertise in {{ skills }}. My background includes {{ experience }}, which has prepared me well for this role.
+
+Key achievements that align with your requirements include:
+{{ achievements }}
+
+I am excited about the opportunity to bring my skills and experience to your team and contribute to your continued success. I would welcome the chance to discuss how my background and enthusiasm can benefit your organization.
+
+Thank you for considering my application. I look forward to hearing from you.
+
+Sincerely,
+[Your Name]"""
+
+
+class CompiledTemplate:
+    """A template pre-split into literal text and placeholder names"""
+
+    def __init__(self, content: str):
+        self.content = content
+        # re.split with one group alternates literal, name, literal, ...
+        self.parts = PLACEHOLDER_PATTERN.split(content)
+        self.placeholders = set(self.parts[1::2])
+
+    def render(self, context: Dict[str, str]) -> str:
+        """Fill placeholders; unknown ones are left visible for the user to edit"""
+        parts = self.parts[:]
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = context[name] if context.get(name) else f"[{name}]"
+        return ''.join(parts)
+
+
+_default_template = CompiledTemplate(DEFAULT_DRAFT_TEMPLATE)
+_compiled: Dict[int, CompiledTemplate] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_compiled(template: Optional[Template]) -> CompiledTemplate:
+    """Compiled form of a template, recompiled only when its content changes"""
+    if template is None or not template.template_content:
+        return _default_template
+
+    compiled = _compiled.get(template.pk)
+    if compiled is None or compiled.content != template.template_content:
+        compiled = CompiledTemplate(template.template_content)
+        with _compiled_lock:
+            _compiled[template.pk] = compiled
+    return compiled
+
+
+def default_cover_letter_template(style: str = None) -> Optional[Template]:
+    """
+    Cover letter template to draft from: one matching the style if given,
+    otherwise the default (or first) cover letter template
+    """
+    templates = Template.objects.filter(type='cover_letter').order_by('-is_default', 'pk')
+    if style:
+        matching = templates.filter(style=style).first()
+        if matching:
+            return matching
+    return templates.first()
+
+
+def parse_job_description(job_title: str, job_description: str) -> Dict[str, Any]:
+    """Pull the company name and required skills out of a job description"""
+    company = ''
+    for pattern in COMPANY_PATTERNS:
+        match = pattern.search(job_description or '')
+        if match:
+            company = match.group(1).strip()
+            break
+
+    return {
+        'job_title': job_title,
+        'company': company or 'your organization',
+        'required_skills': CVTextProcessor.extract_skills(job_description or ''),
+    }
+
+
+def local_cv_insights(cv_text: str) -> Dict[str, Any]:
+    """Regex-only CV insights, shaped like extract_cv_insights output"""
+    cv_text = cv_text or ''
+    years = [int(value) for value in YEARS_PATTERN.findall(cv_text)]
+    return {
+        'skills': CVTextProcessor.extract_skills(cv_text),
+        'experience': [f"{max(years)}+ years of professional experience"] if years else [],
+        'education': [line.strip() for line in EDUCATION_PATTERN.findall(cv_text)[:2]],
+        'achievements': [line.strip(' -•\t') for line in ACHIEVEMENT_PATTERN.findall(cv_text)[:3]],
+        'summary': '',
+    }
+
+
+def build_context(cv_insights: Dict[str, Any], job_info: Dict[str, Any]) -> Dict[str, str]:
+    """Placeholder values for a draft"""
+    skills: List[str] = cv_insights.get('skills') or []
+    required = set(skill.lower() for skill in job_info.get('required_skills', []))
+    # Skills the job asks for come first
+    ordered = sorted(skills, key=lambda skill: skill.lower() not in required)
+    achievements = cv_insights.get('achievements') or []
+    experience = cv_insights.get('experience') or []
+    education = cv_insights.get('education') or []
+
+    return {
+        'job_title': job_info.get('job_title', ''),
+        'company': job_info.get('company', ''),
+        'top_skill': ordered[0] if ordered else 'software development',
+        'skills': ', '.join(ordered[:5]) if ordered else 'relevant technical skills',
+        'experience': experience[0] if experience else 'professional experience',
+        'education': ', '.join(education) if education else 'relevant educational background',
+        'achievements': '\n'.join(f"- {item}" for item in achievements[:3]) if achievements
+        else '- Strong problem-solving abilities\n- Excellent communication skills\n- Team collaboration',
+        'summary': cv_insights.get('summary') or 'experienced professional',
+    }
+
+
+def render_draft(cv_text: str, job_title: str, job_description: str,
+                 template: Optional[Template] = None,
+                 cv_insights: Dict[str, Any] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Render a cover letter draft without calling the LLM
+
+    Args:
+        cv_text: Extracted CV text
+        job_title: Target job title
+        job_description: Target job description
+        template: Cover letter Template; the built-in draft is used if None
+        cv_insights: Insights to use instead of the local regex extraction
+
+    Returns:
+        tuple: (draft letter, insights used)
+    """
+    insights = cv_insights or local_cv_insights(cv_text)
+    context = build_context(insights, parse_job_description(job_title, job_description))
+    return get_compiled(template).render(context), insights
@@ -5,13 +5,16 @@ Provides comprehensive CV analysis, scoring, and improvement recommendations
 
 import re
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+
+from .cv_sections import CVSections, SECTION_NAMES
+from .keywords import (
+    INDUSTRY_KEYWORDS, EXPERIENCE_INDICATORS, SCORED_ACTION_VERBS, SUGGESTED_ACTION_VERBS,
+    TECHNICAL_TERMS, KeywordHits, scan_keywords
+)
+from .nlp import get_nlp
 
 @dataclass
 class CVAnalysisResult:
@@ -30,65 +33,54 @@ class CVAnalyzer:
     """Advanced CV analysis service"""
     
     def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
+        # Industry-specific keywords and experience level indicators
+        self.industry_keywords = INDUSTRY_KEYWORDS
+        self.experience_indicators = EXPERIENCE_INDICATORS
+
+    @property
+    def nlp(self):
+        """Process-wide NER-only pipeline, loaded on first use"""
+        return get_nlp()
+
+    def analyze_cv(self, cv_text: str, job_description: str = None, industry: str = None,
+                   sections: Dict[str, Any] = None, doc=None) -> CVAnalysisResult:
+        """
+        Perform comprehensive CV analysis
         
-        # Industry-specific keywords
-        self.industry_keywords = {
-            'software_engineering': [
-                'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node.js',
-                'sql', 'mongodb', 'postgresql', 'aws', 'docker', 'kubernetes', 'git',
-                'agile', 'scrum', 'microservices', 'rest api', 'ci/cd', 'tdd'
-            ],
-            'data_science': [
-                'python', 'r', 'sql', 'machine learning', 'deep learning', 'statistics',
-                'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'tableau',
-                'power bi', 'data visualization', 'regression', 'classification', 'nlp'
-            ],
-            'marketing': [
-                'digital marketing', 'seo', 'sem', 'social media', 'content marketing',
-                'google analytics', 'facebook ads', 'email marketing', 'branding',
-                'campaign management', 'market research', 'crm', 'marketing automation'
-            ],
-            'finance': [
-                'financial analysis', 'excel', 'sql', 'power bi', 'tableau', 'modeling',
-                'forecasting', 'budgeting', 'reporting', 'accounting', 'investment',
-                'risk management', 'compliance', 'auditing', 'financial statements'
-            ]
-        }
+        Args:
+            doc: spaCy Doc of the preprocessed CV text, if already parsed (see analyze_many)
+        """
         
-        # Experience level indicators
-        self.experience_indicators = {
-            'entry': ['intern', 'junior', 'entry level', 'graduate', 'trainee'],
-            'mid': ['mid-level', 'senior', 'lead', 'specialist', 'analyst'],
-            'senior': ['senior', 'principal', 'director', 'manager', 'head of', 'vp']
-        }
-
-    def analyze_cv(self, cv_text: str, job_description: str = None, industry: str = None) -> CVAnalysisResult:
-        """Perform comprehensive CV analysis"""
+        # Segment before preprocessing flattens the line structure
+        cv_sections = CVSections(cv_text, sections)
         
         # Basic preprocessing
         cv_text = self._preprocess_text(cv_text)
         job_desc_text = self._preprocess_text(job_description) if job_description else ""
         
+        # One keyword pass per text, shared by every scoring step below
+        cv_hits = scan_keywords(cv_text)
+        job_hits = scan_keywords(job_desc_text) if job_desc_text else None
+        
         # Calculate scores
-        overall_score = self._calculate_overall_score(cv_text)
-        ats_score = self._calculate_ats_score(cv_text, job_desc_text)
+        overall_score = self._calculate_overall_score(cv_text, cv_sections, cv_hits)
+        ats_score = self._calculate_ats_score(cv_text, job_desc_text, cv_hits, job_hits)
         
         # Extract keywords
-        keyword_matches = self._extract_keywords(cv_text, industry)
-        missing_keywords = self._find_missing_keywords(cv_text, job_desc_text, industry)
+        keyword_matches = self._extract_keywords(cv_text, industry, doc, cv_hits)
+        missing_keywords = self._find_missing_keywords(keyword_matches, job_desc_text, industry, job_hits)
         
         # Generate suggestions
-        suggestions = self._generate_suggestions(cv_text, job_desc_text, industry)
+        suggestions = self._generate_suggestions(cv_text, job_desc_text, industry, cv_hits)
         
         # Section analysis
-        section_scores = self._analyze_sections(cv_text)
+        section_scores = self._analyze_sections(cv_sections)
         
         # Experience level
-        experience_level = self._determine_experience_level(cv_text)
+        experience_level = self._determine_experience_level(cv_hits)
         
         # Industry match
-        industry_match = self._calculate_industry_match(cv_text, industry)
+        industry_match = self._calculate_industry_match(cv_hits, industry)
         
         # Improvements
         improvements = self._generate_improvements(cv_text, job_desc_text)
@@ -105,6 +97,24 @@ class CVAnalyzer:
             experience_level=experience_level
         )
     
+    def analyze_many(self, items: Iterable[Tuple[str, Optional[Dict[str, Any]], Any]],
+                     job_description: str = None, batch_size: int = 64,
+                     n_process: int = 1) -> Iterator[Tuple[CVAnalysisResult, Any]]:
+        """
+        analyze_cv over (cv_text, sections, context) triples, with NER batched through nlp.pipe
+        
+        sections are the stored extraction-time sections (UploadedCV.sections),
+        or None to segment the text. Yields (result, context) in input order.
+        Items are read lazily, so a queryset iterator can be passed straight in.
+        """
+        texts = (
+            (self._preprocess_text(cv_text), (cv_text, sections, context))
+            for cv_text, sections, context in items
+        )
+        docs = self.nlp.pipe(texts, as_tuples=True, batch_size=batch_size, n_process=n_process)
+        for doc, (cv_text, sections, context) in docs:
+            yield self.analyze_cv(cv_text, job_description, sections=sections, doc=doc), context
+    
     def _preprocess_text(self, text: str) -> str:
         """Clean and preprocess text"""
         # Remove extra whitespace
@@ -113,14 +123,14 @@ class CVAnalyzer:
         text = text.lower()
         return text.strip()
     
-    def _calculate_overall_score(self, cv_text: str) -> float:
+    def _calculate_overall_score(self, cv_text: str, cv_sections: CVSections, hits: KeywordHits) -> float:
         """Calculate overall CV quality score"""
         score = 50  # Base score
         
         # Check for essential sections
         sections = ['experience', 'education', 'skills', 'summary', 'contact']
         for section in sections:
-            if section in cv_text:
+            if cv_sections.has(section):
                 score += 10
         
         # Check for quantifiable achievements
@@ -129,13 +139,13 @@ class CVAnalyzer:
             score += 10
         
         # Check for action verbs
-        action_verbs = ['achieved', 'managed', 'developed', 'implemented', 'increased', 'reduced']
-        verb_count = sum(1 for verb in action_verbs if verb in cv_text)
+        verb_count = len(hits.matched(SCORED_ACTION_VERBS))
         score += min(verb_count * 2, 10)
         
         return min(score, 100)
     
-    def _calculate_ats_score(self, cv_text: str, job_desc: str) -> float:
+    def _calculate_ats_score(self, cv_text: str, job_desc: str, cv_hits: KeywordHits,
+                             job_hits: Optional[KeywordHits]) -> float:
         """Calculate ATS compatibility score"""
         if not job_desc:
             return 75  # Default score without job description
@@ -148,18 +158,19 @@ class CVAnalyzer:
         similarity = len(common_words) / max(len(job_words), 1) * 100
         
         # Adjust for technical terms
-        technical_terms = ['python', 'java', 'sql', 'javascript', 'react', 'angular']
-        tech_matches = sum(1 for term in technical_terms if term in cv_text and term in job_desc)
+        tech_matches = sum(1 for term in cv_hits.matched(TECHNICAL_TERMS) if term in job_hits)
         
         final_score = (similarity * 0.7) + (tech_matches * 3)
         return min(final_score, 100)
     
-    def _extract_keywords(self, cv_text: str, industry: str = None) -> List[str]:
+    def _extract_keywords(self, cv_text: str, industry: str = None, doc=None,
+                          hits: KeywordHits = None) -> List[str]:
         """Extract relevant keywords from CV"""
         keywords = []
         
         # Extract technical skills
-        doc = self.nlp(cv_text)
+        if doc is None:
+            doc = self.nlp(cv_text)
         for ent in doc.ents:
             if ent.label_ in ['ORG', 'PRODUCT', 'TECHNOLOGY']:
                 keywords.append(ent.text.lower())
@@ -167,21 +178,24 @@ class CVAnalyzer:
         # Add industry-specific keywords
         if industry and industry in self.industry_keywords:
             industry_kw = self.industry_keywords[industry]
-            keywords.extend([kw for kw in industry_kw if kw in cv_text])
+            if hits is None:
+                hits = scan_keywords(cv_text)
+            keywords.extend(hits.matched(industry_kw))
         
         return list(set(keywords))
     
-    def _find_missing_keywords(self, cv_text: str, job_desc: str, industry: str = None) -> List[str]:
+    def _find_missing_keywords(self, cv_keywords: List[str], job_desc: str, industry: str = None,
+                               job_hits: KeywordHits = None) -> List[str]:
         """Find keywords missing from CV compared to job description"""
         if not job_desc:
             return []
         
-        cv_keywords = set(self._extract_keywords(cv_text, industry))
-        job_keywords = set(self._extract_keywords(job_desc, industry))
+        job_keywords = set(self._extract_keywords(job_desc, industry, hits=job_hits))
         
-        return list(job_keywords - cv_keywords)
+        return list(job_keywords - set(cv_keywords))
     
-    def _generate_suggestions(self, cv_text: str, job_desc: str, industry: str = None) -> List[str]:
+    def _generate_suggestions(self, cv_text: str, job_desc: str, industry: str,
+                              hits: KeywordHits) -> List[str]:
         """Generate improvement suggestions"""
         suggestions = []
         
@@ -194,8 +208,7 @@ class CVAnalyzer:
             suggestions.append("Add quantifiable achievements with numbers and percentages")
         
         # Action verbs
-        action_verbs = ['achieved', 'managed', 'developed', 'led', 'implemented']
-        if not any(verb in cv_text for verb in action_verbs):
+        if not hits.any(SUGGESTED_ACTION_VERBS):
             suggestions.append("Use more action verbs to describe your accomplishments")
         
         # Industry-specific suggestions
@@ -205,53 +218,27 @@ class CVAnalyzer:
         
         return suggestions
     
-    def _analyze_sections(self, cv_text: str) -> Dict[str, float]:
+    def _analyze_sections(self, cv_sections: CVSections) -> Dict[str, float]:
         """Analyze individual CV sections"""
-        sections = {
-            'contact': 0,
-            'summary': 0,
-            'experience': 0,
-            'education': 0,
-            'skills': 0,
-            'certifications': 0
-        }
-        
-        # Check for section presence
-        section_patterns = {
-            'contact': r'(phone|email|address|linkedin)',
-            'summary': r'(summary|objective|profile)',
-            'experience': r'(experience|employment|work history)',
-            'education': r'(education|degree|university|college)',
-            'skills': r'(skills|technologies|competencies)',
-            'certifications': r'(certifications|certificates|licenses)'
-        }
-        
-        for section, pattern in section_patterns.items():
-            if re.search(pattern, cv_text, re.IGNORECASE):
-                sections[section] = 100
-        
+        sections = {section: 100 if cv_sections.has(section) else 0 for section in SECTION_NAMES}
+        sections['contact'] = 100 if cv_sections.has_contact_details() else 0
         return sections
     
-    def _determine_experience_level(self, cv_text: str) -> str:
+    def _determine_experience_level(self, hits: KeywordHits) -> str:
         """Determine candidate's experience level"""
-        text_lower = cv_text.lower()
-        
         for level, indicators in self.experience_indicators.items():
-            for indicator in indicators:
-                if indicator in text_lower:
-                    return level
+            if hits.any(indicators):
+                return level
         
         return "mid"  # Default
     
-    def _calculate_industry_match(self, cv_text: str, industry: str) -> float:
+    def _calculate_industry_match(self, hits: KeywordHits, industry: str) -> float:
         """Calculate how well CV matches target industry"""
         if not industry or industry not in self.industry_keywords:
             return 75
         
         industry_words = self.industry_keywords[industry]
-        cv_words = cv_text.lower().split()
-        
-        matches = sum(1 for word in industry_words if word in cv_words)
+        matches = len(hits.matched(industry_words))
         match_percentage = (matches / len(industry_words)) * 100
         
         return min(match_percentage, 100)
@@ -0,0 +1,158 @@
+"""
+Section segmentation for extracted CV text.
+
+segment_cv finds section headings (Experience, Education, Skills, ...) in one
+pass with a single compiled pattern and returns character spans per section.
+The result is JSON-serialisable and is stored on UploadedCV.sections at upload
+time, so scoring and prompt building read pre-split sections instead of
+re-scanning the whole text.
+"""
+
+import re
+from typing import Dict, List, Any, Optional
+
+from .file_handlers import CVTextProcessor
+
+# Bump when segmentation output changes; older stored segments are recomputed
+SEGMENTER_VERSION = 1
+
+# Sections every consumer knows about
+SECTION_NAMES = ('contact', 'summary', 'experience', 'education', 'skills', 'certifications')
+
+SECTION_HEADINGS = {
+    'contact': ['contact', 'contact information', 'contact details', 'personal details', 'personal information'],
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'executive summary', 'profile',
+        'professional profile', 'personal profile', 'objective', 'career objective', 'about me',
+        'personal statement',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'relevant experience',
+        'employment', 'employment history', 'work history', 'career history',
+    ],
+    'education': [
+        'education', 'academic background', 'academic qualifications', 'qualifications',
+        'education and training', 'education & training',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'core competencies', 'competencies',
+        'technologies', 'skills and competencies', 'skills & competencies',
+    ],
+    'certifications': [
+        'certifications', 'certificates', 'licenses', 'licences', 'professional certifications',
+        'certifications and licenses', 'certifications & licenses',
+    ],
+    # Not scored on their own, but they end the section before them
+    'projects': ['projects', 'key projects', 'personal projects'],
+    'achievements': ['achievements', 'key achievements', 'accomplishments', 'awards', 'honours', 'honors'],
+    'languages': ['languages'],
+    'interests': ['interests', 'hobbies', 'hobbies and interests', 'hobbies & interests'],
+    'publications': ['publications'],
+    'volunteering': ['volunteering', 'volunteer experience'],
+    'references': ['references'],
+}
+
+_HEADING_NAMES = {phrase: name for name, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+_PHRASES = sorted(_HEADING_NAMES, key=len, reverse=True)
+
+# A heading is a known phrase at the start of a line, either alone on the line
+# ("Experience"), followed by a colon ("Skills: Python, SQL"), or in capitals
+# followed by content, as PDF extraction often joins lines ("EDUCATION BSc ...")
+HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:[#*•\-][ \t]*)?"
+    r"(?:(?P<heading>" + '|'.join(re.escape(phrase) for phrase in _PHRASES) + r")[ \t]*(?::|$)"
+    r"|(?-i:(?P<caps>" + '|'.join(re.escape(phrase.upper()) for phrase in _PHRASES) + r"))(?=[ \t]))",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Header block used as contact details when there is no Contact heading
+CONTACT_MAX_CHARS = 600
+
+# Order and labels for prompt text
+PROMPT_SECTIONS = ('summary', 'experience', 'achievements', 'projects', 'skills', 'education', 'certifications')
+
+Segments = Dict[str, Any]
+
+
+def segment_cv(text: str) -> Segments:
+    """
+    Split CV text into sections
+
+    Returns:
+        dict: {'version': SEGMENTER_VERSION,
+               'sections': {name: [[heading_start, content_start, end], ...]}}
+            with character offsets into text; a section may appear more than once
+    """
+    text = text or ''
+    headings = []
+    for match in HEADING_PATTERN.finditer(text):
+        phrase = (match.group('heading') or match.group('caps')).lower()
+        headings.append((match.start(), match.end(), _HEADING_NAMES[phrase]))
+
+    sections: Dict[str, List[List[int]]] = {}
+    for i, (start, content_start, name) in enumerate(headings):
+        end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+        if text[content_start:end].strip():
+            sections.setdefault(name, []).append([start, content_start, end])
+
+    if 'contact' not in sections:
+        header_end = min(headings[0][0] if headings else len(text), CONTACT_MAX_CHARS)
+        if text[:header_end].strip():
+            sections['contact'] = [[0, 0, header_end]]
+
+    return {'version': SEGMENTER_VERSION, 'sections': sections}
+
+
+class CVSections:
+    """Extracted text plus its section spans"""
+
+    def __init__(self, text: str, segments: Optional[Segments] = None):
+        self.text = text or ''
+        if not segments or segments.get('version') != SEGMENTER_VERSION:
+            segments = segment_cv(self.text)
+        # Stored text may have been cut to a smaller budget than the segments saw
+        length = len(self.text)
+        self.spans: Dict[str, List[List[int]]] = {
+            name: [[start, min(content_start, length), min(end, length)]
+                   for start, content_start, end in spans if content_start < length]
+            for name, spans in segments.get('sections', {}).items()
+        }
+        self.spans = {name: spans for name, spans in self.spans.items() if spans}
+
+    def has(self, name: str) -> bool:
+        return bool(self.spans.get(name))
+
+    def get(self, name: str) -> str:
+        """Text of a section without its heading (all occurrences), or '' if absent"""
+        return '\n'.join(self.text[content_start:end].strip() for _, content_start, end in self.spans.get(name, []))
+
+    def has_contact_details(self) -> bool:
+        contact = self.get('contact')
+        details = CVTextProcessor.scan(contact, skills=())
+        return bool(details.email or details.phone or details.linkedin or 'linkedin' in contact.lower())
+
+    def for_prompt(self, max_chars: int) -> str:
+        """
+        CV text for an LLM prompt within max_chars
+
+        Sections are labelled and the budget is shared out so short sections
+        are kept whole and long ones are cut evenly, instead of truncating the
+        raw text and losing whatever comes last. Without a Summary heading the
+        header block is kept, since an unlabelled summary usually lives there.
+        """
+        pieces = {name: self.get(name) for name in PROMPT_SECTIONS if self.has(name)}
+        if not pieces:
+            return self.text[:max_chars]
+        if 'summary' not in pieces and self.has('contact'):
+            pieces = {'header': self.get('contact'), **pieces}
+        labels = {name: f"{name.title()}:\n" for name in pieces}
+        remaining = max_chars - sum(len(label) + 2 for label in labels.values())
+
+        allotted = {}
+        by_length = sorted(pieces, key=lambda name: len(pieces[name]))
+        for i, name in enumerate(by_length):
+            share = max(remaining // (len(by_length) - i), 0)
+            allotted[name] = pieces[name][:share]
+            remaining -= len(allotted[name])
+
+        return '\n\n'.join(labels[name] + allotted[name] for name in pieces)[:max_chars]
@@ -0,0 +1,170 @@
+"""
+Extraction and analysis cache keyed by the SHA-256 of uploaded bytes.
+
+Re-uploading an identical file skips MIME sniffing and text extraction, and
+reuses the stored analysis when it was produced by the current analyzer.
+Artifacts (text, section offsets, analysis) live in ProcessedDocument, one
+row per (hash, extractor version).
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+
+from django.db import IntegrityError
+from django.db.models import F
+
+from .ai_services import ANALYZER_VERSION
+from .cv_sections import segment_cv, SEGMENTER_VERSION
+from .extraction_telemetry import ExtractionMeasurement, record_extraction
+from .file_handlers import (
+    CVFileHandler, TextExtractionError, ExtractionUnavailableError, ExtractionTimeoutError, EXTRACTOR_VERSION
+)
+from .file_validators import FileValidator
+from .models import ProcessedDocument
+
+logger = logging.getLogger(__name__)
+
+
+def compute_content_hash(uploaded_file) -> str:
+    """SHA-256 of the upload, reusing one computed by the upload handler if present"""
+    digest = getattr(uploaded_file, 'content_hash', None)
+    if digest:
+        return digest
+
+    sha256 = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        sha256.update(chunk)
+    uploaded_file.seek(0)
+    # Lets ContentAddressedStorage skip hashing the file a second time
+    uploaded_file.content_hash = sha256.hexdigest()
+    return uploaded_file.content_hash
+
+
+@dataclass
+class DocumentExtraction:
+    """Text and cache state for one upload"""
+    text: str
+    mime_type: str
+    content_hash: str
+    cache_hit: bool = False
+    document: Optional[ProcessedDocument] = None
+    sections: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def analysis(self) -> Optional[Dict[str, Any]]:
+        """Cached analysis, if one exists for the current analyzer version"""
+        if self.document and self.document.analysis and self.document.analyzer_version == ANALYZER_VERSION:
+            return dict(self.document.analysis)
+        return None
+
+
+def _cached_document(content_hash: str, max_chars: int) -> Optional[ProcessedDocument]:
+    document = ProcessedDocument.objects.filter(
+        content_hash=content_hash, extractor_version=EXTRACTOR_VERSION
+    ).first()
+    if document is None:
+        return None
+    # Text cut at a smaller budget can't serve a larger one
+    if document.metadata.get('truncated') and document.metadata.get('max_chars', 0) < max_chars:
+        return None
+    return document
+
+
+def validate_and_extract(uploaded_file, max_chars: int, for_storage: bool = False) -> DocumentExtraction:
+    """
+    Validate an upload and extract its text, using the content-hash cache
+
+    Args:
+        uploaded_file: Django UploadedFile
+        max_chars: Character budget for the extracted text
+        for_storage: Return UploadedCV placeholder messages instead of raising
+            TextExtractionError when there is no usable text
+
+    Raises:
+        ValidationError: If the file fails validation
+        ExtractionUnavailableError: If extraction timed out or the pool is full
+        TextExtractionError: If extraction failed and for_storage is False
+    """
+    content_hash = compute_content_hash(uploaded_file)
+    document = _cached_document(content_hash, max_chars)
+
+    if document:
+        # Same bytes were validated before; only the name and size can differ
+        FileValidator.validate(uploaded_file, mime_type=document.mime_type)
+        ProcessedDocument.objects.filter(pk=document.pk).update(hit_count=F('hit_count') + 1)
+        logger.info(f"Document cache hit for {content_hash[:12]}")
+        text = document.extracted_text[:max_chars]
+        sections = document.metadata.get('sections')
+        if not sections or sections.get('version') != SEGMENTER_VERSION:
+            sections = segment_cv(text)
+        return DocumentExtraction(
+            text=text,
+            mime_type=document.mime_type,
+            content_hash=content_hash,
+            cache_hit=True,
+            document=document,
+            sections=sections
+        )
+
+    mime_type = FileValidator.validate(uploaded_file).mime_type
+
+    measurement = ExtractionMeasurement()
+    try:
+        text = CVFileHandler.extract_text(uploaded_file, mime_type, max_chars, measurement=measurement)
+    except ExtractionUnavailableError as e:
+        outcome = 'timeout' if isinstance(e, ExtractionTimeoutError) else 'busy'
+        record_extraction(mime_type, uploaded_file.size, None, measurement, outcome)
+        raise
+    except TextExtractionError as e:
+        record_extraction(mime_type, uploaded_file.size, None, measurement, 'failed')
+        if not for_storage:
+            raise
+        logger.error(str(e))
+        return DocumentExtraction(CVFileHandler.storage_placeholder(mime_type, e), mime_type, content_hash)
+
+    record_extraction(mime_type, uploaded_file.size, text, measurement)
+    if not text:
+        if not for_storage:
+            return DocumentExtraction(text, mime_type, content_hash)
+        return DocumentExtraction(CVFileHandler.storage_placeholder(mime_type), mime_type, content_hash)
+
+    sections = segment_cv(text)
+    document = _store_document(content_hash, mime_type, uploaded_file.size, text, max_chars, sections)
+    return DocumentExtraction(text, mime_type, content_hash, document=document, sections=sections)
+
+
+def _store_document(content_hash: str, mime_type: str, size: int, text: str,
+                    max_chars: int, sections: Dict[str, Any]) -> Optional[ProcessedDocument]:
+    defaults = {
+        'mime_type': mime_type,
+        'file_size': size,
+        'extracted_text': text,
+        'metadata': {
+            'chars': len(text),
+            'max_chars': max_chars,
+            'truncated': len(text) >= max_chars,
+            'sections': sections,
+        },
+    }
+    try:
+        document, _ = ProcessedDocument.objects.update_or_create(
+            content_hash=content_hash, extractor_version=EXTRACTOR_VERSION, defaults=defaults
+        )
+        return document
+    except IntegrityError:
+        # A concurrent upload of the same bytes stored it first
+        return ProcessedDocument.objects.filter(
+            content_hash=content_hash, extractor_version=EXTRACTOR_VERSION
+        ).first()
+
+
+def store_analysis(content_hash: str, analysis: Dict[str, Any]) -> None:
+    """Attach a completed analysis to the cached document for these bytes"""
+    if not content_hash:
+        return
+    cached = {key: value for key, value in analysis.items() if key not in ('job_id', 'pending')}
+    ProcessedDocument.objects.filter(
+        content_hash=content_hash, extractor_version=EXTRACTOR_VERSION
+    ).update(analysis=cached, analyzer_version=ANALYZER_VERSION)
@@ -0,0 +1,124 @@
+"""
+Streaming DOCX text extraction.
+
+python-docx builds the whole object model and only exposes body paragraphs,
+so skills tables and contact details in page headers are lost. This reads
+word/document.xml (and the header/footer parts) straight from the zip with an
+incremental parser, emitting paragraph and table text in reading order and
+stopping as soon as the character budget is reached. Parsed elements are
+cleared as they are consumed, so memory stays flat for long documents.
+"""
+
+import re
+import zipfile
+from typing import Iterator, List
+from xml.etree.ElementTree import iterparse
+
+from .file_handlers import FileSource, DEFAULT_MAX_CHARS, TextExtractionError, _open_source
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+PARAGRAPH, TABLE, ROW, CELL = W + 'p', W + 'tbl', W + 'tr', W + 'tc'
+TEXT, TAB, BREAKS = W + 't', W + 'tab', (W + 'br', W + 'cr')
+
+HEADER_PART = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PART = re.compile(r"^word/footer\d*\.xml$")
+CELL_SEPARATOR = ' | '
+
+
+def _part_lines(stream) -> Iterator[str]:
+    """Lines of one WordprocessingML part: paragraphs, and one line per table row"""
+    runs: List[str] = []
+    cells: List[List[str]] = []   # paragraphs of each open table cell
+    rows: List[List[str]] = []    # cells of each open table row
+    fallback_depth = 0
+    open_elements = []
+
+    for event, element in iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            open_elements.append(element)
+            if tag == MC_FALLBACK:
+                # Text boxes are stored twice (Choice and Fallback); read one copy
+                fallback_depth += 1
+            elif tag == CELL:
+                cells.append([])
+            elif tag == ROW:
+                rows.append([])
+            continue
+
+        open_elements.pop()
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == TEXT:
+            runs.append(element.text or '')
+        elif tag == TAB:
+            runs.append('\t')
+        elif tag in BREAKS:
+            runs.append('\n')
+        elif tag == PARAGRAPH:
+            text = ''.join(runs)
+            runs = []
+            if cells:
+                cells[-1].append(text)
+            else:
+                yield text
+            element.clear()
+        elif tag == CELL:
+            paragraphs = cells.pop()
+            if rows:
+                rows[-1].append(' '.join(text for text in paragraphs if text.strip()))
+        elif tag == ROW:
+            line = CELL_SEPARATOR.join(cell for cell in rows.pop() if cell)
+            if cells:
+                cells[-1].append(line)
+            elif line:
+                yield line
+
+        # Drop consumed top-level blocks (children of w:body, or of the
+        # header/footer root) so the tree never holds the whole document
+        if tag in (PARAGRAPH, TABLE) and 0 < len(open_elements) <= 2 and open_elements[-1].tag != CELL:
+            open_elements[-1].clear()
+
+
+def iter_docx_lines(source: FileSource) -> Iterator[str]:
+    """Header, body and footer lines in reading order; repeated header/footer lines are skipped"""
+    with zipfile.ZipFile(_open_source(source)) as archive:
+        names = archive.namelist()
+        headers = sorted(name for name in names if HEADER_PART.match(name))
+        footers = sorted(name for name in names if FOOTER_PART.match(name))
+
+        seen = set()
+        for name in headers + ['word/document.xml'] + footers:
+            repeated_parts = name != 'word/document.xml'
+            with archive.open(name) as stream:
+                for line in _part_lines(stream):
+                    if repeated_parts:
+                        if line in seen:
+                            continue
+                        seen.add(line)
+                    yield line
+
+
+def extract_text_from_docx_stream(source: FileSource, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """
+    Extract DOCX text including tables, headers and footers, stopping at max_chars
+
+    Raises:
+        TextExtractionError: If the document cannot be parsed
+    """
+    try:
+        chunks = []
+        total = 0
+        for line in iter_docx_lines(source):
+            chunk = line + "\n"
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_chars:
+                break
+        return ''.join(chunks)[:max_chars].strip()
+    except Exception as e:
+        raise TextExtractionError(f"Error extracting DOCX text: {str(e)}") from e
@@ -0,0 +1,444 @@
+"""
+Isolated process pool for CV text extraction.
+
+PyPDF2 can spin or balloon on malformed documents, so extraction runs in a
+warm forkserver pool instead of the request thread. Each worker has an
+RLIMIT_AS memory cap and is replaced after a fixed number of jobs. Every job
+reports the PID of the worker that picked it up; when one overruns its
+wall-clock timeout the request sees ExtractionTimeoutError, new jobs go to a
+fresh pool, and only that worker is killed once the old pool's other running
+jobs have finished (see ExtractionPool._recycle). Admission is bounded so a
+burst of uploads is rejected early rather than queueing forever.
+
+With EXTRACTION_PARALLEL_PAGES_ENABLED, long PDFs are split into page ranges
+that run on several workers at once and are merged back in page order (see
+ExtractionPool.extract_pdf).
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import (
+    CancelledError, Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+)
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from .extraction_telemetry import ExtractionMeasurement, track_peak_rss
+from .file_handlers import (
+    CVFileHandler, FileSource, DEFAULT_MAX_CHARS, PDF_MIME_TYPES, TextExtractionError,
+    ExtractionTimeoutError, ExtractionBusyError
+)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_WAIT_SECONDS = 1.0
+
+# Set in each worker by _init_worker: where jobs report (job id, worker PID)
+_job_reports = None
+
+
+def _init_worker(memory_limit_bytes: int, job_reports=None) -> None:
+    """Cap the worker's address space so a runaway parse raises MemoryError"""
+    global _job_reports
+    _job_reports = job_reports
+    if resource and memory_limit_bytes:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit_bytes = min(memory_limit_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, hard))
+
+
+def _tracked_job(job_id: int, deadline: float, fn, *args):
+    """Report which worker picked the job up, then run it; jobs nobody waits for any more are skipped"""
+    if time.time() > deadline:
+        raise ExtractionBusyError("Extraction did not start in time")
+    if _job_reports is not None:
+        _job_reports.put((job_id, os.getpid()))
+    return fn(*args)
+
+
+def _extract_job(source: FileSource, mime_type: str, max_chars: int) -> Tuple[str, ExtractionMeasurement]:
+    measurement = ExtractionMeasurement()
+    return CVFileHandler.extract_text_in_process(source, mime_type, max_chars, measurement), measurement
+
+
+def _pdf_head_job(source: FileSource, page_threshold: int, first_stop: int,
+                  max_chars: int) -> Tuple[int, str, bool, ExtractionMeasurement]:
+    """
+    Parse the PDF once: (page count, text, whether the text is complete, measurement)
+
+    PDFs under page_threshold pages are extracted whole; for longer ones the
+    text is the raw first page range [0, first_stop), read with the same parser.
+    Anything PyPDF2 can't read, or a short PDF it finds no text in, goes through
+    the other backends instead.
+    """
+    measurement = ExtractionMeasurement(backend='pypdf2')
+    try:
+        with track_peak_rss(measurement):
+            pdf_reader = CVFileHandler.open_pdf(source)
+            page_count = measurement.page_count = len(pdf_reader.pages)
+            if page_count >= page_threshold:
+                first_range = CVFileHandler.read_pdf_pages(pdf_reader, 0, first_stop, max_chars)
+                return page_count, first_range, False, measurement
+            text = CVFileHandler.read_pdf_pages(pdf_reader, 0, None, max_chars)[:max_chars].strip()
+        if text:
+            return page_count, text, True, measurement
+    except TextExtractionError:
+        page_count = None
+    text = CVFileHandler.extract_text_in_process(source, PDF_MIME_TYPES[0], max_chars, measurement)
+    return page_count, text, True, measurement
+
+
+def _pdf_pages_job(source: FileSource, start: int, stop: int, max_chars: int) -> Tuple[str, ExtractionMeasurement]:
+    measurement = ExtractionMeasurement(backend='pypdf2')
+    with track_peak_rss(measurement):
+        text = CVFileHandler.extract_pdf_pages(source, start, stop, max_chars)
+    return text, measurement
+
+
+def page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    """[(0, n), (n, 2n), ...] covering every page"""
+    pages_per_task = max(1, pages_per_task)
+    return [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+
+
+def _warm_up() -> None:
+    """No-op job used to start workers before the first upload"""
+
+
+class ExtractionPool:
+    """Bounded, self-healing process pool for document extraction"""
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, timeout: float = 15,
+                 memory_limit_mb: int = 1024, max_tasks_per_worker: int = 50,
+                 parallel_page_threshold: int = 8, pages_per_task: int = 2):
+        self.workers = workers
+        self.parallel_page_threshold = parallel_page_threshold
+        self.pages_per_task = pages_per_task
+        self.timeout = timeout
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._job_reports = None
+        self._job_ids = itertools.count()
+        self._jobs: Dict[int, Tuple[ProcessPoolExecutor, Future]] = {}
+        self._job_pids: Dict[int, int] = {}
+        # Pools retired, and other users' jobs that were still running when a
+        # stuck worker had to be killed (they fail over to a fresh pool)
+        self.recycles = 0
+        self.collateral_jobs = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context('forkserver')
+                if self._job_reports is None:
+                    self._job_reports = context.SimpleQueue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit_bytes, self._job_reports),
+                    max_tasks_per_child=self.max_tasks_per_worker,
+                )
+                for _ in range(self.workers):
+                    self._executor.submit(_warm_up)
+            return self._executor
+
+    def _submit(self, executor: ProcessPoolExecutor, timeout: float, fn, *args) -> Tuple[int, Future]:
+        """Submit fn as a job that reports its worker's PID when it starts"""
+        job_id = next(self._job_ids)
+        future = executor.submit(_tracked_job, job_id, time.time() + timeout, fn, *args)
+        with self._lock:
+            self._jobs[job_id] = (executor, future)
+            self._collect_reports()
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return job_id, future
+
+    def _forget(self, job_id: int) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._job_pids.pop(job_id, None)
+
+    def _collect_reports(self) -> None:
+        """Drain the PID reports of jobs still in flight (call with the lock held)"""
+        while self._job_reports is not None and not self._job_reports.empty():
+            job_id, pid = self._job_reports.get()
+            if job_id in self._jobs:
+                self._job_pids[job_id] = pid
+
+    def _worker_pid(self, job_id: int) -> Optional[int]:
+        """PID of the worker running the job, or None if no worker has started it"""
+        with self._lock:
+            self._collect_reports()
+            return self._job_pids.get(job_id)
+
+    def _recycle(self, executor: ProcessPoolExecutor, overdue_jobs: Sequence[int] = ()) -> None:
+        """
+        Retire a pool with a stuck or dead worker; new jobs start on a fresh one
+
+        Jobs still queued on the old pool are cancelled and their callers
+        resubmit them. Only the workers running overdue_jobs are killed, and
+        only once the old pool's other running jobs have finished or have had
+        the pool timeout to do so: killing any worker breaks the whole
+        ProcessPoolExecutor, so jobs still running then die too. Those are
+        counted in collateral_jobs and retried by their callers.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.recycles += 1
+                logger.warning("Extraction pool recycled")
+            self._collect_reports()
+            overdue = [(self._job_pids[job_id], self._jobs[job_id][1])
+                       for job_id in overdue_jobs if job_id in self._job_pids]
+            others = [future for job_id, (owner, future) in self._jobs.items()
+                      if owner is executor and job_id not in overdue_jobs]
+        executor.shutdown(wait=False, cancel_futures=True)
+        if overdue:
+            threading.Thread(target=self._kill_when_idle, args=(overdue, others), daemon=True).start()
+
+    def _kill_when_idle(self, overdue: List[Tuple[int, Future]], others: List[Future]) -> None:
+        _, still_running = wait(others, timeout=self.timeout)
+        for pid, future in overdue:
+            if future.done():
+                continue  # finished after all; the PID may belong to someone else by now
+            if still_running:
+                with self._lock:
+                    self.collateral_jobs += len(still_running)
+                logger.warning(
+                    f"Killing stuck extraction worker {pid} also stops {len(still_running)} other running job(s)"
+                )
+                still_running = ()
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def warm(self) -> None:
+        self._get_executor()
+
+    def shutdown(self) -> None:
+        """Stop the workers once in-flight jobs finish; the next job starts a new pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+    def extract(self, source: FileSource, mime_type: str, max_chars: int = DEFAULT_MAX_CHARS,
+                timeout: float = None, measurement: ExtractionMeasurement = None) -> str:
+        """
+        Extract text in a worker process
+
+        Args:
+            measurement: Optional ExtractionMeasurement to fill with what the worker measured
+
+        Raises:
+            ExtractionBusyError: If the queue is full
+            ExtractionTimeoutError: If the document takes longer than the timeout
+            TextExtractionError: If the document cannot be parsed
+        """
+        text, worker_measurement = self.run(_extract_job, self._portable(source), mime_type, max_chars, timeout=timeout)
+        if measurement is not None:
+            measurement.merge_worker(worker_measurement)
+        return text
+
+    def extract_pdf(self, source: FileSource, max_chars: int = DEFAULT_MAX_CHARS,
+                    timeout: float = None, measurement: ExtractionMeasurement = None) -> str:
+        """
+        Extract a PDF, spreading its pages over the workers when it is long
+        
+        PDFs under parallel_page_threshold pages are extracted by one worker.
+        Longer ones are cut into ranges of pages_per_task pages; up to one range
+        per worker is in flight, results are merged in page order, and ranges
+        not yet started are dropped once max_chars is reached.
+        
+        Raises:
+            ExtractionBusyError: If the queue is full
+            ExtractionTimeoutError: If the document takes longer than the timeout
+            TextExtractionError: If the document cannot be parsed
+        """
+        timeout = timeout or self.timeout
+        if measurement is None:
+            measurement = ExtractionMeasurement()
+        if not self._slots.acquire(timeout=ADMISSION_WAIT_SECONDS):
+            raise ExtractionBusyError("Extraction queue is full")
+        try:
+            with self._as_path(source) as path:
+                return self._extract_pdf_admitted(path, max_chars, timeout, measurement)
+        finally:
+            self._slots.release()
+
+    def _extract_pdf_admitted(self, source: str, max_chars: int, timeout: float,
+                              measurement: ExtractionMeasurement) -> str:
+        deadline = time.monotonic() + timeout
+        threshold = self.parallel_page_threshold if self.workers > 1 else float('inf')
+        page_count, text, complete, head_measurement = self._run_admitted(
+            _pdf_head_job, (source, threshold, self.pages_per_task, max_chars), timeout
+        )
+        measurement.merge_worker(head_measurement)
+        if complete:
+            return text
+        try:
+            return self._run_ordered(source, page_count, text, max_chars, deadline, measurement)
+        except (BrokenProcessPool, CancelledError):
+            logger.warning(f"Worker died during page-parallel extraction of {page_count} pages; retrying serially")
+            remaining = max(deadline - time.monotonic(), 1)
+            text, worker_measurement = self._run_admitted(
+                _extract_job, (source, PDF_MIME_TYPES[0], max_chars), remaining
+            )
+            measurement.merge_worker(worker_measurement)
+            return text
+
+    def _run_ordered(self, source: str, page_count: int, first_chunk: str, max_chars: int, deadline: float,
+                     measurement: ExtractionMeasurement) -> str:
+        """Sliding window of page-range jobs after the first range, consumed in page order"""
+        chunks = [first_chunk]
+        total = len(first_chunk)
+        if total >= max_chars:
+            return first_chunk[:max_chars].strip()
+        executor = self._get_executor()
+        ranges = deque(page_ranges(page_count, self.pages_per_task)[1:])
+        in_flight = deque()
+
+        def submit_next():
+            start, stop = ranges.popleft()
+            in_flight.append(self._submit(
+                executor, max(deadline - time.monotonic(), 0), _pdf_pages_job, source, start, stop, max_chars
+            ))
+
+        try:
+            while ranges and len(in_flight) < self.workers:
+                submit_next()
+            while in_flight:
+                job_id, future = in_flight.popleft()
+                try:
+                    chunk, chunk_measurement = future.result(timeout=max(deadline - time.monotonic(), 0))
+                except FutureTimeoutError:
+                    # Stop this document's running ranges; if none had started, the
+                    # pool is busy with other jobs and nothing here is stuck
+                    started = [job for job, _ in [(job_id, future), *in_flight] if self._worker_pid(job)]
+                    if started:
+                        self._recycle(executor, started)
+                    raise ExtractionTimeoutError(
+                        f"Page-parallel extraction of {page_count} pages exceeded the deadline"
+                    )
+                except (BrokenProcessPool, CancelledError):
+                    self._recycle(executor)
+                    raise
+                measurement.merge_worker(chunk_measurement)
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= max_chars:
+                    break
+                if ranges:
+                    submit_next()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+        return ''.join(chunks)[:max_chars].strip()
+
+    def run(self, fn, *args, timeout: float = None):
+        """Run a picklable callable in the pool under the admission and timeout rules"""
+        timeout = timeout or self.timeout
+        if not self._slots.acquire(timeout=ADMISSION_WAIT_SECONDS):
+            raise ExtractionBusyError("Extraction queue is full")
+        try:
+            return self._run_admitted(fn, args, timeout)
+        finally:
+            self._slots.release()
+
+    def _run_admitted(self, fn, args: tuple, timeout: float):
+        for attempt in range(2):
+            executor = self._get_executor()
+            start = time.monotonic()
+            job_id, future = self._submit(executor, timeout, fn, *args)
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                if self._worker_pid(job_id) is None:
+                    future.cancel()  # if it is already handed to a worker, the worker skips it
+                    raise ExtractionBusyError("Extraction did not start in time")
+                self._recycle(executor, [job_id])
+                raise ExtractionTimeoutError(
+                    f"Extraction exceeded {timeout:.0f}s ({time.monotonic() - start:.1f}s)"
+                )
+            except (BrokenProcessPool, CancelledError):
+                # A worker died (hard memory limit, crash, or killed for another
+                # job's timeout while this one was running), or the job was still
+                # queued when its pool was retired; one more try on a fresh pool
+                self._recycle(executor)
+                if attempt:
+                    raise TextExtractionError("Extraction worker crashed")
+
+    @staticmethod
+    @contextmanager
+    def _as_path(source: FileSource):
+        """A path to the document, spooling bytes and in-memory files to a temp file once"""
+        if isinstance(source, str):
+            yield source
+            return
+        if hasattr(source, 'temporary_file_path'):
+            yield source.temporary_file_path()
+            return
+        fd, path = tempfile.mkstemp(prefix='cv-extract-', suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if isinstance(source, (bytes, bytearray)):
+                    f.write(source)
+                else:
+                    source.seek(0)
+                    shutil.copyfileobj(source, f)
+            yield path
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    def _portable(source: FileSource) -> FileSource:
+        """Picklable form of the source: a path for spooled uploads, else bytes"""
+        if isinstance(source, (str, bytes)):
+            return source
+        if hasattr(source, 'temporary_file_path'):
+            return source.temporary_file_path()
+        source.seek(0)
+        return source.read()
+
+
+_pool: Optional[ExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide pool, built from settings on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool(
+                workers=getattr(settings, 'EXTRACTION_POOL_WORKERS', 2),
+                max_queue=getattr(settings, 'EXTRACTION_MAX_QUEUE', 8),
+                timeout=getattr(settings, 'EXTRACTION_TIMEOUT_SECONDS', 15),
+                memory_limit_mb=getattr(settings, 'EXTRACTION_MEMORY_LIMIT_MB', 1024),
+                max_tasks_per_worker=getattr(settings, 'EXTRACTION_MAX_TASKS_PER_WORKER', 50),
+                parallel_page_threshold=getattr(settings, 'EXTRACTION_PARALLEL_PAGE_THRESHOLD', 8),
+                pages_per_task=getattr(settings, 'EXTRACTION_PAGES_PER_TASK', 2),
+            )
+        return _pool
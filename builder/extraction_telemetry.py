@@ -0,0 +1,211 @@
+"""
+Per-document extraction telemetry for capacity planning.
+
+Every extraction that misses the content-hash cache is stored as one compact
+ExtractionSample row: file size, MIME type, page count, extracted characters,
+the backend that produced the text, wall time, peak memory growth and the
+outcome. extraction_summary() turns the samples into percentiles per format
+and size bucket, which is what EXTRACTION_TIMEOUT_SECONDS,
+EXTRACTION_MEMORY_LIMIT_MB and the worker counts should be set from.
+
+Wall time is measured by the caller, so for pooled extraction it includes
+queueing and IPC, the same time the timeout bounds. Memory is the growth of
+the extracting process's peak RSS (ru_maxrss): a document that stays under an
+earlier document's high-water mark in a reused pool worker reads as 0, so the
+upper percentiles are the meaningful ones.
+
+Nothing here imports models at module level; the measuring half runs in pool
+workers.
+"""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in bytes; the last bucket catches anything larger
+SIZE_BUCKETS = (
+    ('<100KB', 100 * 1024),
+    ('100-500KB', 500 * 1024),
+    ('0.5-1MB', 1024 * 1024),
+    ('1-2MB', 2 * 1024 * 1024),
+    ('>2MB', None),
+)
+PERCENTILES = (50, 90, 95, 99)
+# Longest look-back a summary accepts, in days
+MAX_SUMMARY_DAYS = 3650
+
+FORMATS = {
+    'application/pdf': 'pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx',
+    'application/msword': 'doc',
+}
+
+
+@dataclass
+class ExtractionMeasurement:
+    """What one extraction cost; filled in by the extraction code as it runs"""
+    backend: str = ''
+    page_count: Optional[int] = None
+    peak_rss_delta_kb: Optional[int] = None
+    wall_ms: int = 0
+
+    def merge_worker(self, other: 'ExtractionMeasurement') -> None:
+        """Take what a worker measured; memory is the largest growth seen by any worker"""
+        self.backend = other.backend or self.backend
+        if other.page_count is not None:
+            self.page_count = other.page_count
+        if other.peak_rss_delta_kb is not None:
+            self.peak_rss_delta_kb = max(self.peak_rss_delta_kb or 0, other.peak_rss_delta_kb)
+
+
+def peak_rss_kb() -> Optional[int]:
+    """This process's peak resident set size so far, in KB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # bytes on macOS
+
+
+@contextmanager
+def track_peak_rss(measurement: ExtractionMeasurement):
+    before = peak_rss_kb()
+    try:
+        yield
+    finally:
+        after = peak_rss_kb()
+        if before is not None and after is not None:
+            measurement.peak_rss_delta_kb = max(measurement.peak_rss_delta_kb or 0, after - before)
+
+
+@contextmanager
+def track_wall_time(measurement: ExtractionMeasurement):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        measurement.wall_ms = int((time.perf_counter() - start) * 1000)
+
+
+def format_label(mime_type: str) -> str:
+    return FORMATS.get(mime_type, mime_type or 'unknown')
+
+
+def size_bucket(file_size: int) -> str:
+    for label, limit in SIZE_BUCKETS:
+        if limit is None or file_size < limit:
+            return label
+    return SIZE_BUCKETS[-1][0]
+
+
+def percentile(sorted_values: List[int], pct: float) -> Optional[int]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil without floats
+    return sorted_values[int(rank) - 1]
+
+
+def record_extraction(mime_type: str, file_size: int, text: Optional[str],
+                      measurement: ExtractionMeasurement, outcome: str = 'ok') -> None:
+    """Store one sample; telemetry must never fail an upload"""
+    from django.conf import settings
+    if not getattr(settings, 'EXTRACTION_TELEMETRY_ENABLED', True):
+        return
+    from .models import ExtractionSample
+    if outcome == 'ok' and not text:
+        outcome = 'empty'
+    try:
+        ExtractionSample.objects.create(
+            mime_type=mime_type[:100],
+            file_size=file_size,
+            page_count=measurement.page_count,
+            chars=len(text or ''),
+            backend=measurement.backend[:20],
+            wall_ms=measurement.wall_ms,
+            peak_rss_delta_kb=measurement.peak_rss_delta_kb,
+            outcome=outcome,
+        )
+    except Exception as e:
+        logger.warning(f"Could not record extraction telemetry: {str(e)}")
+
+
+def _summarise(rows: List[tuple]) -> Dict[str, Any]:
+    """Counts and percentiles for (wall_ms, peak_rss_delta_kb, page_count, chars, outcome) rows"""
+    wall = sorted(row[0] for row in rows)
+    memory = sorted(row[1] for row in rows if row[1] is not None)
+    pages = sorted(row[2] for row in rows if row[2] is not None)
+    chars = sorted(row[3] for row in rows)
+    outcomes: Dict[str, int] = {}
+    for row in rows:
+        outcomes[row[4]] = outcomes.get(row[4], 0) + 1
+    return {
+        'count': len(rows),
+        'outcomes': outcomes,
+        'wall_ms': {f'p{pct}': percentile(wall, pct) for pct in PERCENTILES},
+        'wall_ms_max': wall[-1] if wall else None,
+        'peak_rss_delta_kb': {f'p{pct}': percentile(memory, pct) for pct in PERCENTILES},
+        'pages_p50': percentile(pages, 50),
+        'pages_max': pages[-1] if pages else None,
+        'chars_p50': percentile(chars, 50),
+    }
+
+
+def summary_since(days) -> datetime:
+    """
+    Start of a look-back window of the given number of days
+
+    Raises:
+        ValueError: If days isn't a number in (0, MAX_SUMMARY_DAYS]
+    """
+    from django.utils import timezone
+    try:
+        days = float(days)
+    except (TypeError, ValueError):
+        raise ValueError('days must be a number')
+    if not 0 < days <= MAX_SUMMARY_DAYS:  # also rejects nan
+        raise ValueError(f'days must be more than 0 and at most {MAX_SUMMARY_DAYS}')
+    return timezone.now() - timedelta(days=days)
+
+
+def extraction_summary(since: datetime = None) -> Dict[str, Any]:
+    """
+    Percentiles of extraction cost per format, and per format and size bucket
+
+    Args:
+        since: Only samples recorded after this time
+    """
+    from .models import ExtractionSample
+    samples = ExtractionSample.objects.all()
+    if since:
+        samples = samples.filter(created_at__gte=since)
+
+    groups: Dict[str, Dict[str, List[tuple]]] = {}
+    fields = ('mime_type', 'file_size', 'wall_ms', 'peak_rss_delta_kb', 'page_count', 'chars', 'outcome')
+    for mime_type, file_size, *row in samples.values_list(*fields).iterator(chunk_size=2000):
+        groups.setdefault(format_label(mime_type), {}).setdefault(size_bucket(file_size), []).append(tuple(row))
+
+    bucket_order = [label for label, _ in SIZE_BUCKETS]
+    formats = {}
+    for label, buckets in sorted(groups.items()):
+        formats[label] = {
+            'all': _summarise([row for rows in buckets.values() for row in rows]),
+            'by_size': {
+                bucket: _summarise(buckets[bucket]) for bucket in bucket_order if bucket in buckets
+            },
+        }
+    return {
+        'since': since.isoformat() if since else None,
+        'samples': sum(summary['all']['count'] for summary in formats.values()),
+        'formats': formats,
+    }
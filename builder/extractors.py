@@ -0,0 +1,231 @@
+"""
+Registry of text-extraction backends per MIME type.
+
+Several backends can handle the same format. The order they are tried in comes
+from the extractor policy file written by the benchmark_extractors command
+(fastest backend whose output is acceptably close to the reference backend
+first); without one, backends are tried by priority. A backend that raises or
+returns no text falls through to the next one.
+
+PyPDF2, the streaming DOCX reader and python-docx are always registered.
+pdfminer.six and PyMuPDF are used when installed.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .docx_stream import extract_text_from_docx_stream
+from .file_handlers import (
+    CVFileHandler, FileSource, DEFAULT_MAX_CHARS, PDF_MIME_TYPES, WORD_MIME_TYPES,
+    TextExtractionError, UnsupportedFileTypeError, _open_source
+)
+
+try:
+    from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+    from pdfminer.layout import LTTextContainer
+except ImportError:
+    pdfminer_extract_pages = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtractorBackend:
+    """One way of turning a document into text"""
+    name: str
+    mime_types: tuple
+    extract: Callable[[FileSource, int], str]
+    priority: int = 100
+    reference: bool = False  # output other backends are compared against
+    # extract also takes an ExtractionMeasurement and records the page count
+    counts_pages: bool = False
+
+
+def _read_bytes(source: FileSource) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read()
+    source.seek(0)
+    return source.read()
+
+
+def _extract_pdfminer(source: FileSource, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    try:
+        chunks = []
+        total = 0
+        for page in pdfminer_extract_pages(_open_source(source)):
+            for element in page:
+                if isinstance(element, LTTextContainer):
+                    chunk = element.get_text()
+                    chunks.append(chunk)
+                    total += len(chunk)
+            if total >= max_chars:
+                break
+        return ''.join(chunks)[:max_chars].strip()
+    except Exception as e:
+        raise TextExtractionError(f"Error extracting PDF text with pdfminer: {str(e)}") from e
+
+
+def _extract_pymupdf(source: FileSource, max_chars: int = DEFAULT_MAX_CHARS, measurement=None) -> str:
+    try:
+        with fitz.open(stream=_read_bytes(source), filetype='pdf') as document:
+            if measurement is not None:
+                measurement.page_count = document.page_count
+            chunks = []
+            total = 0
+            for page in document:
+                chunk = page.get_text()
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= max_chars:
+                    break
+        return ''.join(chunks)[:max_chars].strip()
+    except Exception as e:
+        raise TextExtractionError(f"Error extracting PDF text with PyMuPDF: {str(e)}") from e
+
+
+class ExtractorRegistry:
+    """Backends per MIME type, ordered by the extractor policy"""
+
+    def __init__(self, policy_file: str = None):
+        self.policy_file = policy_file
+        self._backends: Dict[str, ExtractorBackend] = {}
+        self._policy: Optional[Dict[str, List[str]]] = None
+        self._lock = threading.Lock()
+
+    def register(self, backend: ExtractorBackend) -> None:
+        self._backends[backend.name] = backend
+
+    def get(self, name: str) -> ExtractorBackend:
+        return self._backends[name]
+
+    def registered(self, mime_type: str) -> List[ExtractorBackend]:
+        """All backends for a MIME type, by priority"""
+        return sorted(
+            (backend for backend in self._backends.values() if mime_type in backend.mime_types),
+            key=lambda backend: backend.priority
+        )
+
+    def reference(self, mime_type: str) -> Optional[ExtractorBackend]:
+        for backend in self.registered(mime_type):
+            if backend.reference:
+                return backend
+        return None
+
+    @property
+    def policy(self) -> Dict[str, List[str]]:
+        if self._policy is None:
+            with self._lock:
+                self._policy = self._load_policy()
+        return self._policy
+
+    def _load_policy(self) -> Dict[str, List[str]]:
+        if not self.policy_file or not os.path.exists(self.policy_file):
+            return {}
+        try:
+            with open(self.policy_file) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable extractor policy {self.policy_file}: {str(e)}")
+            return {}
+
+    def set_policy(self, policy: Dict[str, List[str]]) -> None:
+        self._policy = policy
+
+    def backends_for(self, mime_type: str) -> List[ExtractorBackend]:
+        """
+        Backends in the order to try them: the policy ranking when there is one
+        (backends it left out failed the quality bar), otherwise by priority
+        """
+        registered = self.registered(mime_type)
+        ranking = self.policy.get(mime_type, [])
+        ranked = [backend for name in ranking for backend in registered if backend.name == name]
+        return ranked or registered
+
+    def preferred(self, mime_type: str) -> Optional[str]:
+        backends = self.backends_for(mime_type)
+        return backends[0].name if backends else None
+
+    def extract(self, source: FileSource, mime_type: str, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+        """
+        Extract with the preferred backend, falling back on errors and empty output
+
+        Raises:
+            UnsupportedFileTypeError: If no backend handles the MIME type
+            TextExtractionError: If every backend failed
+        """
+        return self.extract_with_backend(source, mime_type, max_chars)[0]
+
+    def extract_with_backend(self, source: FileSource, mime_type: str,
+                             max_chars: int = DEFAULT_MAX_CHARS, measurement=None) -> Tuple[str, str]:
+        """
+        extract(), plus the name of the backend whose output was used (the last one tried if none had text)
+
+        Backends that count pages record the count in measurement, if given.
+        """
+        backends = self.backends_for(mime_type)
+        if not backends:
+            raise UnsupportedFileTypeError(f"Unsupported file type: {mime_type}")
+
+        error = None
+        for backend in backends:
+            try:
+                if measurement is not None and backend.counts_pages:
+                    text = backend.extract(source, max_chars, measurement)
+                else:
+                    text = backend.extract(source, max_chars)
+            except TextExtractionError as e:
+                logger.warning(f"Extractor {backend.name} failed, trying the next one: {str(e)}")
+                error = e
+                continue
+            if text:
+                return text, backend.name
+            logger.info(f"Extractor {backend.name} found no text")
+
+        if error:
+            raise error
+        return '', backends[-1].name
+
+
+_registry: Optional[ExtractorRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_extractor_registry() -> ExtractorRegistry:
+    """Process-wide registry with the built-in backends"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            registry = ExtractorRegistry(getattr(settings, 'EXTRACTOR_POLICY_FILE', None))
+            registry.register(ExtractorBackend(
+                'pypdf2', PDF_MIME_TYPES, CVFileHandler.extract_text_from_pdf, priority=10, reference=True,
+                counts_pages=True
+            ))
+            if fitz is not None:
+                registry.register(ExtractorBackend(
+                    'pymupdf', PDF_MIME_TYPES, _extract_pymupdf, priority=20, counts_pages=True
+                ))
+            if pdfminer_extract_pages is not None:
+                registry.register(ExtractorBackend('pdfminer', PDF_MIME_TYPES, _extract_pdfminer, priority=30))
+            # Reads OOXML zip packages only, so legacy .doc uploads skip it
+            registry.register(ExtractorBackend(
+                'docx-stream', WORD_MIME_TYPES[:1], extract_text_from_docx_stream, priority=5, reference=True
+            ))
+            registry.register(ExtractorBackend(
+                'python-docx', WORD_MIME_TYPES, CVFileHandler.extract_text_from_docx, priority=10
+            ))
+            _registry = registry
+        return _registry
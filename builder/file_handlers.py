@@ -1,70 +1,256 @@
 import os
 import io
-from typing import Optional
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Union, BinaryIO
 from django.core.files.uploadedfile import UploadedFile
 from django.conf import settings
 import PyPDF2
 from docx import Document
 import re
+from .keywords import COMMON_SKILLS, KEYWORD_MATCHER, KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME_TYPES = ('application/pdf',)
+WORD_MIME_TYPES = (
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/msword',
+)
+
+# Nothing downstream reads more than this; analysis prompts use 3000
+DEFAULT_MAX_CHARS = 10000
+
+# Bump when extraction output changes so cached ProcessedDocument text is redone
+EXTRACTOR_VERSION = '2'
+
+FileSource = Union[str, bytes, BinaryIO]
+
+
+class TextExtractionError(Exception):
+    """Raised when a document cannot be read"""
+
+
+class UnsupportedFileTypeError(TextExtractionError):
+    """Raised for formats we have no extractor for"""
+
+
+class ExtractionUnavailableError(TextExtractionError):
+    """Extraction was not completed; user_message is safe to show as-is"""
+    user_message = "We couldn't process your file right now. Please try again."
+
+
+class ExtractionTimeoutError(ExtractionUnavailableError):
+    user_message = (
+        "Your file took too long to process. Please upload a smaller or simpler "
+        "PDF/DOCX, or export it again from your editor."
+    )
+
+
+class ExtractionBusyError(ExtractionUnavailableError):
+    user_message = "We're processing a lot of files right now. Please try again in a moment."
+
+
+def _open_source(source: FileSource) -> Union[str, BinaryIO]:
+    """Accept a path, raw bytes or an (uploaded) file object without copying it"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
 
 class CVFileHandler:
     """Handler for processing uploaded CV files (PDF/DOCX)"""
     
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> str:
-        """Extract text content from PDF file"""
+    def extract_text_from_pdf(source: FileSource, max_chars: int = DEFAULT_MAX_CHARS, measurement=None) -> str:
+        """
+        Extract text from a PDF, stopping at the first page that reaches max_chars
+        
+        Args:
+            measurement: Optional ExtractionMeasurement to record the page count in
+        
+        Raises:
+            TextExtractionError: If the PDF cannot be parsed
+        """
+        pdf_reader = CVFileHandler.open_pdf(source)
+        text = CVFileHandler.read_pdf_pages(pdf_reader, 0, None, max_chars)
+        if measurement is not None:
+            measurement.page_count = len(pdf_reader.pages)
+        return text[:max_chars].strip()
+    
+    @staticmethod
+    def extract_pdf_pages(source: FileSource, start: int = 0, stop: int = None,
+                          max_chars: int = DEFAULT_MAX_CHARS) -> str:
+        """
+        Raw text of pages [start, stop), stopping at the first page that reaches
+        max_chars. Not stripped, so consecutive ranges concatenate to the same
+        text a single pass would produce.
+        
+        Raises:
+            TextExtractionError: If the PDF cannot be parsed
+        """
+        return CVFileHandler.read_pdf_pages(CVFileHandler.open_pdf(source), start, stop, max_chars)
+    
+    @staticmethod
+    def open_pdf(source: FileSource) -> PyPDF2.PdfReader:
+        """
+        Parse a PDF once, for callers that need both its page count and its text
+        
+        Raises:
+            TextExtractionError: If the PDF cannot be parsed
+        """
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text += page.extract_text()
-                return text.strip()
+            return PyPDF2.PdfReader(_open_source(source))
         except Exception as e:
-            return f"Error extracting PDF text: {str(e)}"
+            raise TextExtractionError(f"Error extracting PDF text: {str(e)}") from e
     
     @staticmethod
-    def extract_text_from_docx(file_path: str) -> str:
-        """Extract text content from DOCX file"""
+    def read_pdf_pages(pdf_reader: PyPDF2.PdfReader, start: int = 0, stop: int = None,
+                       max_chars: int = DEFAULT_MAX_CHARS) -> str:
+        """extract_pdf_pages on an already opened PdfReader"""
         try:
-            doc = Document(file_path)
-            text = ""
+            chunks = []
+            total = 0
+            for page in pdf_reader.pages[start:stop]:
+                chunk = page.extract_text() or ''
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= max_chars:
+                    break
+            return ''.join(chunks)
+        except Exception as e:
+            raise TextExtractionError(f"Error extracting PDF text: {str(e)}") from e
+    
+    @staticmethod
+    def extract_text_from_docx(source: FileSource, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+        """
+        Extract paragraph text from a DOCX, stopping once max_chars is reached
+        
+        Raises:
+            TextExtractionError: If the document cannot be parsed
+        """
+        try:
+            doc = Document(_open_source(source))
+            chunks = []
+            total = 0
             for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+                chunk = paragraph.text + "\n"
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= max_chars:
+                    break
+            return ''.join(chunks)[:max_chars].strip()
         except Exception as e:
-            return f"Error extracting DOCX text: {str(e)}"
+            raise TextExtractionError(f"Error extracting DOCX text: {str(e)}") from e
     
     @staticmethod
-    def extract_text_from_file(uploaded_file: UploadedFile) -> str:
-        """Extract text from uploaded file based on file type"""
-        file_extension = os.path.splitext(uploaded_file.name)[1].lower()
+    def _resolve_mime_type(source: FileSource, mime_type: str = None, filename: str = None) -> str:
+        """Sniffed MIME type if given, otherwise one guessed from the extension"""
+        if mime_type:
+            return mime_type
+        name = filename or getattr(source, 'name', None) or (source if isinstance(source, str) else '')
+        extension = os.path.splitext(name)[1].lower()
+        return {'.pdf': PDF_MIME_TYPES[0], '.docx': WORD_MIME_TYPES[0],
+                '.doc': WORD_MIME_TYPES[1]}.get(extension, extension)
+    
+    @staticmethod
+    def extract_text(uploaded_file: FileSource, mime_type: str = None,
+                     max_chars: int = DEFAULT_MAX_CHARS, filename: str = None,
+                     measurement=None) -> str:
+        """
+        Extract text from an upload, in the isolated extraction pool when enabled
         
-        # Save file temporarily
-        temp_file_path = os.path.join(settings.MEDIA_ROOT, 'temp', uploaded_file.name)
-        os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
+        Args:
+            uploaded_file: UploadedFile, file object, path or raw bytes
+            mime_type: Sniffed MIME type; falls back to the file extension
+            max_chars: Character budget; reading stops once it is reached
+            filename: Name used for the extension fallback
+            measurement: Optional ExtractionMeasurement to fill with the backend,
+                page count, peak memory growth and wall time
+            
+        Raises:
+            UnsupportedFileTypeError: If the format has no extractor
+            ExtractionUnavailableError: If the pool timed out or is full
+            TextExtractionError: If the document cannot be parsed
+        """
+        from .extraction_telemetry import ExtractionMeasurement, track_wall_time
+        mime_type = CVFileHandler._resolve_mime_type(uploaded_file, mime_type, filename)
+        if mime_type not in PDF_MIME_TYPES + WORD_MIME_TYPES:
+            raise UnsupportedFileTypeError(f"Unsupported file type: {mime_type}")
         
+        if measurement is None:
+            measurement = ExtractionMeasurement()
+        with track_wall_time(measurement):
+            if getattr(settings, 'EXTRACTION_POOL_ENABLED', False):
+                from .extraction_pool import get_extraction_pool
+                from .extractors import get_extractor_registry
+                # Page ranges are cut with PyPDF2, so only its PDFs can be split
+                if (getattr(settings, 'EXTRACTION_PARALLEL_PAGES_ENABLED', False) and mime_type in PDF_MIME_TYPES
+                        and get_extractor_registry().preferred(mime_type) == 'pypdf2'):
+                    return get_extraction_pool().extract_pdf(uploaded_file, max_chars, measurement=measurement)
+                return get_extraction_pool().extract(uploaded_file, mime_type, max_chars, measurement=measurement)
+            return CVFileHandler.extract_text_in_process(uploaded_file, mime_type, max_chars, measurement)
+    
+    @staticmethod
+    def extract_text_in_process(uploaded_file: FileSource, mime_type: str = None,
+                                max_chars: int = DEFAULT_MAX_CHARS, measurement=None) -> str:
+        """
+        Extract text in the calling process (used by the pool workers)
+        
+        With a measurement, also records the backend used, this process's peak
+        memory growth and, for PDFs, the page count from the backend's parser.
+        """
+        from .extractors import get_extractor_registry
+        mime_type = CVFileHandler._resolve_mime_type(uploaded_file, mime_type)
+        if measurement is None:
+            return get_extractor_registry().extract(uploaded_file, mime_type, max_chars)
+        
+        from .extraction_telemetry import track_peak_rss
+        with track_peak_rss(measurement):
+            text, measurement.backend = get_extractor_registry().extract_with_backend(
+                uploaded_file, mime_type, max_chars, measurement
+            )
+        return text
+    
+    @staticmethod
+    def extract_text_for_storage(uploaded_file: FileSource, mime_type: str = None,
+                                 max_chars: int = DEFAULT_MAX_CHARS) -> str:
+        """
+        Extract text for UploadedCV.extracted_text, never raising
+        
+        Failures are logged and stored as a short placeholder message, as the
+        upload views have always done. ExtractionUnavailableError (timeout or
+        full queue) is re-raised so the view can ask the user to retry.
+        """
         try:
-            with open(temp_file_path, 'wb+') as destination:
-                for chunk in uploaded_file.chunks():
-                    destination.write(chunk)
-            
-            if file_extension == '.pdf':
-                text = CVFileHandler.extract_text_from_pdf(temp_file_path)
-            elif file_extension in ['.docx', '.doc']:
-                text = CVFileHandler.extract_text_from_docx(temp_file_path)
-            else:
-                text = f"Unsupported file type: {file_extension}"
-            
-            # Clean up temp file
-            os.remove(temp_file_path)
-            return text
-            
-        except Exception as e:
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-            return f"Error processing file: {str(e)}"
+            text = CVFileHandler.extract_text(uploaded_file, mime_type, max_chars)
+        except ExtractionUnavailableError:
+            raise
+        except TextExtractionError as e:
+            logger.error(str(e))
+            return CVFileHandler.storage_placeholder(mime_type, e)
+        
+        return text or CVFileHandler.storage_placeholder(mime_type)
+    
+    @staticmethod
+    def storage_placeholder(mime_type: str, error: TextExtractionError = None) -> str:
+        """Message stored as extracted_text when there is no usable text"""
+        is_pdf = mime_type in PDF_MIME_TYPES
+        if isinstance(error, UnsupportedFileTypeError):
+            return "Text extraction not supported for this format"
+        if error:
+            return "PDF text extraction failed" if is_pdf else "Document text extraction failed"
+        return "No text found in PDF" if is_pdf else "No text found in document"
+    
+    @staticmethod
+    def extract_text_from_file(uploaded_file: UploadedFile) -> str:
+        """Extract text from uploaded file based on file type"""
+        try:
+            return CVFileHandler.extract_text(uploaded_file)
+        except TextExtractionError as e:
+            return str(e)
     
     @staticmethod
     def validate_file_type(file: UploadedFile) -> bool:
@@ -86,49 +272,127 @@ class CVFileHandler:
         filename = re.sub(r'[-\s]+', '-', filename)
         return filename.lower()
 
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Everything clean_text removes: not a word character, whitespace or basic punctuation
+DISALLOWED_PATTERN = re.compile(r'[^\w\s.,;:@-]+')
+# The same characters for pure-ASCII text, deleted with bytes.translate
+_ASCII_DISALLOWED = bytes(
+    code for code in range(128) if not re.match(r'[\w\s.,;:@-]', chr(code))
+)
+# Literal markers only, so the regex engine can skip straight to candidates;
+# the URL is the whitespace-delimited token around the marker
+URL_MARKER_PATTERN = re.compile(r'://|www\.|linkedin\.com/|github\.com/')
+_URL_MARKER_ANY_CASE = re.compile(URL_MARKER_PATTERN.pattern, re.IGNORECASE)
+_URL_STRIP = '.,;:()[]<>"\''
+
+
+@dataclass
+class CVTextScan:
+    """Normalised CV text with the contact fields and skills found in it"""
+    text: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
+    portfolio: Optional[str] = None
+    urls: List[str] = field(default_factory=list)
+    skills: List[str] = field(default_factory=list)
+
+
 class CVTextProcessor:
     """Processor for cleaning and normalizing extracted CV text"""
     
+    @staticmethod
+    def scan(text: str, skills: Sequence[str] = COMMON_SKILLS) -> CVTextScan:
+        """
+        Normalise text and pull out contact details, profile URLs and skills
+        
+        Whitespace is collapsed once and every field is found in that collapsed
+        text with a precompiled, mostly early-exit search, instead of each
+        helper re-reading the raw text. `manage.py benchmark_text_processor`
+        compares it with the separate helpers.
+        
+        Args:
+            text: Extracted CV text
+            skills: Skills to look for; pass () to skip skill matching
+        """
+        collapsed = ' '.join((text or '').split())
+        lowered = collapsed.lower()
+        email = EMAIL_PATTERN.search(collapsed)
+        phone = PHONE_PATTERN.search(collapsed)
+        urls = CVTextProcessor._find_urls(collapsed, lowered)
+        
+        scan = CVTextScan(
+            text=CVTextProcessor._remove_disallowed(collapsed).strip(),
+            email=email.group(0) if email else None,
+            phone=phone.group(0) if phone else None,
+            urls=urls,
+            skills=CVTextProcessor._match_skills(collapsed, skills) if skills else [],
+        )
+        for url in urls:
+            lowered = url.lower()
+            if 'linkedin.com/' in lowered:
+                scan.linkedin = scan.linkedin or url
+            elif 'github.com/' in lowered:
+                scan.github = scan.github or url
+            else:
+                scan.portfolio = scan.portfolio or url
+        return scan
+    
+    @staticmethod
+    def _find_urls(collapsed: str, lowered: str) -> List[str]:
+        """Distinct URL tokens, in order, from single-space separated text"""
+        if len(lowered) == len(collapsed):
+            markers = URL_MARKER_PATTERN.finditer(lowered)
+        else:
+            # Lowercasing changed some character's length, so offsets wouldn't line up
+            markers = _URL_MARKER_ANY_CASE.finditer(collapsed)
+        urls = []
+        token_end = -1
+        for match in markers:
+            if match.start() < token_end:
+                continue  # e.g. the www. in https://www.
+            token_start = collapsed.rfind(' ', 0, match.start()) + 1
+            token_end = collapsed.find(' ', match.end())
+            if token_end == -1:
+                token_end = len(collapsed)
+            url = collapsed[token_start:token_end].strip(_URL_STRIP)
+            if '@' not in url and url not in urls:
+                urls.append(url)
+        return urls
+    
+    @staticmethod
+    def _remove_disallowed(text: str) -> str:
+        if text.isascii():
+            return text.encode('ascii').translate(None, _ASCII_DISALLOWED).decode('ascii')
+        return DISALLOWED_PATTERN.sub('', text)
+    
+    @staticmethod
+    def _match_skills(text: str, skills: Sequence[str]) -> List[str]:
+        """Skills found by the shared keyword matcher (see keywords.py), in list order"""
+        matcher = KEYWORD_MATCHER if skills is COMMON_SKILLS else KeywordMatcher(skills)
+        return matcher.scan(text).matched(skills)
+    
     @staticmethod
     def clean_text(text: str) -> str:
         """Clean and normalize extracted text"""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,;:@-]', '', text)
-        # Remove excessive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text.strip()
+        # Collapse whitespace, then drop special characters but keep basic punctuation
+        return CVTextProcessor._remove_disallowed(' '.join(text.split())).strip()
     
     @staticmethod
     def extract_email(text: str) -> Optional[str]:
         """Extract email from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
+        match = EMAIL_PATTERN.search(text)
         return match.group(0) if match else None
     
     @staticmethod
     def extract_phone(text: str) -> Optional[str]:
         """Extract phone number from text"""
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        match = re.search(phone_pattern, text)
+        match = PHONE_PATTERN.search(text)
         return match.group(0) if match else None
     
     @staticmethod
     def extract_skills(text: str, common_skills: list = None) -> list:
-        """Extract skills from CV text"""
-        if common_skills is None:
-            common_skills = [
-                'Python', 'Java', 'JavaScript', 'React', 'Node.js', 'SQL', 'MongoDB',
-                'AWS', 'Docker', 'Kubernetes', 'Git', 'Linux', 'Machine Learning',
-                'Data Analysis', 'Project Management', 'Agile', 'Scrum', 'Leadership'
-            ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        """Extract skills from CV text (whole words only, in list order)"""
+        return CVTextProcessor._match_skills(text, COMMON_SKILLS if common_skills is None else common_skills)
@@ -1,15 +1,42 @@
 import magic
-import tempfile
 import os
+import zipfile
+from dataclasses import dataclass, field
+from typing import List
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 
+# libmagic only needs the start of a file; OOXML detection looks a little past
+# the first zip entry, so read a few KB rather than the minimum
+HEADER_BYTES = 8192
+
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+@dataclass
+class FileValidationResult:
+    """Everything the views need to know about an upload, from one inspection"""
+    mime_type: str
+    extension: str
+    size: int
+    extension_matches: bool
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        if self.errors:
+            raise ValidationError(self.errors[0])
+
+
 class FileValidator:
     """Secure file validation using python-magic for MIME type detection"""
     
     ALLOWED_MIME_TYPES = {
         'application/pdf': ['.pdf'],
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['.docx'],
+        DOCX_MIME_TYPE: ['.docx'],
         'application/msword': ['.doc'],
         'text/plain': ['.txt'],
     }
@@ -17,56 +44,96 @@ class FileValidator:
     MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
     
     @classmethod
-    def validate_file(cls, uploaded_file: UploadedFile) -> None:
+    def inspect(cls, uploaded_file: UploadedFile, mime_type: str = None) -> FileValidationResult:
         """
-        Validate uploaded file for security and type compatibility
+        Check size, MIME type and extension in one pass, without raising
         
         Args:
             uploaded_file: Django UploadedFile instance
-            
+            mime_type: Already-known MIME type (e.g. from the content-hash cache);
+                the file is not sniffed again when given
+        """
+        extension = os.path.splitext(uploaded_file.name or '')[1].lower()
+        errors = []
+        
+        if uploaded_file.size > cls.MAX_FILE_SIZE:
+            errors.append(f"File size exceeds maximum limit of {cls.MAX_FILE_SIZE // (1024*1024)}MB")
+        elif uploaded_file.size == 0:
+            errors.append("Empty file is not allowed")
+        
+        if mime_type is None and not errors:
+            mime_type = cls.sniff_mime_type(uploaded_file)
+        
+        extension_matches = extension in cls.ALLOWED_MIME_TYPES.get(mime_type, [])
+        if mime_type and not errors:
+            if mime_type not in cls.ALLOWED_MIME_TYPES:
+                errors.append(f"File type '{mime_type}' is not supported")
+            elif not extension_matches:
+                errors.append(f"File extension '{extension}' doesn't match file type '{mime_type}'")
+        
+        return FileValidationResult(
+            mime_type=mime_type or '',
+            extension=extension,
+            size=uploaded_file.size,
+            extension_matches=extension_matches,
+            errors=errors
+        )
+    
+    @classmethod
+    def validate(cls, uploaded_file: UploadedFile, mime_type: str = None) -> FileValidationResult:
+        """
+        Validate uploaded file for security and type compatibility
+        
         Raises:
             ValidationError: If file validation fails
         """
-        # Check file size
-        if uploaded_file.size > cls.MAX_FILE_SIZE:
-            raise ValidationError(f"File size exceeds maximum limit of {cls.MAX_FILE_SIZE // (1024*1024)}MB")
+        result = cls.inspect(uploaded_file, mime_type)
+        result.raise_for_errors()
+        return result
+    
+    @classmethod
+    def validate_file(cls, uploaded_file: UploadedFile) -> FileValidationResult:
+        """Alias of validate, kept for existing callers"""
+        return cls.validate(uploaded_file)
+    
+    @classmethod
+    def sniff_mime_type(cls, uploaded_file: UploadedFile) -> str:
+        """
+        MIME type from the file's header bytes
         
-        # Check if file is empty
-        if uploaded_file.size == 0:
-            raise ValidationError("Empty file is not allowed")
+        Uses the header captured by CVUploadHandler when there is one;
+        otherwise spooled uploads are sniffed from the temp file Django
+        already wrote and in-memory ones from their first HEADER_BYTES.
+        Nothing is copied.
+        """
+        header = getattr(uploaded_file, 'header', None)
+        if header:
+            mime_type = magic.from_buffer(header, mime=True)
+        elif hasattr(uploaded_file, 'temporary_file_path'):
+            mime_type = magic.from_file(uploaded_file.temporary_file_path(), mime=True)
+        else:
+            uploaded_file.seek(0)
+            header = uploaded_file.read(HEADER_BYTES)
+            uploaded_file.seek(0)
+            mime_type = magic.from_buffer(header, mime=True)
         
-        # Create temporary file to check MIME type
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            try:
-                # Write uploaded file content to temporary file
-                for chunk in uploaded_file.chunks():
-                    tmp_file.write(chunk)
-                tmp_file.flush()
-                
-                # Reset file pointer for later use
-                uploaded_file.seek(0)
-                
-                # Check MIME type using python-magic
-                actual_mime_type = magic.from_file(tmp_file.name, mime=True)
-                
-                if actual_mime_type not in cls.ALLOWED_MIME_TYPES:
-                    raise ValidationError(f"File type '{actual_mime_type}' is not supported")
-                
-                # Verify file extension matches MIME type
-                file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-                allowed_extensions = cls.ALLOWED_MIME_TYPES[actual_mime_type]
-                
-                if file_extension not in allowed_extensions:
-                    raise ValidationError(
-                        f"File extension '{file_extension}' doesn't match file type '{actual_mime_type}'"
-                    )
-                    
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(tmp_file.name)
-                except OSError:
-                    pass  # File already deleted or doesn't exist
+        if mime_type == 'application/zip':
+            mime_type = cls._zip_mime_type(uploaded_file)
+        return mime_type
+    
+    @staticmethod
+    def _zip_mime_type(uploaded_file: UploadedFile) -> str:
+        """Tell a DOCX whose first entries aren't the usual ones from any other zip"""
+        try:
+            uploaded_file.seek(0)
+            with zipfile.ZipFile(uploaded_file) as archive:
+                # Only the central directory is read
+                is_docx = 'word/document.xml' in archive.namelist()
+        except zipfile.BadZipFile:
+            is_docx = False
+        finally:
+            uploaded_file.seek(0)
+        return DOCX_MIME_TYPE if is_docx else 'application/zip'
     
     @classmethod
     def get_file_type(cls, uploaded_file: UploadedFile) -> str:
@@ -75,21 +142,8 @@ class FileValidator:
         
         Args:
             uploaded_file: Django UploadedFile instance
-            
+        
         Returns:
             str: MIME type of the file
         """
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            try:
-                for chunk in uploaded_file.chunks():
-                    tmp_file.write(chunk)
-                tmp_file.flush()
-                
-                uploaded_file.seek(0)  # Reset file pointer
-                return magic.from_file(tmp_file.name, mime=True)
-                
-            finally:
-                try:
-                    os.unlink(tmp_file.name)
-                except OSError:
-                    pass
+        return cls.sniff_mime_type(uploaded_file)
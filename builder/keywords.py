@@ -0,0 +1,201 @@
+"""
+Keyword tables for rule-based CV scoring, and a matcher that finds all of them
+in one pass.
+
+Scoring used to test each keyword with `keyword in text`: one scan of the
+whole CV per keyword, matching inside other words ("r" in "manager", "lead"
+in "mislead"). KEYWORD_MATCHER is compiled at import from every table below
+into a trie of words. A scan splits the text into words once and walks the
+trie from each word that starts some keyword, so every hit is found in a single
+linear pass, on word boundaries, and the result is shared by all the scoring
+functions that read the same text.
+
+Keywords are word sequences: punctuation inside a keyword is a word break, so
+"node.js" matches "Node.js" and "ci/cd" matches "CI/CD". Matching by word
+rather than by character is what makes this fast in Python: the text is
+tokenised by C string methods and only the few words that begin a keyword
+cost a Python-level step.
+
+No Django imports: this is shared by the analyzers and the file handlers.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+# Bytes that separate words map to a space. UTF-8 lead and continuation bytes
+# are kept, and any non-ASCII punctuation is split off afterwards.
+_WORD_BYTES = bytes(
+    code if code >= 128 or chr(code).isalnum() or chr(code) == '_' else ord(' ')
+    for code in range(256)
+)
+_WORD_PATTERN = re.compile(r'\w+')
+# Trie key holding the keywords that end at a node; split() never yields ''
+_END = ''
+
+
+def words(text: str) -> List[str]:
+    """Lowercased words of text, split at anything that isn't a word character"""
+    text = text.lower()
+    tokens = text.encode('utf-8').translate(_WORD_BYTES).decode('utf-8').split()
+    if text.isascii():
+        return tokens
+    # Bullets and dashes outside ASCII are still attached to their neighbours
+    result = []
+    for token in tokens:
+        if token.isascii():
+            result.append(token)
+        else:
+            result.extend(_WORD_PATTERN.findall(token))
+    return result
+
+
+def keyword_key(keyword: str) -> str:
+    return ' '.join(keyword.lower().split())
+
+
+@dataclass
+class KeywordHits:
+    """Where each keyword occurs in a scanned text, as word offsets"""
+    positions: Dict[str, List[int]]
+    word_count: int
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword_key(keyword) in self.positions
+
+    def count(self, keyword: str) -> int:
+        return len(self.positions.get(keyword_key(keyword), ()))
+
+    def counts(self) -> Dict[str, int]:
+        return {keyword: len(offsets) for keyword, offsets in self.positions.items()}
+
+    def matched(self, keywords: Iterable[str]) -> List[str]:
+        """The keywords that occur, in the order given"""
+        return [keyword for keyword in keywords if keyword_key(keyword) in self.positions]
+
+    def any(self, keywords: Iterable[str]) -> bool:
+        return any(keyword_key(keyword) in self.positions for keyword in keywords)
+
+
+class KeywordMatcher:
+    """Word-boundary matcher for a fixed set of keywords; only those are reported"""
+
+    def __init__(self, *keyword_lists: Iterable[str]):
+        self._trie: Dict[str, dict] = {}
+        for keywords in keyword_lists:
+            for keyword in keywords:
+                self.add(keyword)
+
+    def add(self, keyword: str) -> None:
+        key = keyword_key(keyword)
+        parts = words(key)
+        if not parts:
+            return
+        node = self._trie
+        for part in parts:
+            node = node.setdefault(part, {})
+        ends = node.setdefault(_END, [])
+        if key not in ends:
+            ends.append(key)
+
+    def scan(self, text: str) -> KeywordHits:
+        tokens = words(text or '')
+        trie = self._trie
+        positions: Dict[str, List[int]] = {}
+        count = len(tokens)
+        for start in [index for index, token in enumerate(tokens) if token in trie]:
+            node = trie
+            index = start
+            while index < count:
+                node = node.get(tokens[index])
+                if node is None:
+                    break
+                for key in node.get(_END, ()):
+                    positions.setdefault(key, []).append(start)
+                index += 1
+        return KeywordHits(positions, count)
+
+
+COMMON_SKILLS = (
+    'Python', 'Java', 'JavaScript', 'React', 'Node.js', 'SQL', 'MongoDB',
+    'AWS', 'Docker', 'Kubernetes', 'Git', 'Linux', 'Machine Learning',
+    'Data Analysis', 'Project Management', 'Agile', 'Scrum', 'Leadership'
+)
+
+INDUSTRY_KEYWORDS = {
+    'software_engineering': [
+        'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node.js',
+        'sql', 'mongodb', 'postgresql', 'aws', 'docker', 'kubernetes', 'git',
+        'agile', 'scrum', 'microservices', 'rest api', 'ci/cd', 'tdd'
+    ],
+    'data_science': [
+        'python', 'r', 'sql', 'machine learning', 'deep learning', 'statistics',
+        'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'tableau',
+        'power bi', 'data visualization', 'regression', 'classification', 'nlp'
+    ],
+    'marketing': [
+        'digital marketing', 'seo', 'sem', 'social media', 'content marketing',
+        'google analytics', 'facebook ads', 'email marketing', 'branding',
+        'campaign management', 'market research', 'crm', 'marketing automation'
+    ],
+    'finance': [
+        'financial analysis', 'excel', 'sql', 'power bi', 'tableau', 'modeling',
+        'forecasting', 'budgeting', 'reporting', 'accounting', 'investment',
+        'risk management', 'compliance', 'auditing', 'financial statements'
+    ]
+}
+
+EXPERIENCE_INDICATORS = {
+    'entry': ['intern', 'junior', 'entry level', 'graduate', 'trainee'],
+    'mid': ['mid-level', 'senior', 'lead', 'specialist', 'analyst'],
+    'senior': ['senior', 'principal', 'director', 'manager', 'head of', 'vp']
+}
+
+# Verbs that raise the overall score, and those whose absence prompts a suggestion
+SCORED_ACTION_VERBS = ['achieved', 'managed', 'developed', 'implemented', 'increased', 'reduced']
+SUGGESTED_ACTION_VERBS = ['achieved', 'managed', 'developed', 'led', 'implemented']
+
+# Counted for ATS compatibility when both the CV and the job description mention them
+TECHNICAL_TERMS = ['python', 'java', 'sql', 'javascript', 'react', 'angular']
+
+MOCK_ANALYSIS_KEYWORDS = ['python', 'javascript', 'sql', 'project', 'management', 'team', 'leadership', 'experience']
+
+INDUSTRY_FOCUS_KEYWORDS = {
+    'Technology': ['python', 'javascript', 'software', 'developer', 'programming'],
+    'Finance': ['finance', 'accounting', 'banking', 'investment', 'financial'],
+    'Healthcare': ['medical', 'health', 'patient', 'clinical', 'healthcare'],
+    'Marketing': ['marketing', 'digital', 'campaign', 'brand', 'social media'],
+    'Engineering': ['engineer', 'mechanical', 'electrical', 'civil', 'design']
+}
+
+SENIORITY_KEYWORDS = ['senior', 'lead', 'manager']
+MID_SENIOR_YEARS = ['5 years', '6 years', '7 years', '8 years']
+MID_YEARS = ['2 years', '3 years', '4 years']
+
+# Highest first; plurals listed because matching is by whole word
+EDUCATION_LEVELS = {
+    'Doctorate': ['phd', 'doctorate', 'doctoral'],
+    "Master's Degree": ['master', 'masters', 'mba', 'msc'],
+    "Bachelor's Degree": ['bachelor', 'bachelors', 'bs', 'ba', 'bsc'],
+    'Associate Degree': ['associate', 'diploma'],
+}
+
+KEYWORD_MATCHER = KeywordMatcher(
+    COMMON_SKILLS,
+    *INDUSTRY_KEYWORDS.values(),
+    *EXPERIENCE_INDICATORS.values(),
+    SCORED_ACTION_VERBS,
+    SUGGESTED_ACTION_VERBS,
+    TECHNICAL_TERMS,
+    MOCK_ANALYSIS_KEYWORDS,
+    *INDUSTRY_FOCUS_KEYWORDS.values(),
+    SENIORITY_KEYWORDS,
+    MID_SENIOR_YEARS,
+    MID_YEARS,
+    *EDUCATION_LEVELS.values(),
+)
+
+
+def scan_keywords(text: str) -> KeywordHits:
+    """Every keyword from the tables above that occurs in text"""
+    return KEYWORD_MATCHER.scan(text)
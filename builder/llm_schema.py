@@ -0,0 +1,209 @@
+"""
+Schema validation and tolerant parsing for LLM JSON responses.
+
+Responses are parsed in stages (plain JSON, fenced JSON, the outermost
+object, per-field salvage) so one malformed field no longer discards the
+whole answer. Callers re-request only the fields that are still missing,
+and every parse/repair path is counted for monitoring.
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+STRING_ITEM_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def record_metric(schema: str, path: str) -> None:
+    with _metrics_lock:
+        _metrics[(schema, path)] += 1
+
+
+def repair_metrics() -> Dict[str, Dict[str, int]]:
+    """Counts of each parse/repair path, grouped by schema"""
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+    grouped: Dict[str, Dict[str, int]] = {}
+    for (schema, path), count in snapshot.items():
+        grouped.setdefault(schema, {})[path] = count
+    return grouped
+
+
+@dataclass
+class SchemaField:
+    """One expected field of an LLM JSON response"""
+    name: str
+    kind: str          # 'list', 'str' or 'score'
+    default: Any
+    description: str = ''
+
+    def coerce(self, value: Any) -> Tuple[bool, Any]:
+        """Return (ok, value) with the value converted to the field's type"""
+        if self.kind == 'score':
+            try:
+                score = int(float(str(value).strip().rstrip('%')))
+            except (TypeError, ValueError, OverflowError):  # "inf", "1e999"
+                return False, None
+            return (0 <= score <= 100), score
+
+        if self.kind == 'list':
+            if isinstance(value, list):
+                return True, [item if isinstance(item, str) else json.dumps(item) for item in value if item]
+            if isinstance(value, str) and value.strip():
+                return True, [part.strip(' -•') for part in re.split(r'[\n;]', value) if part.strip(' -•')]
+            return False, None
+
+        if isinstance(value, str) and value.strip():
+            return True, value.strip()
+        if isinstance(value, list) and value:
+            return True, ', '.join(str(item) for item in value)
+        return False, None
+
+
+class LLMSchema:
+    """Expected shape of a JSON response from one prompt"""
+
+    def __init__(self, name: str, fields: List[SchemaField]):
+        self.name = name
+        self.fields = fields
+        self.field_map = {field.name: field for field in fields}
+
+    def validate(self, data: Dict[str, Any], names: List[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Keep the fields that coerce cleanly
+
+        Returns:
+            tuple: (valid fields, names of missing or invalid fields)
+        """
+        valid, missing = {}, []
+        for name in names or [field.name for field in self.fields]:
+            field = self.field_map[name]
+            ok, value = field.coerce(data.get(name)) if name in data else (False, None)
+            if ok:
+                valid[name] = value
+            else:
+                missing.append(name)
+        return valid, missing
+
+    def defaults(self, names: List[str]) -> Dict[str, Any]:
+        return {
+            name: list(self.field_map[name].default) if isinstance(self.field_map[name].default, list)
+            else self.field_map[name].default
+            for name in names
+        }
+
+    def parse(self, content: str, names: List[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """Tolerantly parse a response and validate it against the schema"""
+        data, path = parse_tolerant(content, names or [field.name for field in self.fields])
+        record_metric(self.name, f"parse_{path}")
+        return self.validate(data, names)
+
+    def repair_prompt(self, missing: List[str], source_text: str) -> str:
+        """Tiny follow-up prompt asking only for the missing fields"""
+        lines = '\n'.join(
+            f"- {name}: {self.field_map[name].description or self.field_map[name].kind}"
+            for name in missing
+        )
+        return (
+            f"From the CV below, return a JSON object with only these fields:\n{lines}\n\n"
+            f"CV Text: {source_text}\n\nReturn only valid JSON."
+        )
+
+
+def parse_tolerant(content: str, field_names: List[str]) -> Tuple[Dict[str, Any], str]:
+    """
+    Parse LLM output into a dict, trying progressively looser strategies
+
+    Returns:
+        tuple: (parsed data, path) where path is one of 'clean', 'fenced',
+        'extracted', 'salvaged' or 'unparseable'
+    """
+    if not content:
+        return {}, 'unparseable'
+
+    data = _loads_object(content)
+    if data is not None:
+        return data, 'clean'
+
+    fenced = FENCE_PATTERN.search(content)
+    if fenced:
+        data = _loads_object(fenced.group(1))
+        if data is not None:
+            return data, 'fenced'
+
+    start = content.find('{')
+    if start != -1:
+        try:
+            data, _ = json.JSONDecoder().raw_decode(content, start)
+            if isinstance(data, dict):
+                return data, 'extracted'
+        except ValueError:
+            pass
+
+    data = _salvage_fields(content, field_names)
+    if data:
+        return data, 'salvaged'
+    return {}, 'unparseable'
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _salvage_fields(content: str, field_names: List[str]) -> Dict[str, Any]:
+    """Decode each field's value independently from broken or truncated JSON"""
+    decoder = json.JSONDecoder()
+    salvaged = {}
+    for name in field_names:
+        match = re.search(r'"%s"\s*:\s*' % re.escape(name), content)
+        if not match:
+            continue
+        try:
+            salvaged[name], _ = decoder.raw_decode(content, match.end())
+            continue
+        except ValueError:
+            pass
+        # Truncated array: keep the string items that were closed
+        if content[match.end():match.end() + 1] == '[':
+            tail = content[match.end() + 1:]
+            end = tail.find(']')
+            items = STRING_ITEM_PATTERN.findall(tail if end == -1 else tail[:end])
+            if items:
+                salvaged[name] = [json.loads(f'"{item}"') for item in items]
+    return salvaged
+
+
+CV_INSIGHTS_SCHEMA = LLMSchema('cv_insights', [
+    SchemaField('skills', 'list', [], 'list of technical and soft skills'),
+    SchemaField('experience', 'list', [], 'list of key experience points'),
+    SchemaField('education', 'list', [], 'list of education/qualifications'),
+    SchemaField('achievements', 'list', [], 'list of quantifiable achievements'),
+    SchemaField('summary', 'str', 'Analysis unavailable', 'brief professional summary'),
+])
+
+CV_ANALYSIS_SCHEMA = LLMSchema('cv_analysis', [
+    SchemaField('overall_score', 'score', 75, 'overall quality score (0-100)'),
+    SchemaField('ats_score', 'score', 75, 'ATS compatibility score (0-100)'),
+    SchemaField('keyword_score', 'score', 75, 'keyword optimization score (0-100)'),
+    SchemaField('strengths', 'list', [], 'list of 4-6 key strengths'),
+    SchemaField('weaknesses', 'list', [], 'list of 4-6 areas for improvement'),
+    SchemaField('recommendations', 'list', [], 'list of 4-6 specific recommendations'),
+    SchemaField('skills', 'list', [], 'list of identified technical and soft skills'),
+    SchemaField('experience_level', 'str', 'Not specified', 'brief description of experience level'),
+    SchemaField('industry', 'str', 'Not specified', 'primary industry focus'),
+    SchemaField('education_level', 'str', 'Not specified', 'education level identified'),
+])
@@ -0,0 +1,160 @@
+"""
+Django management command to compare text-extraction backends on a corpus.
+Runs every registered backend over the same files, each in a fresh process so
+peak memory is its own, and reports throughput, peak memory, output length and
+similarity to the reference backend. With --write-policy the fastest
+acceptable backends are saved as the extraction order (see builder/extractors.py).
+"""
+import difflib
+import json
+import multiprocessing
+import os
+import re
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from builder.extractors import get_extractor_registry
+from builder.file_handlers import CVFileHandler, DEFAULT_MAX_CHARS, TextExtractionError
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _run_backend(name, paths, max_chars):
+    """Extract every path with one backend; runs in its own process"""
+    backend = get_extractor_registry().get(name)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    results = {}
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            text, error = backend.extract(path, max_chars), None
+        except TextExtractionError as e:
+            text, error = None, str(e)
+        results[path] = (time.perf_counter() - start, text, error)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results, max(peak_kb - baseline_kb, 0) * 1024, python_peak
+
+
+def similarity(text, reference):
+    """Word-sequence similarity in [0, 1]"""
+    words = WORD_PATTERN.findall((text or '').lower())
+    reference_words = WORD_PATTERN.findall((reference or '').lower())
+    if not words and not reference_words:
+        return 1.0
+    return difflib.SequenceMatcher(None, words, reference_words, autojunk=False).ratio()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every text-extraction backend over a corpus and pick the fastest acceptable one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='CV files or directories of CV files')
+        parser.add_argument('--max-chars', type=int, default=DEFAULT_MAX_CHARS, help='Character budget per document')
+        parser.add_argument(
+            '--min-similarity',
+            type=float,
+            default=0.9,
+            help='Mean similarity to the reference backend required to be acceptable'
+        )
+        parser.add_argument(
+            '--max-failure-rate',
+            type=float,
+            default=0.02,
+            help='Share of documents a backend may fail on and still be acceptable'
+        )
+        parser.add_argument(
+            '--write-policy',
+            action='store_true',
+            help='Save the backend order to EXTRACTOR_POLICY_FILE'
+        )
+
+    def handle(self, *args, **options):
+        registry = get_extractor_registry()
+        corpus = defaultdict(list)
+        for path in self._collect(options['paths']):
+            mime_type = CVFileHandler._resolve_mime_type(path)
+            if registry.registered(mime_type):
+                corpus[mime_type].append(path)
+        if not corpus:
+            raise CommandError('No PDF or DOCX files found')
+
+        policy = {}
+        for mime_type, paths in corpus.items():
+            total_bytes = sum(os.path.getsize(path) for path in paths)
+            runs = {}
+            for backend in registry.registered(mime_type):
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('forkserver')) as pool:
+                    runs[backend.name] = pool.submit(_run_backend, backend.name, paths, options['max_chars']).result()
+
+            reference = registry.reference(mime_type)
+            reference_results = runs[reference.name][0] if reference else {}
+            rows = [self._summarise(name, run, reference_results, paths, total_bytes)
+                    for name, run in runs.items()]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{mime_type}: {len(paths)} documents'))
+            self.stdout.write(
+                f"{'backend':<12} {'docs/s':>8} {'MB/s':>7} {'peak MB':>8} {'py MB':>7} "
+                f"{'failed':>7} {'chars':>7} {'length':>7} {'similar':>8}"
+            )
+            for row in rows:
+                self.stdout.write(
+                    f"{row['name']:<12} {row['docs_per_second']:>8.1f} {row['mb_per_second']:>7.2f} "
+                    f"{row['peak_mb']:>8.1f} {row['python_peak_mb']:>7.1f} {row['failure_rate']:>6.1%} "
+                    f"{row['mean_chars']:>7.0f} {row['length_ratio']:>6.2f}x {row['similarity']:>8.3f}"
+                )
+
+            acceptable = [
+                row for row in rows
+                if (reference and row['name'] == reference.name)
+                or (row['failure_rate'] <= options['max_failure_rate'] and row['similarity'] >= options['min_similarity'])
+            ]
+            policy[mime_type] = [row['name'] for row in sorted(acceptable, key=lambda row: -row['docs_per_second'])]
+            self.stdout.write(f"Extraction order: {' -> '.join(policy[mime_type])}")
+
+        if options['write_policy']:
+            existing = dict(registry.policy)
+            existing.update(policy)
+            with open(settings.EXTRACTOR_POLICY_FILE, 'w') as f:
+                json.dump(existing, f, indent=2)
+            registry.set_policy(existing)
+            self.stdout.write(self.style.SUCCESS(f'Wrote extractor policy to {settings.EXTRACTOR_POLICY_FILE}'))
+
+    @staticmethod
+    def _collect(paths):
+        for path in paths:
+            if os.path.isdir(path):
+                for directory, _, filenames in os.walk(path):
+                    for filename in sorted(filenames):
+                        yield os.path.join(directory, filename)
+            else:
+                yield path
+
+    @staticmethod
+    def _summarise(name, run, reference_results, paths, total_bytes):
+        results, peak_bytes, python_peak_bytes = run
+        elapsed = sum(result[0] for result in results.values()) or 1e-9
+        succeeded = [path for path in paths if results[path][2] is None]
+        lengths = [len(results[path][1]) for path in succeeded]
+        compared = [path for path in succeeded if reference_results.get(path, (0, None, None))[1] is not None]
+        reference_chars = sum(len(reference_results[path][1]) for path in compared)
+        return {
+            'name': name,
+            'docs_per_second': len(paths) / elapsed,
+            'mb_per_second': total_bytes / 1024 / 1024 / elapsed,
+            'peak_mb': peak_bytes / 1024 / 1024,
+            'python_peak_mb': python_peak_bytes / 1024 / 1024,
+            'failure_rate': 1 - len(succeeded) / len(paths),
+            'mean_chars': sum(lengths) / len(lengths) if lengths else 0,
+            'length_ratio': (sum(len(results[path][1]) for path in compared) / reference_chars
+                             if reference_chars else 0.0),
+            'similarity': (sum(similarity(results[path][1], reference_results[path][1]) for path in compared)
+                           / len(compared) if compared else 0.0),
+        }
@@ -0,0 +1,124 @@
+"""
+Django management command to benchmark page-parallel PDF extraction.
+Builds PDFs of each page count by cycling the pages of sample CVs, then times
+serial and page-parallel extraction through ExtractionPool for each worker count.
+"""
+import io
+import statistics
+import time
+
+import PyPDF2
+from django.core.management.base import BaseCommand, CommandError
+from builder.extraction_pool import ExtractionPool
+from builder.file_handlers import PDF_MIME_TYPES
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Time serial vs page-parallel PDF extraction by page count and worker count'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pdfs', nargs='+', help='Sample PDF files whose pages are reused')
+        parser.add_argument(
+            '--pages',
+            type=_int_list,
+            default=[2, 4, 8, 12, 16, 20],
+            help='Comma-separated page counts to test'
+        )
+        parser.add_argument(
+            '--workers',
+            type=_int_list,
+            default=[2, 4],
+            help='Comma-separated worker counts for the parallel runs'
+        )
+        parser.add_argument(
+            '--pages-per-task',
+            type=int,
+            default=2,
+            help='Pages extracted by each parallel job'
+        )
+        parser.add_argument(
+            '--max-chars',
+            type=int,
+            default=1_000_000,
+            help='Character budget (the default extracts whole documents)'
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        sample_pages = []
+        for path in options['pdfs']:
+            try:
+                sample_pages.extend(PyPDF2.PdfReader(path).pages)
+            except Exception as e:
+                raise CommandError(f'Cannot read {path}: {e}')
+
+        documents = {count: self._build_pdf(sample_pages, count) for count in options['pages']}
+        max_chars = options['max_chars']
+
+        # Serial baseline: one worker, never split
+        serial_pool = ExtractionPool(workers=1, max_queue=0, timeout=120)
+        serial = {}
+        expected = {}
+        try:
+            for count, pdf in documents.items():
+                expected[count] = serial_pool.extract(pdf, PDF_MIME_TYPES[0], max_chars)
+                serial[count] = self._median(
+                    lambda: serial_pool.extract(pdf, PDF_MIME_TYPES[0], max_chars), options['repeat']
+                )
+        finally:
+            serial_pool.shutdown()
+
+        parallel = {}
+        for workers in options['workers']:
+            pool = ExtractionPool(
+                workers=workers, max_queue=0, timeout=120,
+                parallel_page_threshold=0, pages_per_task=options['pages_per_task']
+            )
+            try:
+                pool.extract_pdf(documents[min(documents)], max_chars)  # start every worker
+                for count, pdf in documents.items():
+                    if pool.extract_pdf(pdf, max_chars) != expected[count]:
+                        raise CommandError(f'{workers} workers produced different text for {count} pages')
+                    parallel[(workers, count)] = self._median(
+                        lambda: pool.extract_pdf(pdf, max_chars), options['repeat']
+                    )
+            finally:
+                pool.shutdown()
+
+        header = f"{'pages':>6} {'serial ms':>10}" + ''.join(
+            f" {f'{workers}w ms':>9} {'speedup':>8}" for workers in options['workers']
+        )
+        self.stdout.write(header)
+        for count in documents:
+            row = f'{count:>6} {serial[count] * 1000:>10.1f}'
+            for workers in options['workers']:
+                elapsed = parallel[(workers, count)]
+                row += f' {elapsed * 1000:>9.1f} {serial[count] / elapsed:>7.2f}x'
+            self.stdout.write(row)
+        self.stdout.write(self.style.SUCCESS(
+            'Parallel output matched serial output for every document. If some page count has a '
+            'speedup above 1, set EXTRACTION_PARALLEL_PAGES_ENABLED and set '
+            'EXTRACTION_PARALLEL_PAGE_THRESHOLD to the first such count.'
+        ))
+
+    @staticmethod
+    def _build_pdf(sample_pages, count):
+        writer = PyPDF2.PdfWriter()
+        for i in range(count):
+            writer.add_page(sample_pages[i % len(sample_pages)])
+        output = io.BytesIO()
+        writer.write(output)
+        return output.getvalue()
+
+    @staticmethod
+    def _median(fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
@@ -0,0 +1,123 @@
+"""
+Django management command to benchmark CVTextProcessor.scan.
+Times the single scan against the previous separate helpers (clean_text,
+extract_email, extract_phone and extract_skills, each re-reading the raw text
+with uncompiled patterns) on sample CVs, and reports where their results differ.
+"""
+import os
+import re
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from builder.file_handlers import CVFileHandler, CVTextProcessor, COMMON_SKILLS, TextExtractionError
+
+SAMPLE_CV = """Jane Doe | jane.doe@example.com | +1 (555) 123-4567
+linkedin.com/in/janedoe | https://github.com/janedoe | https://janedoe.dev
+
+Summary
+Senior backend engineer • 8 years building Python and Django services on AWS.
+
+Experience
+Acme Payments — Senior Python Developer (2019–present)
+  • Led a team of five engineers; introduced Docker & Kubernetes deployments.
+  • Built data pipelines with SQL, MongoDB and Machine Learning models.
+  • Ran Agile/Scrum ceremonies and owned Project Management for two migrations.
+Northwind Logistics — Software Engineer (2015–2019)
+  • React and Node.js dashboards, Linux operations and Git workflows.
+
+Education
+BSc Computer Science, University of Leeds
+
+Skills
+Python, JavaScript, PostgreSQL, Docker, Kubernetes, AWS, Leadership, Data Analysis
+"""
+
+
+def legacy_clean_text(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,;:@-]', '', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def legacy_extract_email(text):
+    match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    return match.group(0) if match else None
+
+
+def legacy_extract_phone(text):
+    match = re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+    return match.group(0) if match else None
+
+
+def legacy_extract_skills(text):
+    text_lower = text.lower()
+    return [skill for skill in COMMON_SKILLS if skill.lower() in text_lower]
+
+
+def legacy_scan(text):
+    return (legacy_clean_text(text), legacy_extract_email(text),
+            legacy_extract_phone(text), legacy_extract_skills(text))
+
+
+class Command(BaseCommand):
+    help = 'Time CVTextProcessor.scan against the previous separate text helpers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='CV files (.pdf, .docx or .txt); a built-in sample if omitted')
+        parser.add_argument('--number', type=int, default=200, help='Calls per timing')
+        parser.add_argument('--repeat', type=int, default=5, help='Timings per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        documents = {path: self._load(path) for path in options['paths']} or {'sample': SAMPLE_CV * 3}
+
+        self.stdout.write(f"{'document':<30} {'chars':>7} {'legacy us':>10} {'scan us':>9} {'speedup':>8}  differences")
+        total_legacy = total_scan = 0
+        for name, text in documents.items():
+            legacy = self._median(lambda: legacy_scan(text), options['number'], options['repeat'])
+            scanned = self._median(lambda: CVTextProcessor.scan(text), options['number'], options['repeat'])
+            total_legacy += legacy
+            total_scan += scanned
+            self.stdout.write(
+                f"{os.path.basename(name)[:30]:<30} {len(text):>7} {legacy * 1e6:>10.1f} {scanned * 1e6:>9.1f} "
+                f"{legacy / scanned:>7.2f}x  {self._differences(text) or '-'}"
+            )
+        self.stdout.write(self.style.SUCCESS(f'Overall speedup: {total_legacy / total_scan:.2f}x'))
+
+    @staticmethod
+    def _load(path):
+        if path.lower().endswith('.txt'):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                return f.read()
+        try:
+            return CVFileHandler.extract_text_in_process(path, max_chars=1_000_000)
+        except TextExtractionError as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+    @staticmethod
+    def _differences(text):
+        """Fields where scan disagrees with the legacy helpers"""
+        clean, email, phone, skills = legacy_scan(text)
+        scan = CVTextProcessor.scan(text)
+        differences = [
+            label for label, old, new in (('text', clean, scan.text), ('email', email, scan.email))
+            if old != new
+        ]
+        if phone != scan.phone:
+            differences.append('phone')
+        dropped = [skill for skill in skills if skill not in scan.skills]
+        if dropped:
+            # Substring matches such as Java inside JavaScript
+            differences.append(f"skills no longer matched: {', '.join(dropped)}")
+        return '; '.join(differences)
+
+    @staticmethod
+    def _median(fn, number, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            timings.append((time.perf_counter() - start) / number)
+        return statistics.median(timings)
@@ -0,0 +1,24 @@
+"""
+Django management command to discard abandoned chunked uploads.
+Sessions that were never finalized and have received no chunk within the
+expiry window are deleted along with their staged bytes.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from builder.chunked_uploads import clear_stale_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete unfinished chunked upload sessions and their staging files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=float,
+            default=getattr(settings, 'CHUNKED_UPLOAD_EXPIRY_HOURS', 24),
+            help='Discard sessions idle for longer than this'
+        )
+
+    def handle(self, *args, **options):
+        count = clear_stale_uploads(options['hours'])
+        self.stdout.write(self.style.SUCCESS(f"Discarded {count} stale chunked uploads"))
@@ -0,0 +1,50 @@
+"""
+Django management command to summarise recorded extraction telemetry.
+Prints wall time and peak memory percentiles per document format and size
+bucket, the numbers the extraction timeout, memory limit and worker counts
+should be tuned from (see builder/extraction_telemetry.py).
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from builder.extraction_telemetry import extraction_summary, summary_since
+
+
+def _cell(value, width):
+    return f"{'-' if value is None else value:>{width}}"
+
+
+class Command(BaseCommand):
+    help = 'Report extraction wall time and memory percentiles by format and file size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=float, default=7, help='Only samples from the last N days')
+        parser.add_argument('--json', action='store_true', help='Print the raw summary as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            since = summary_since(options['days'])
+        except ValueError as e:
+            raise CommandError(f'--{e}')
+        summary = extraction_summary(since=since)
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        if not summary['samples']:
+            self.stdout.write('No extraction samples recorded in that period')
+            return
+
+        for label, groups in summary['formats'].items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {groups['all']['count']} documents"))
+            self.stdout.write(
+                f"{'size':<10} {'docs':>6} {'failed':>7} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+                f"{'p95 KB':>8} {'pages':>6} {'chars':>7}"
+            )
+            for bucket, stats in [*groups['by_size'].items(), ('all', groups['all'])]:
+                failed = stats['count'] - stats['outcomes'].get('ok', 0) - stats['outcomes'].get('empty', 0)
+                self.stdout.write(
+                    f"{bucket:<10} {stats['count']:>6} {failed / stats['count']:>6.1%} "
+                    f"{_cell(stats['wall_ms']['p50'], 7)} {_cell(stats['wall_ms']['p95'], 7)} "
+                    f"{_cell(stats['wall_ms']['p99'], 7)} {_cell(stats['peak_rss_delta_kb']['p95'], 8)} "
+                    f"{_cell(stats['pages_p50'], 6)} {_cell(stats['chars_p50'], 7)}"
+                )
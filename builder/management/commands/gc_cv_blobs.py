@@ -0,0 +1,84 @@
+"""
+Django management command to reconcile content-addressed CV storage.
+Deleting an UploadedCV releases its reference (builder/signals.py); this
+recounts references from UploadedCV rows for anything that bypassed that,
+such as raw SQL deletes or a crash before the delete's commit hook ran, and
+removes blobs and files nothing points at any more.
+"""
+import os
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from builder.models import UploadedCV, StoredBlob
+from builder.storage import get_cv_storage
+
+
+class Command(BaseCommand):
+    help = 'Fix uploaded CV blob reference counts and delete unreferenced blobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without touching the database or files'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = get_cv_storage()
+
+        references = Counter(
+            name for name in UploadedCV.objects.values_list('file', flat=True)
+            if name and storage.is_blob(name)
+        )
+
+        fixed = removed = 0
+        unreferenced = set()
+        with transaction.atomic():
+            for blob in StoredBlob.objects.select_for_update():
+                actual = references.pop(blob.name, 0)
+                if actual == blob.ref_count:
+                    continue
+                fixed += 1
+                self.stdout.write(f"{blob.name}: {blob.ref_count} -> {actual} references")
+                if not actual:
+                    unreferenced.add(blob.name)
+                if dry_run:
+                    continue
+                if actual:
+                    blob.ref_count = actual
+                    blob.save(update_fields=['ref_count'])
+                else:
+                    blob.delete()
+
+            # Referenced files that never got a row
+            for name, count in references.items():
+                fixed += 1
+                self.stdout.write(f"{name}: 0 -> {count} references")
+                if not dry_run and storage.exists(name):
+                    StoredBlob.objects.create(name=name, size=storage.size(name), ref_count=count)
+
+        tracked = set(StoredBlob.objects.values_list('name', flat=True)) - unreferenced
+        for name in self._blob_files(storage):
+            if name in tracked or name in references:
+                continue
+            removed += 1
+            self.stdout.write(f"Removing unreferenced {name}")
+            if not dry_run:
+                storage.delete(name)
+
+        prefix = 'Would fix' if dry_run else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {fixed} reference counts and {'would remove' if dry_run else 'removed'} {removed} blobs"
+        ))
+
+    @staticmethod
+    def _blob_files(storage):
+        """Names of all files in the uploaded_cvs/ab/cd/ layout"""
+        root = storage.path('uploaded_cvs')
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                name = os.path.relpath(os.path.join(directory, filename), storage.location).replace(os.sep, '/')
+                if storage.is_blob(name):
+                    yield name
@@ -0,0 +1,83 @@
+"""
+Django management command to bulk-ingest a directory or zip of CVs for a user.
+Validation, extraction and local scoring run in a process pool; rows are
+inserted in batches and progress is checkpointed to a manifest, so rerunning
+the same command after an interruption resumes where it stopped.
+"""
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from builder.batch_analysis import CVBatchAnalysisService
+from builder.bulk_ingest import BulkIngestor, DEFAULT_BATCH_SIZE, DEFAULT_MAX_CHARS
+
+
+class Command(BaseCommand):
+    help = 'Ingest a directory or zip of CV files as uploaded CVs for one user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Directory or zip file of CVs')
+        parser.add_argument('--user', required=True, help='Username that will own the CVs')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'EXTRACTION_POOL_WORKERS', 2),
+            help='Worker processes for validation, extraction and scoring'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='CVs inserted per transaction and per manifest checkpoint'
+        )
+        parser.add_argument('--max-chars', type=int, default=DEFAULT_MAX_CHARS, help='Character budget per CV')
+        parser.add_argument('--manifest', help='Checkpoint file (default: <source>.manifest.json)')
+        parser.add_argument(
+            '--llm',
+            action='store_true',
+            help='Run the full LLM analysis in packed batches instead of storing local scores only'
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Process files that failed in an earlier run again'
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['source']):
+            raise CommandError(f"{options['source']} does not exist")
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        try:
+            ingestor = BulkIngestor(
+                user,
+                options['source'],
+                manifest_path=options['manifest'],
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                max_chars=options['max_chars'],
+                timeout=getattr(settings, 'EXTRACTION_TIMEOUT_SECONDS', 15),
+                memory_limit_mb=getattr(settings, 'EXTRACTION_MEMORY_LIMIT_MB', 1024),
+                analyzer=CVBatchAnalysisService() if options['llm'] else None,
+                retry_failed=options['retry_failed'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        stats = ingestor.run(progress=self._progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Ingested {stats.ingested} CVs ({stats.duplicates} duplicates, {stats.failed} failed, '
+            f'{stats.skipped} already done) in {stats.elapsed_seconds:.1f}s at '
+            f'{stats.files_per_second:.1f} files/s, {stats.mb_per_second:.2f} MB/s'
+        ))
+        if stats.failed:
+            self.stdout.write(f'Failures are listed in {ingestor.manifest_path}')
+        if not options['llm'] and stats.ingested:
+            self.stdout.write('Analyses hold local scores only; run batch_analyze_cvs --missing-only to complete them')
+
+    def _progress(self, stats, total):
+        self.stdout.write(f'  {stats.files}/{total} files, {stats.files_per_second:.1f} files/s')
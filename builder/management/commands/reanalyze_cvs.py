@@ -0,0 +1,152 @@
+"""
+Django management command to recompute rule-based CVAnalysis scores.
+Run it after changing CVAnalyzer's scoring rules. Extracted text and stored
+sections are streamed from the database in primary-key order, NER runs
+through spaCy's nlp.pipe (optionally across processes) and scores are
+written back with bulk_update. Completed (LLM) analyses are left alone, and
+ATS compatibility and missing keywords are only written when scoring against
+a job description. The last written primary key is checkpointed to a file,
+so rerunning the command after an interruption resumes where it stopped.
+"""
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from builder.cv_analysis_service import CVAnalyzer
+from builder.models import UploadedCV, CVAnalysis
+
+# Fields CVAnalyzer owns; ats_compatibility only with a job description
+SCORE_FIELDS = ['overall_score', 'keywords', 'experience_level']
+
+# CVAnalyzer levels as worded elsewhere in stored analyses
+EXPERIENCE_LABELS = {'entry': 'Entry Level', 'mid': 'Mid Level', 'senior': 'Senior Level'}
+
+
+def score_fields(result, job_description: bool = False) -> dict:
+    """
+    CVAnalysis field values for a CVAnalysisResult
+
+    Without a job description CVAnalyzer's ATS score is a constant and it finds
+    no missing keywords, so neither is included.
+    """
+    fields = {
+        'overall_score': round(result.overall_score),
+        'keywords': {'present': sorted(result.keyword_matches)},
+        'experience_level': EXPERIENCE_LABELS.get(result.experience_level, result.experience_level),
+    }
+    if job_description:
+        fields['ats_compatibility'] = round(result.ats_score)
+        fields['keywords']['missing'] = sorted(result.missing_keywords)
+    return fields
+
+
+class Command(BaseCommand):
+    help = 'Recompute rule-based CVAnalysis scores for uploaded CVs without a completed analysis, resumably'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only re-analyse CVs uploaded by this username')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='CVs read per database round trip, written per transaction and per checkpoint'
+        )
+        parser.add_argument('--nlp-batch-size', type=int, default=64, help='Texts per spaCy nlp.pipe batch')
+        parser.add_argument('--processes', type=int, default=1, help='spaCy worker processes (nlp.pipe n_process)')
+        parser.add_argument(
+            '--checkpoint',
+            default='reanalyze_cvs.checkpoint.json',
+            help='File recording the last primary key written; removed once a run completes'
+        )
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint and start over')
+        parser.add_argument(
+            '--job-description',
+            help='Text file with a job description; also rewrites ATS compatibility and missing keywords'
+        )
+
+    def handle(self, *args, **options):
+        checkpoint_path = options['checkpoint']
+        checkpoint = {'last_pk': None, 'processed': 0}
+        if os.path.exists(checkpoint_path) and not options['restart']:
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+            self.stdout.write(f"Resuming after {checkpoint['last_pk']} ({checkpoint['processed']} CVs already done)")
+
+        job_description = None
+        if options['job_description']:
+            with open(options['job_description'], encoding='utf-8') as f:
+                job_description = f.read()
+        fields = SCORE_FIELDS + ['ats_compatibility'] if job_description else SCORE_FIELDS
+
+        # Completed analyses hold the LLM's scores
+        queryset = UploadedCV.objects.exclude(extracted_text='').exclude(
+            cvanalysis__analysis_status='complete'
+        ).order_by('pk')
+        if options['user']:
+            queryset = queryset.filter(user__username=options['user'])
+        if checkpoint['last_pk']:
+            queryset = queryset.filter(pk__gt=checkpoint['last_pk'])
+
+        rows = queryset.values_list('extracted_text', 'sections', 'pk').iterator(chunk_size=options['batch_size'])
+        results = CVAnalyzer().analyze_many(
+            rows, job_description, batch_size=options['nlp_batch_size'], n_process=options['processes']
+        )
+
+        start = time.perf_counter()
+        total = created = 0
+        batch = []
+        for result, pk in results:
+            batch.append((pk, score_fields(result, bool(job_description))))
+            if len(batch) >= options['batch_size']:
+                created += self._write(batch, fields, checkpoint, checkpoint_path)
+                total += len(batch)
+                batch = []
+                self.stdout.write(f'  {total} CVs, {total / (time.perf_counter() - start):.1f} docs/s')
+        if batch:
+            created += self._write(batch, fields, checkpoint, checkpoint_path)
+            total += len(batch)
+
+        elapsed = time.perf_counter() - start
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-analysed {total} CVs ({created} new analyses) in {elapsed:.1f}s '
+            f'at {total / elapsed if elapsed else 0.0:.1f} docs/s'
+        ))
+
+    def _write(self, batch, fields, checkpoint, checkpoint_path):
+        """Store one batch of scores and checkpoint it; returns how many analyses were created"""
+        scores = dict(batch)
+        with transaction.atomic():
+            existing = CVAnalysis.objects.filter(uploaded_cv_id__in=scores).only(
+                'pk', 'uploaded_cv_id', 'analysis_status', 'keywords'
+            )
+            stale = []
+            for analysis in existing:
+                values = scores.pop(analysis.uploaded_cv_id)
+                if analysis.analysis_status == 'complete':
+                    continue  # completed by the LLM since it was read
+                # Keeps missing keywords found against the upload's own job description
+                analysis.keywords = {**(analysis.keywords or {}), **values.pop('keywords')}
+                for name, value in values.items():
+                    setattr(analysis, name, value)
+                stale.append(analysis)
+            CVAnalysis.objects.bulk_update(stale, fields)
+            # Local scores only; batch_analyze_cvs --missing-only completes these
+            CVAnalysis.objects.bulk_create([
+                CVAnalysis(
+                    uploaded_cv_id=pk, analysis_status='pending',
+                    **dict(values, keywords={'missing': [], **values['keywords']})
+                )
+                for pk, values in scores.items()
+            ])
+
+        checkpoint['last_pk'] = str(batch[-1][0])
+        checkpoint['processed'] += len(batch)
+        tmp_path = checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, checkpoint_path)
+        return len(scores)
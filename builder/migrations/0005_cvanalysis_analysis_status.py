@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builder', '0004_alter_template_style_alter_template_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvanalysis',
+            name='analysis_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('complete', 'Complete'), ('failed', 'Failed')], default='complete', max_length=20),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.23 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builder', '0005_cvanalysis_analysis_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedcv',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.CreateModel(
+            name='ProcessedDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('extractor_version', models.CharField(max_length=20)),
+                ('mime_type', models.CharField(max_length=100)),
+                ('file_size', models.PositiveIntegerField(default=0)),
+                ('extracted_text', models.TextField(blank=True)),
+                ('metadata', models.JSONField(default=dict)),
+                ('analysis', models.JSONField(blank=True, null=True)),
+                ('analyzer_version', models.CharField(blank=True, max_length=20)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('content_hash', 'extractor_version')},
+            },
+        ),
+    ]
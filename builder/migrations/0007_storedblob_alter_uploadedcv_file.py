@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-19 15:20
+
+import builder.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builder', '0006_processeddocument_uploadedcv_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='uploadedcv',
+            name='file',
+            field=models.FileField(storage=builder.storage.get_cv_storage, upload_to='uploaded_cvs/'),
+        ),
+    ]
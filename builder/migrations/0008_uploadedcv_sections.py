@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builder', '0007_storedblob_alter_uploadedcv_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedcv',
+            name='sections',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
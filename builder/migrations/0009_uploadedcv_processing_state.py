@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builder', '0008_uploadedcv_sections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedcv',
+            name='processing_state',
+            field=models.CharField(choices=[('queued', 'Queued'), ('extracting', 'Extracting'), ('analysing', 'Analysing'), ('done', 'Done'), ('failed', 'Failed')], default='done', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='uploadedcv',
+            name='processing_error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
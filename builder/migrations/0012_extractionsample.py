@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-19 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builder', '0011_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractionSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('mime_type', models.CharField(max_length=100)),
+                ('file_size', models.PositiveIntegerField()),
+                ('page_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('chars', models.PositiveIntegerField(default=0)),
+                ('backend', models.CharField(blank=True, max_length=20)),
+                ('wall_ms', models.PositiveIntegerField()),
+                ('peak_rss_delta_kb', models.PositiveIntegerField(blank=True, null=True)),
+                ('outcome', models.CharField(choices=[('ok', 'OK'), ('empty', 'No text'), ('failed', 'Failed'), ('timeout', 'Timed out'), ('busy', 'Queue full')], default='ok', max_length=10)),
+            ],
+        ),
+    ]
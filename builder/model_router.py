@@ -0,0 +1,207 @@
+"""
+Cost- and latency-aware model routing for OpenAI calls.
+
+Each AI service method is a route. A route's rules pick a model tier and
+max_tokens from the input size; the router then steps down to a faster tier
+when the chosen model is unhealthy or the route is missing its latency SLO.
+Routing tables come from settings.AI_MODEL_TIERS / settings.AI_MODEL_ROUTES.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Ordered fastest/cheapest first; stepping down means moving towards index 0
+DEFAULT_TIERS = [
+    {'name': 'fast', 'model': 'gpt-3.5-turbo'},
+    {'name': 'standard', 'model': 'gpt-4o-mini'},
+]
+
+DEFAULT_ROUTES = {
+    'extract_cv_insights': {
+        'slo_ms': 4000,
+        'rules': [
+            {'max_input_tokens': 600, 'tier': 'fast', 'max_tokens': 500},
+            {'tier': 'fast', 'max_tokens': 800},
+        ],
+    },
+    'analyze_cv_comprehensive': {
+        'slo_ms': 8000,
+        'rules': [
+            {'max_input_tokens': 400, 'tier': 'fast', 'max_tokens': 900},
+            {'tier': 'standard', 'max_tokens': 1200},
+        ],
+    },
+    'analyze_cv_batch': {
+        'slo_ms': 30000,
+        'rules': [
+            {'tier': 'standard', 'max_tokens': 4000},
+        ],
+    },
+    'generate_tailored_cover_letter': {
+        'slo_ms': 12000,
+        'rules': [
+            {'tier': 'standard', 'max_tokens': 1000},
+        ],
+    },
+    # Follow-ups for fields missing from a JSON answer; callers size max_tokens
+    'repair_json_fields': {
+        'slo_ms': 4000,
+        'rules': [
+            {'tier': 'fast', 'max_tokens': 400},
+        ],
+    },
+}
+
+DEFAULT_ROUTE = {'slo_ms': 8000, 'rules': [{'tier': 'fast', 'max_tokens': 800}]}
+
+WINDOW_SIZE = 200          # samples kept per route/model
+HEALTH_WINDOW_SECONDS = 300
+MIN_HEALTH_SAMPLES = 5
+MAX_ERROR_RATE = 0.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)"""
+    return len(text or '') // 4
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0 for an empty list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class RouteDecision:
+    """Outcome of a routing decision"""
+    route: str
+    tier: str
+    model: str
+    max_tokens: int
+    input_tokens: int
+    reason: str
+
+
+class ModelRouter:
+    """Picks a model per call and tracks per-route latency and model health"""
+
+    def __init__(self, tiers: List[Dict[str, str]] = None, routes: Dict[str, Dict] = None):
+        self.tiers = tiers or getattr(settings, 'AI_MODEL_TIERS', DEFAULT_TIERS)
+        self.routes = routes or getattr(settings, 'AI_MODEL_ROUTES', DEFAULT_ROUTES)
+        self._tier_index = {tier['name']: i for i, tier in enumerate(self.tiers)}
+        self._lock = threading.Lock()
+        self._route_latencies: Dict[str, deque] = {}
+        self._route_errors: Dict[str, int] = {}
+        self._model_samples: Dict[str, deque] = {}
+
+    def route(self, route: str, input_text: str = '') -> RouteDecision:
+        """Choose model and max_tokens for a call on the given route"""
+        config = self.routes.get(route, DEFAULT_ROUTE)
+        input_tokens = estimate_tokens(input_text)
+
+        rule = config['rules'][-1]
+        for candidate in config['rules']:
+            if input_tokens <= candidate.get('max_input_tokens', float('inf')):
+                rule = candidate
+                break
+
+        index = self._tier_index.get(rule['tier'], 0)
+        reason = f"input {input_tokens} tokens"
+
+        if index > 0 and self.route_p95(route) > config.get('slo_ms', DEFAULT_ROUTE['slo_ms']):
+            index -= 1
+            reason += ", p95 over SLO"
+
+        # Prefer the next faster healthy tier, then a slower one; keep the
+        # original choice if every tier looks unhealthy
+        fallback_order = list(range(index, -1, -1)) + list(range(index + 1, len(self.tiers)))
+        for candidate_index in fallback_order:
+            if self.is_healthy(self.tiers[candidate_index]['model']):
+                if candidate_index != index:
+                    reason += f", {self.tiers[index]['model']} unhealthy"
+                index = candidate_index
+                break
+
+        tier = self.tiers[index]
+        decision = RouteDecision(
+            route=route,
+            tier=tier['name'],
+            model=tier['model'],
+            max_tokens=rule['max_tokens'],
+            input_tokens=input_tokens,
+            reason=reason
+        )
+        logger.info(
+            f"Model route {route}: {decision.model} (tier={decision.tier}, "
+            f"max_tokens={decision.max_tokens}, {reason})"
+        )
+        return decision
+
+    def record(self, decision: RouteDecision, latency_ms: float, ok: bool = True) -> None:
+        """Record the outcome of a routed call"""
+        now = time.monotonic()
+        with self._lock:
+            latencies = self._route_latencies.setdefault(decision.route, deque(maxlen=WINDOW_SIZE))
+            latencies.append(latency_ms)
+            if not ok:
+                self._route_errors[decision.route] = self._route_errors.get(decision.route, 0) + 1
+            samples = self._model_samples.setdefault(decision.model, deque(maxlen=WINDOW_SIZE))
+            samples.append((now, ok))
+
+        logger.info(
+            f"Model route {decision.route} on {decision.model}: {latency_ms:.0f}ms "
+            f"{'ok' if ok else 'error'}, p95={self.route_p95(decision.route):.0f}ms"
+        )
+
+    def is_healthy(self, model: str) -> bool:
+        """A model is unhealthy when most of its recent calls failed"""
+        cutoff = time.monotonic() - HEALTH_WINDOW_SECONDS
+        with self._lock:
+            recent = [ok for ts, ok in self._model_samples.get(model, ()) if ts >= cutoff]
+        if len(recent) < MIN_HEALTH_SAMPLES:
+            return True
+        error_rate = recent.count(False) / len(recent)
+        return error_rate <= MAX_ERROR_RATE
+
+    def route_p95(self, route: str) -> float:
+        with self._lock:
+            latencies = list(self._route_latencies.get(route, ()))
+        return percentile(latencies, 95)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-route latency summary for this process"""
+        with self._lock:
+            snapshot = {route: list(values) for route, values in self._route_latencies.items()}
+            errors = dict(self._route_errors)
+        return {
+            route: {
+                'count': len(values),
+                'errors': errors.get(route, 0),
+                'p50_ms': round(percentile(values, 50)),
+                'p95_ms': round(percentile(values, 95)),
+            }
+            for route, values in snapshot.items()
+        }
+
+
+_router: Optional[ModelRouter] = None
+
+
+def get_router() -> ModelRouter:
+    """Process-wide router, built from settings on first use"""
+    global _router
+    if _router is None:
+        _router = ModelRouter()
+    return _router
@@ -4,6 +4,8 @@ from django.core.validators import FileExtensionValidator, URLValidator
 import uuid
 import json
 
+from .storage import get_cv_storage
+
 class CV(models.Model):
     """Enhanced CV model with comprehensive fields"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -204,15 +206,94 @@ class UploadedCV(models.Model):
     """Model for storing uploaded CV files (PDF/DOCX)"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    file = models.FileField(upload_to='uploaded_cvs/')
+    file = models.FileField(upload_to='uploaded_cvs/', storage=get_cv_storage)
     original_filename = models.CharField(max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     extracted_text = models.TextField(blank=True)
     processed = models.BooleanField(default=False)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    # Section offsets into extracted_text (see builder/cv_sections.py)
+    sections = models.JSONField(default=dict, blank=True)
+    # Background pipeline progress for uploads processed asynchronously
+    processing_state = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('extracting', 'Extracting'),
+            ('analysing', 'Analysing'),
+            ('done', 'Done'),
+            ('failed', 'Failed'),
+        ],
+        default='done'
+    )
+    processing_error = models.CharField(max_length=255, blank=True)
+    # SimHash of extracted_text and the earlier upload it nearly duplicates
+    # (see builder/near_duplicates.py)
+    simhash = models.BigIntegerField(null=True, blank=True)
+    near_duplicate_of = models.ForeignKey(
+        'self', null=True, blank=True, on_delete=models.SET_NULL, related_name='near_duplicates'
+    )
+    near_duplicate_similarity = models.FloatField(null=True, blank=True)
     
     def __str__(self):
         return f"{self.original_filename} - {self.user.username}"
 
+class CVFingerprintBand(models.Model):
+    """One band of an upload's SimHash; the per-user index for near-duplicate lookups"""
+    uploaded_cv = models.ForeignKey(UploadedCV, on_delete=models.CASCADE, related_name='fingerprint_bands')
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    band = models.PositiveSmallIntegerField()
+    value = models.PositiveIntegerField()
+    
+    class Meta:
+        indexes = [models.Index(fields=['user', 'band', 'value'])]
+
+class ChunkedUpload(models.Model):
+    """A CV being uploaded in chunks; bytes are staged on disk until finalize (see builder/chunked_uploads.py)"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    # Bytes received and acknowledged so far; the next chunk must start here
+    offset = models.PositiveIntegerField(default=0)
+    uploaded_cv = models.OneToOneField(UploadedCV, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size}) - {self.user.username}"
+
+class ProcessedDocument(models.Model):
+    """Extraction and analysis artifacts cached by SHA-256 of the uploaded bytes"""
+    content_hash = models.CharField(max_length=64)
+    extractor_version = models.CharField(max_length=20)
+    mime_type = models.CharField(max_length=100)
+    file_size = models.PositiveIntegerField(default=0)
+    extracted_text = models.TextField(blank=True)
+    metadata = models.JSONField(default=dict)
+    analysis = models.JSONField(null=True, blank=True)
+    analyzer_version = models.CharField(max_length=20, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ('content_hash', 'extractor_version')
+    
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.mime_type})"
+
+class StoredBlob(models.Model):
+    """Reference count for a content-addressed file in uploaded_cvs/"""
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
 class AICoverLetter(models.Model):
     """Model for AI-generated cover letters"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -234,6 +315,31 @@ class AICoverLetter(models.Model):
     def __str__(self):
         return f"AI Cover Letter for {self.job_title}"
 
+class ExtractionSample(models.Model):
+    """Cost of one document extraction, for capacity planning (see builder/extraction_telemetry.py)"""
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    mime_type = models.CharField(max_length=100)
+    file_size = models.PositiveIntegerField()
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    chars = models.PositiveIntegerField(default=0)
+    backend = models.CharField(max_length=20, blank=True)
+    wall_ms = models.PositiveIntegerField()
+    peak_rss_delta_kb = models.PositiveIntegerField(null=True, blank=True)
+    outcome = models.CharField(
+        max_length=10,
+        choices=[
+            ('ok', 'OK'),
+            ('empty', 'No text'),
+            ('failed', 'Failed'),
+            ('timeout', 'Timed out'),
+            ('busy', 'Queue full'),
+        ],
+        default='ok'
+    )
+    
+    def __str__(self):
+        return f"{self.mime_type} {self.file_size}B in {self.wall_ms}ms ({self.outcome})"
+
 class CVAnalysis(models.Model):
     """Model for CV strength analysis results"""
     uploaded_cv = models.OneToOneField(UploadedCV, on_delete=models.CASCADE)
@@ -243,6 +349,15 @@ class CVAnalysis(models.Model):
     keywords = models.JSONField(default=dict)
     experience_level = models.CharField(max_length=50, default='Entry Level')
     ats_compatibility = models.IntegerField(default=0)
+    analysis_status = models.CharField(
+        max_length=20,
+        choices=[
+            ('pending', 'Pending'),
+            ('complete', 'Complete'),
+            ('failed', 'Failed'),
+        ],
+        default='complete'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -0,0 +1,178 @@
+"""
+Multi-file and zip CV uploads.
+
+One request may carry several CVs and zip files of CVs, within a file-count and
+total-size budget (zip members are counted from their declared sizes before
+anything is inflated). Validation and extraction run on a small shared thread
+pool, extraction itself going through the isolated process pool, and results
+are yielded as each file finishes so the endpoints can stream them back.
+Database rows are written from the consuming thread, in completion order.
+"""
+
+import json
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Iterator
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile, UploadedFile
+from django.db import close_old_connections
+
+from .analysis_jobs import start_analysis, analysis_row_fields
+from .bulk_ingest import UNREADABLE_ENTRY_ERRORS, is_cv_entry
+from .document_cache import validate_and_extract
+from .file_handlers import TextExtractionError, ExtractionUnavailableError
+from .file_validators import FileValidator
+from .models import UploadedCV, CVAnalysis
+from .near_duplicates import index_upload
+
+logger = logging.getLogger(__name__)
+
+MAX_CHARS = 5000  # same budget as the single-file upload views
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'MULTI_UPLOAD_WORKERS', 4), thread_name_prefix='cv-upload'
+)
+
+
+def upload_budget() -> Dict[str, int]:
+    return {
+        'max_files': getattr(settings, 'MULTI_UPLOAD_MAX_FILES', 10),
+        'max_total_size': getattr(settings, 'MULTI_UPLOAD_MAX_TOTAL_SIZE', 20 * 1024 * 1024),
+    }
+
+
+def expand_uploads(files: List[UploadedFile]) -> List[UploadedFile]:
+    """
+    The CVs in a request, with zip files replaced by their members
+
+    Raises:
+        ValidationError: If the files exceed the count or total-size budget,
+            or a zip file or one of its members is unreadable
+    """
+    budget = upload_budget()
+    expanded: List[UploadedFile] = []
+    total_size = 0
+
+    def admit(count: int, size: int):
+        nonlocal total_size
+        total_size += size
+        if len(expanded) + count > budget['max_files']:
+            raise ValidationError(f"Too many files; upload at most {budget['max_files']} CVs at once")
+        if total_size > budget['max_total_size']:
+            raise ValidationError(
+                f"Files exceed the combined limit of {budget['max_total_size'] // (1024*1024)}MB"
+            )
+
+    for uploaded_file in files:
+        if FileValidator.sniff_mime_type(uploaded_file) != 'application/zip':
+            admit(1, uploaded_file.size)
+            expanded.append(uploaded_file)
+            continue
+
+        try:
+            with zipfile.ZipFile(uploaded_file) as archive:
+                members = [info for info in archive.infolist() if not info.is_dir() and is_cv_entry(info.filename)]
+                # Checked against declared sizes, which also bound what read() inflates
+                admit(len(members), sum(info.file_size for info in members))
+                for info in members:
+                    try:
+                        data = archive.read(info)
+                    except UNREADABLE_ENTRY_ERRORS:
+                        raise ValidationError(
+                            f"{info.filename} in {uploaded_file.name} is password-protected or damaged"
+                        )
+                    expanded.append(SimpleUploadedFile(os.path.basename(info.filename), data))
+        except zipfile.BadZipFile:
+            raise ValidationError(f"{uploaded_file.name} is not a readable zip file")
+        finally:
+            uploaded_file.seek(0)
+    return expanded
+
+
+def _extract(uploaded_file: UploadedFile):
+    try:
+        return validate_and_extract(uploaded_file, max_chars=MAX_CHARS)
+    finally:
+        close_old_connections()
+
+
+def process_uploads(user, files: List[UploadedFile]) -> Iterator[Dict[str, Any]]:
+    """
+    Validate, extract, store and start analysing each CV, yielding a result
+    per file as soon as it is done (not in upload order)
+    """
+    futures = {_executor.submit(_extract, uploaded_file): uploaded_file for uploaded_file in files}
+    for future in as_completed(futures):
+        uploaded_file = futures[future]
+        try:
+            yield _store(user, uploaded_file, future.result())
+        except ValidationError as e:
+            yield _failure(uploaded_file, f"File validation failed: {e.messages[0]}")
+        except ExtractionUnavailableError as e:
+            logger.warning(f"Extraction unavailable for {uploaded_file.name}: {str(e)}")
+            yield _failure(uploaded_file, e.user_message)
+        except TextExtractionError as e:
+            logger.error(f"Text extraction failed for {uploaded_file.name}: {str(e)}")
+            yield _failure(uploaded_file, 'Failed to extract text from the CV. Please try a different file.')
+        except Exception as e:
+            logger.error(f"Upload of {uploaded_file.name} failed: {str(e)}")
+            yield _failure(uploaded_file, 'Upload failed. Please try again.')
+
+
+def _failure(uploaded_file: UploadedFile, error: str) -> Dict[str, Any]:
+    return {'filename': uploaded_file.name, 'status': 'failed', 'error': error}
+
+
+def _store(user, uploaded_file: UploadedFile, extraction) -> Dict[str, Any]:
+    if not extraction.text:
+        return _failure(uploaded_file, 'No text found in the uploaded file.')
+
+    uploaded_cv = UploadedCV(
+        user=user,
+        original_filename=uploaded_file.name,
+        extracted_text=extraction.text,
+        content_hash=extraction.content_hash,
+        sections=extraction.sections,
+        processed=True,
+    )
+    uploaded_cv.file.save(uploaded_file.name, uploaded_file, save=False)
+    uploaded_cv.save()
+
+    analysis = extraction.analysis
+    if analysis:
+        # Identical bytes were analysed before
+        cv_analysis = CVAnalysis.objects.create(uploaded_cv=uploaded_cv, **analysis_row_fields(analysis))
+        index_upload(uploaded_cv)
+    else:
+        cv_analysis = CVAnalysis.objects.create(uploaded_cv=uploaded_cv, analysis_status='pending')
+        analysis = start_analysis(
+            extraction.text, user.id, cv_analysis_id=cv_analysis.pk,
+            content_hash=extraction.content_hash, sections=extraction.sections
+        )
+
+    return {
+        'filename': uploaded_file.name,
+        'status': 'complete',
+        'uploaded_cv': str(uploaded_cv.pk),
+        'cv_analysis': cv_analysis.pk,
+        'overall_score': analysis.get('overall_score'),
+        'ats_score': analysis.get('ats_score'),
+        'job_id': analysis.get('job_id'),
+        'pending': bool(analysis.get('pending')),
+    }
+
+
+def ndjson_stream(user, files: List[UploadedFile]) -> Iterator[str]:
+    """process_uploads as newline-delimited JSON, ending with a summary line"""
+    succeeded = failed = 0
+    for result in process_uploads(user, files):
+        if result['status'] == 'complete':
+            succeeded += 1
+        else:
+            failed += 1
+        yield json.dumps(result) + '\n'
+    yield json.dumps({'done': True, 'succeeded': succeeded, 'failed': failed}) + '\n'
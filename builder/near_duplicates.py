@@ -0,0 +1,148 @@
+"""
+Near-duplicate detection across a user's uploads.
+
+Each upload's SimHash (builder/simhash.py) is stored on UploadedCV and split
+into bands in CVFingerprintBand. The user's uploads sharing any band value
+with a new fingerprint are the candidates, which by construction includes
+every upload within BANDS - 1 bits; their exact Hamming distance decides.
+
+When a new upload is within NEAR_DUPLICATE_MAX_DISTANCE bits of an earlier
+upload with a completed analysis, that analysis is adjusted for the new text
+instead of running a fresh LLM pass: the local scores are recomputed and the
+overall score moves by as much as the local overall score did. Analyses are
+only ever adjusted from an upload that was analysed in full, so successive
+edits don't compound.
+"""
+
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .ai_services import CVAnalysisService, ANALYZER_VERSION
+from .file_handlers import EXTRACTOR_VERSION
+from .models import UploadedCV, CVFingerprintBand, ProcessedDocument
+from .simhash import BANDS, simhash, bands, hamming_distance, similarity
+
+logger = logging.getLogger(__name__)
+
+
+def max_distance() -> int:
+    """Largest Hamming distance treated as a near duplicate; the index can't find more than BANDS - 1"""
+    return min(getattr(settings, 'NEAR_DUPLICATE_MAX_DISTANCE', 6), BANDS - 1)
+
+
+def band_rows(uploaded_cv: UploadedCV, fingerprint: int) -> List[CVFingerprintBand]:
+    return [
+        CVFingerprintBand(uploaded_cv=uploaded_cv, user_id=uploaded_cv.user_id, band=band, value=value)
+        for band, value in enumerate(bands(fingerprint))
+    ]
+
+
+def index_upload(uploaded_cv: UploadedCV) -> Optional[int]:
+    """Fingerprint the upload's extracted text and (re)place it in the index"""
+    fingerprint = simhash(uploaded_cv.extracted_text or '')
+    with transaction.atomic():
+        UploadedCV.objects.filter(pk=uploaded_cv.pk).update(simhash=fingerprint)
+        CVFingerprintBand.objects.filter(uploaded_cv=uploaded_cv).delete()
+        if fingerprint is not None:
+            CVFingerprintBand.objects.bulk_create(band_rows(uploaded_cv, fingerprint))
+    uploaded_cv.simhash = fingerprint
+    return fingerprint
+
+
+def find_near_duplicates(user_id: int, fingerprint: int, exclude=None) -> List[Tuple[UploadedCV, float]]:
+    """The user's uploads within max_distance() bits of the fingerprint, closest first"""
+    query = Q()
+    for band, value in enumerate(bands(fingerprint)):
+        query |= Q(band=band, value=value)
+    candidates = UploadedCV.objects.filter(
+        pk__in=CVFingerprintBand.objects.filter(query, user_id=user_id).values('uploaded_cv')
+    )
+    if exclude is not None:
+        candidates = candidates.exclude(pk=exclude)
+
+    matches = [
+        (hamming_distance(fingerprint, candidate.simhash), candidate)
+        for candidate in candidates.select_related('cvanalysis')
+    ]
+    matches = [(distance, candidate) for distance, candidate in matches if distance <= max_distance()]
+    matches.sort(key=lambda match: (match[0], -match[1].uploaded_at.timestamp()))
+    return [(candidate, similarity(fingerprint, candidate.simhash)) for _, candidate in matches]
+
+
+def previous_analysis(uploaded_cv: UploadedCV) -> Optional[Dict[str, Any]]:
+    """
+    The completed analysis of an upload: the full cached result when the
+    content-hash cache still has one, otherwise what its CVAnalysis row keeps
+    """
+    cv_analysis = getattr(uploaded_cv, 'cvanalysis', None)
+    if cv_analysis is None or cv_analysis.analysis_status != 'complete':
+        return None
+
+    if uploaded_cv.content_hash:
+        document = ProcessedDocument.objects.filter(
+            content_hash=uploaded_cv.content_hash, extractor_version=EXTRACTOR_VERSION,
+            analyzer_version=ANALYZER_VERSION
+        ).exclude(analysis=None).first()
+        if document:
+            return dict(document.analysis)
+
+    return {
+        'overall_score': cv_analysis.overall_score,
+        'ats_score': cv_analysis.ats_compatibility,
+        'strengths': cv_analysis.strengths,
+        'weaknesses': cv_analysis.improvements,
+        'skills': (cv_analysis.keywords or {}).get('present', []),
+        'experience_level': cv_analysis.experience_level,
+    }
+
+
+def adjust_analysis(analysis: Dict[str, Any], previous_local: Dict[str, Any],
+                    local: Dict[str, Any]) -> Dict[str, Any]:
+    """An earlier analysis with its locally computed parts redone for the new text"""
+    adjusted = dict(analysis)
+    adjusted.update({
+        'ats_score': local['ats_score'],
+        'keyword_score': local['keyword_score'],
+        'section_scores': local['section_scores'],
+    })
+    delta = local['overall_score'] - previous_local['overall_score']
+    adjusted['overall_score'] = max(0, min(100, analysis.get('overall_score', 75) + delta))
+    skills = list(analysis.get('skills', []))
+    adjusted['skills'] = skills + [skill for skill in local['skills'] if skill not in skills]
+    return adjusted
+
+
+def reuse_analysis(uploaded_cv: UploadedCV, local: Dict[str, Any],
+                   scorer: CVAnalysisService) -> Optional[Dict[str, Any]]:
+    """
+    Index the upload and, if it nearly duplicates an earlier fully analysed
+    upload by the same user, link the two and return the earlier analysis
+    adjusted for this upload
+
+    Args:
+        uploaded_cv: Upload with extracted_text and sections saved
+        local: Local scores already computed for this upload's text
+        scorer: Service used to compute the earlier upload's local scores
+    """
+    fingerprint = index_upload(uploaded_cv)
+    if fingerprint is None or not getattr(settings, 'NEAR_DUPLICATE_REUSE', True):
+        return None
+
+    for candidate, score in find_near_duplicates(uploaded_cv.user_id, fingerprint, exclude=uploaded_cv.pk):
+        if candidate.near_duplicate_of_id:
+            continue  # itself adjusted from another upload
+        analysis = previous_analysis(candidate)
+        if analysis is None:
+            continue
+
+        previous_local = scorer.local_scores(candidate.extracted_text, sections=candidate.sections)
+        UploadedCV.objects.filter(pk=uploaded_cv.pk).update(
+            near_duplicate_of=candidate, near_duplicate_similarity=score
+        )
+        logger.info(f"Upload {uploaded_cv.pk} reuses the analysis of {candidate.pk} (similarity {score:.2f})")
+        return adjust_analysis(analysis, previous_local, local)
+    return None
@@ -0,0 +1,63 @@
+"""
+Process-wide spaCy pipeline.
+
+CVAnalyzer only reads named entities, so the model is loaded once per process
+with every component except NER excluded, instead of a full pipeline per
+analyzer instance. A loaded pipeline is read-only while it processes text, so
+one instance is shared by all threads; the lock only guards loading.
+
+Under gunicorn the model is loaded in the master before the workers fork
+(see gunicorn.conf.py), so they share its memory copy-on-write.
+"""
+
+import gc
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# en_core_web_sm components nothing reads; its ner has its own embedding layer
+UNUSED_PIPES = ('tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'senter')
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def _load_model(name: str):
+    import spacy
+    return spacy.load(name, exclude=list(UNUSED_PIPES))
+
+
+def get_nlp():
+    """The shared pipeline, loaded on first use"""
+    global _nlp
+    with _nlp_lock:
+        if _nlp is None:
+            name = getattr(settings, 'SPACY_MODEL', 'en_core_web_sm')
+            start = time.perf_counter()
+            _nlp = _load_model(name)
+            logger.info(f"Loaded spaCy model {name} in {time.perf_counter() - start:.2f}s")
+        return _nlp
+
+
+def preload_nlp() -> bool:
+    """
+    Load the pipeline now, in a process that is about to fork workers
+
+    Returns whether it was loaded. A missing model is logged rather than raised,
+    so the server still starts and workers load it on first use instead.
+    """
+    if not getattr(settings, 'SPACY_PRELOAD', True):
+        return False
+    try:
+        get_nlp()
+    except (ImportError, OSError) as e:
+        logger.warning(f"spaCy model not preloaded: {str(e)}")
+        return False
+    # Takes everything allocated so far out of the collector's generations, so
+    # collections in the workers don't write to, and so copy, the shared pages
+    gc.freeze()
+    return True
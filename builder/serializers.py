@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from .models import (
     CV, Experience, Education, Skill, Project, Certification, 
-    Language, Award, AICoverLetter, UploadedCV, Template, CVAnalysis
+    Language, Award, AICoverLetter, UploadedCV, Template, CVAnalysis, ChunkedUpload
 )
 
 class ExperienceSerializer(serializers.ModelSerializer):
@@ -70,7 +70,22 @@ class UploadedCVSerializer(serializers.ModelSerializer):
     class Meta:
         model = UploadedCV
         fields = '__all__'
-        read_only_fields = ('user', 'uploaded_at')
+        read_only_fields = (
+            'user', 'uploaded_at', 'simhash', 'near_duplicate_of', 'near_duplicate_similarity',
+            'processing_state', 'processing_error', 'content_hash', 'sections'
+        )
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ChunkedUpload
+        fields = ('id', 'filename', 'size', 'sha256', 'offset', 'chunk_size', 'uploaded_cv', 'created_at', 'updated_at')
+        read_only_fields = ('offset', 'uploaded_cv', 'created_at', 'updated_at')
+    
+    def get_chunk_size(self, obj):
+        from .chunked_uploads import chunk_size
+        return chunk_size()
 
 class TemplateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,20 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import UploadedCV
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_delete, sender=UploadedCV)
+def release_cv_file(sender, instance, **kwargs):
+    """Drop the deleted upload's blob reference, whichever path deleted it"""
+    if not instance.file:
+        return
+    name = instance.file.name
+    storage = instance.file.storage
+    # After commit, so a rolled-back delete keeps its reference
+    transaction.on_commit(lambda: storage.delete(name))
@@ -0,0 +1,74 @@
+"""
+64-bit SimHash fingerprints of CV text.
+
+Text is normalised first (case, punctuation, and the contact details and
+numbers that change between versions of the same CV are dropped) and hashed
+as overlapping two-word shingles, so two CVs that differ by a phone number
+or a reworded bullet end up a few bits apart. Fingerprints are stored as
+signed 64-bit integers to fit a BigIntegerField.
+
+No Django imports: bulk ingestion fingerprints text in extraction pool workers.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import List, Optional
+
+BITS = 64
+# The index splits a fingerprint into BANDS bands; by the pigeonhole principle
+# two fingerprints at most BANDS - 1 bits apart share at least one band exactly
+BANDS = 8
+BAND_BITS = BITS // BANDS
+SHINGLE_SIZE = 2
+# Below this many shingles a single edit moves the fingerprint too far to be useful
+MIN_SHINGLES = 8
+
+_MASK = (1 << BITS) - 1
+_BAND_MASK = (1 << BAND_BITS) - 1
+
+_EMAIL_RE = re.compile(r'\S+@\S+')
+_URL_RE = re.compile(r'(?:https?://|www\.)\S+')
+_NON_WORD_RE = re.compile(r'[^a-z]+')
+
+
+def normalise_text(text: str) -> str:
+    """Lowercased words only; emails, URLs, digits and punctuation removed"""
+    text = _URL_RE.sub(' ', _EMAIL_RE.sub(' ', text.lower()))
+    return ' '.join(word for word in _NON_WORD_RE.split(text) if len(word) > 1)
+
+
+def shingles(text: str) -> List[str]:
+    words = normalise_text(text).split()
+    return [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str) -> Optional[int]:
+    """Signed 64-bit SimHash of the text, or None if it is too short to fingerprint"""
+    features = Counter(shingles(text))
+    if sum(features.values()) < MIN_SHINGLES:
+        return None
+
+    weights = [0] * BITS
+    for feature, weight in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'big')
+        for bit in range(BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+
+    fingerprint = sum(1 << bit for bit in range(BITS) if weights[bit] > 0)
+    return fingerprint - (1 << BITS) if fingerprint >> (BITS - 1) else fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count('1')
+
+
+def similarity(a: int, b: int) -> float:
+    """Share of matching bits, 0.0 to 1.0"""
+    return 1 - hamming_distance(a, b) / BITS
+
+
+def bands(fingerprint: int) -> List[int]:
+    """The fingerprint's BANDS unsigned slices, lowest bits first"""
+    unsigned = fingerprint & _MASK
+    return [unsigned >> (band * BAND_BITS) & _BAND_MASK for band in range(BANDS)]
@@ -0,0 +1,102 @@
+// Progressive CV analysis: polls the analysis status endpoint and fills in
+// the LLM-derived sections once the background job completes.
+document.addEventListener('DOMContentLoaded', function() {
+    const root = document.querySelector('[data-analysis-status-url]');
+    if (!root) {
+        return;
+    }
+
+    const statusUrl = root.dataset.analysisStatusUrl;
+    const POLL_INTERVAL_MS = 1500;
+    const MAX_POLLS = 120;
+    const PLACEHOLDER = 'Analyzing...';
+    const SCORE_CLASSES = ['score-excellent', 'score-good', 'score-needs-improvement'];
+    let polls = 0;
+
+    // Same thresholds as the scoreclass template filter
+    function scoreClass(score) {
+        if (score >= 80) {
+            return 'score-excellent';
+        }
+        return score >= 60 ? 'score-good' : 'score-needs-improvement';
+    }
+
+    function replacePlaceholders(text) {
+        root.querySelectorAll('[data-analysis-field]').forEach(element => {
+            if (element.textContent.trim() === PLACEHOLDER) {
+                element.textContent = text;
+            }
+        });
+    }
+
+    function renderList(container, items) {
+        container.innerHTML = '';
+        items.forEach(item => {
+            const element = document.createElement(container.dataset.iconClass ? 'div' : 'span');
+            element.className = container.dataset.itemClass;
+            if (container.dataset.iconClass) {
+                const icon = document.createElement('i');
+                icon.className = container.dataset.iconClass;
+                element.appendChild(icon);
+            }
+            element.appendChild(document.createTextNode(item));
+            container.appendChild(element);
+        });
+    }
+
+    function applyAnalysis(analysis) {
+        root.querySelectorAll('[data-analysis-score]').forEach(element => {
+            const score = analysis[element.dataset.analysisScore];
+            if (score !== undefined) {
+                element.textContent = score + '%';
+                element.classList.remove(...SCORE_CLASSES);
+                element.classList.add(scoreClass(Number(score)));
+            }
+        });
+
+        root.querySelectorAll('[data-analysis-list]').forEach(container => {
+            const items = analysis[container.dataset.analysisList];
+            if (Array.isArray(items)) {
+                renderList(container, items);
+            }
+        });
+
+        root.querySelectorAll('[data-analysis-field]').forEach(element => {
+            const value = analysis[element.dataset.analysisField];
+            if (value) {
+                element.textContent = value;
+            }
+        });
+        replacePlaceholders('Not specified');
+    }
+
+    function markUnavailable() {
+        root.querySelectorAll('.analysis-pending').forEach(element => {
+            element.textContent = 'Detailed insights are unavailable right now. Please try again later.';
+        });
+        replacePlaceholders('Unavailable');
+    }
+
+    function poll() {
+        fetch(statusUrl, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(job => {
+                if (job.status === 'complete') {
+                    applyAnalysis(job.analysis);
+                } else if (job.status === 'failed' || ++polls >= MAX_POLLS) {
+                    markUnavailable();
+                } else {
+                    setTimeout(poll, POLL_INTERVAL_MS);
+                }
+            })
+            .catch(() => {
+                if (++polls < MAX_POLLS) {
+                    setTimeout(poll, POLL_INTERVAL_MS * 2);
+                } else {
+                    markUnavailable();
+                }
+            });
+    }
+
+    poll();
+});
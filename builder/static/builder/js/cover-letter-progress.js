@@ -0,0 +1,46 @@
+// Cover letter drafts: polls the cover letter status endpoint and swaps the
+// template draft for the tailored letter once the background job completes.
+document.addEventListener('DOMContentLoaded', function() {
+    const display = document.querySelector('[data-cover-letter-status-url]');
+    if (!display) {
+        return;
+    }
+
+    const statusUrl = display.dataset.coverLetterStatusUrl;
+    const notice = document.querySelector('.cover-letter-pending');
+    const POLL_INTERVAL_MS = 1500;
+    const MAX_POLLS = 120;
+    let polls = 0;
+
+    function finish(message) {
+        if (notice) {
+            notice.textContent = message;
+        }
+    }
+
+    function poll() {
+        fetch(statusUrl, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(job => {
+                if (job.status === 'complete') {
+                    display.textContent = job.cover_letter;
+                    if (notice) {
+                        notice.remove();
+                    }
+                } else if (job.status === 'failed' || ++polls >= MAX_POLLS) {
+                    finish('The tailored letter is unavailable right now. The draft above is ready to edit.');
+                } else {
+                    setTimeout(poll, POLL_INTERVAL_MS);
+                }
+            })
+            .catch(() => {
+                if (++polls < MAX_POLLS) {
+                    setTimeout(poll, POLL_INTERVAL_MS * 2);
+                } else {
+                    finish('The tailored letter is unavailable right now. The draft above is ready to edit.');
+                }
+            });
+    }
+
+    poll();
+});
@@ -0,0 +1,77 @@
+// Multi-file CV upload: posts the form to the bulk upload API and renders the
+// NDJSON result lines as each file finishes. Without fetch streaming support
+// the form is submitted normally and all results are shown at the end.
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('multi-upload-form');
+    const results = document.getElementById('multi-upload-results');
+    if (!form || !results || !window.ReadableStream) {
+        return;
+    }
+
+    function addResult(result) {
+        const placeholder = results.querySelector('[data-placeholder]');
+        if (placeholder) {
+            placeholder.remove();
+        }
+        const item = document.createElement('li');
+        item.className = 'list-group-item d-flex justify-content-between';
+        const name = document.createElement('span');
+        name.textContent = result.filename;
+        const outcome = document.createElement('span');
+        if (result.status === 'complete') {
+            outcome.className = 'text-success';
+            outcome.textContent = 'Score ' + result.overall_score + '%';
+        } else {
+            outcome.className = 'text-danger';
+            outcome.textContent = result.error;
+        }
+        item.appendChild(name);
+        item.appendChild(outcome);
+        results.appendChild(item);
+    }
+
+    function showError(message) {
+        addResult({filename: 'Upload', status: 'failed', error: message});
+    }
+
+    form.addEventListener('submit', async function(event) {
+        event.preventDefault();
+        const button = form.querySelector('button[type="submit"]');
+        button.disabled = true;
+        results.innerHTML = '';
+
+        try {
+            const response = await fetch(form.dataset.streamUrl, {
+                method: 'POST',
+                body: new FormData(form),
+                headers: {'X-CSRFToken': form.querySelector('[name=csrfmiddlewaretoken]').value},
+                credentials: 'same-origin'
+            });
+            if (!response.ok) {
+                const body = await response.json().catch(() => ({}));
+                showError(body.error || 'Upload failed. Please try again.');
+                return;
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            while (true) {
+                const {value, done} = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffered += decoder.decode(value, {stream: true});
+                const lines = buffered.split('\n');
+                buffered = lines.pop();
+                lines.filter(line => line.trim()).map(line => JSON.parse(line))
+                    .filter(result => !result.done)
+                    .forEach(addResult);
+            }
+        } catch (error) {
+            showError('Upload failed. Please try again.');
+        } finally {
+            button.disabled = false;
+        }
+    });
+});
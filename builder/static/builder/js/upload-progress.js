@@ -0,0 +1,37 @@
+// Background upload processing: polls the upload status endpoint while the
+// CV is extracted and analysed, then reloads the page to show the results.
+document.addEventListener('DOMContentLoaded', function() {
+    const root = document.querySelector('[data-upload-status-url]');
+    if (!root) {
+        return;
+    }
+
+    const statusUrl = root.dataset.uploadStatusUrl;
+    const stateLabel = root.querySelector('[data-upload-state]');
+    const POLL_INTERVAL_MS = 1000;
+    const MAX_POLLS = 180;
+    let polls = 0;
+
+    function poll() {
+        polls += 1;
+        fetch(statusUrl, {credentials: 'same-origin'})
+            .then(response => response.ok ? response.json() : Promise.reject(response.status))
+            .then(data => {
+                if (data.job_id || data.state === 'done' || data.state === 'failed') {
+                    window.location.reload();
+                    return;
+                }
+                stateLabel.textContent = data.label;
+                if (polls < MAX_POLLS) {
+                    setTimeout(poll, POLL_INTERVAL_MS);
+                }
+            })
+            .catch(() => {
+                if (polls < MAX_POLLS) {
+                    setTimeout(poll, POLL_INTERVAL_MS * 2);
+                }
+            });
+    }
+
+    setTimeout(poll, POLL_INTERVAL_MS);
+});
@@ -0,0 +1,146 @@
+"""
+Content-addressed, deduplicated storage for uploaded CV files.
+
+Blobs are named by the SHA-256 of their bytes and sharded two levels deep
+(uploaded_cvs/ab/cd/<hash>.pdf), so identical uploads share one file and no
+directory grows without bound. Each blob has a StoredBlob row counting the
+FileFields that reference it; deleting the last reference removes the file.
+Deleting an UploadedCV row releases its reference (see builder/signals.py).
+Names outside the content-addressed layout (older flat uploads) are handled
+exactly like FileSystemStorage.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from typing import Tuple
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+logger = logging.getLogger(__name__)
+
+BLOB_NAME_PATTERN = re.compile(r"^(?P<prefix>.*?)(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/(?P<hash>[0-9a-f]{64})(?P<ext>\.\w+)?$")
+
+
+def blob_name(prefix: str, content_hash: str, extension: str = '') -> str:
+    """uploaded_cvs/ab/cd/abcd....pdf"""
+    return os.path.join(prefix, content_hash[:2], content_hash[2:4], content_hash + extension.lower())
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores each distinct file once, with refcounts"""
+
+    def is_blob(self, name: str) -> bool:
+        return bool(BLOB_NAME_PATTERN.match(name.replace('\\', '/')))
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        prefix = os.path.dirname(name)
+        extension = os.path.splitext(name)[1]
+        content_hash = getattr(content, 'content_hash', None)
+
+        # The reference is taken before the file is put in place so a
+        # concurrent delete of the last reference can't remove it under us
+        if content_hash:
+            name = blob_name(prefix, content_hash, extension)
+            self._add_reference(name, content.size)
+            if not self.exists(name):
+                tmp_path, _ = self._spool(prefix, content)
+                self._commit_blob(tmp_path, name)
+        else:
+            tmp_path, content_hash = self._spool(prefix, content)
+            name = blob_name(prefix, content_hash, extension)
+            self._add_reference(name, content.size)
+            self._commit_blob(tmp_path, name)
+        return name.replace('\\', '/')
+
+    def _spool(self, prefix: str, content) -> Tuple[str, str]:
+        """Copy the content to a temp file next to its destination, hashing as we go"""
+        staging_dir = self.path(prefix or '.')
+        os.makedirs(staging_dir, exist_ok=True)
+        sha256 = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=staging_dir, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    sha256.update(chunk)
+                    tmp_file.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path, sha256.hexdigest()
+
+    def _commit_blob(self, tmp_path: str, name: str) -> None:
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            os.remove(tmp_path)
+            return
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(tmp_path, self.file_permissions_mode)
+        # Identical bytes, so losing a race to another writer is harmless
+        os.replace(tmp_path, full_path)
+
+    def _add_reference(self, name: str, size: int) -> None:
+        from .models import StoredBlob
+
+        updated = StoredBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    StoredBlob.objects.create(name=name, size=size or 0, ref_count=1)
+            except IntegrityError:
+                StoredBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+    def delete(self, name):
+        """Drop one reference; the blob itself goes with the last one"""
+        if not name or not self.is_blob(name):
+            return super().delete(name)
+
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob and blob.ref_count > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+                return
+            if blob:
+                blob.delete()
+            super().delete(name)
+
+        self._prune_shard_dirs(name)
+        logger.info(f"Garbage collected blob {name}")
+
+    def _prune_shard_dirs(self, name: str) -> None:
+        """Remove now-empty ab/cd shard directories"""
+        directory = os.path.dirname(self.path(name))
+        for _ in range(2):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                return  # not empty
+            directory = os.path.dirname(directory)
+
+
+_cv_storage = None
+
+
+def get_cv_storage() -> ContentAddressedStorage:
+    """Storage for UploadedCV.file (callable so settings are read lazily)"""
+    global _cv_storage
+    if _cv_storage is None:
+        _cv_storage = ContentAddressedStorage()
+    return _cv_storage
@@ -0,0 +1,68 @@
+"""Builders for small in-memory PDF, DOCX and zip files used by the extraction tests"""
+
+import io
+import zipfile
+from docx import Document
+
+
+def make_pdf(pages):
+    """Minimal PDF with one line of Helvetica text per entry in pages"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        stream = f"BT /F1 10 Tf 20 800 Td ({escaped}) Tj ET".encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids)
+    )
+
+    output = io.BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = output.tell()
+    output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b'%010d 00000 n \n' % offset)
+    output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def make_docx(paragraphs, table=None, header=None):
+    """DOCX with the given paragraphs, then an optional table (list of rows) and page header"""
+    document = Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    if table:
+        grid = document.add_table(rows=len(table), cols=len(table[0]))
+        for row, values in zip(grid.rows, table):
+            for cell, value in zip(row.cells, values):
+                cell.text = value
+    if header:
+        document.sections[0].header.paragraphs[0].text = header
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def make_zip_with_encrypted_member(name, secret_name, content):
+    """Zip of two copies of content; the second is flagged as encrypted, so reading it needs a password"""
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as archive:
+        archive.writestr(name, content)
+        archive.writestr(secret_name, content)
+    data = bytearray(output.getvalue())
+    # zipfile won't write encrypted members; set flag bit 0 in the second
+    # member's local and central directory headers instead
+    for signature, flag_offset in ((b'PK\x03\x04', 6), (b'PK\x01\x02', 8)):
+        header = data.find(signature, data.find(signature) + 1)
+        data[header + flag_offset] |= 0x1
+    return bytes(data)
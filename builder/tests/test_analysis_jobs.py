@@ -0,0 +1,80 @@
+from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from unittest.mock import patch
+from builder.ai_services import CVAnalysisService
+from builder.analysis_jobs import start_analysis, get_job
+from builder.models import UploadedCV, CVAnalysis
+
+
+class ImmediateExecutor:
+    """Runs submitted jobs inline so tests can assert on the final state"""
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+CV_TEXT = (
+    "Jane Doe - jane@example.com\n"
+    "Summary: Backend developer with 5 years experience in Python and SQL.\n"
+    "Experience: Led a team of 4 engineers, reduced costs by 20%.\n"
+    "Education: BSc Computer Science, University of Leeds\n"
+    "Skills: Python, Django, Docker, Leadership"
+)
+
+
+class LocalScoresTest(TestCase):
+    def test_local_scores_without_llm(self):
+        scores = CVAnalysisService().local_scores(CV_TEXT)
+        self.assertEqual(scores['section_scores']['education'], 100)
+        self.assertEqual(scores['section_scores']['certifications'], 0)
+        self.assertIn('Python', scores['skills'])
+        self.assertTrue(0 < scores['overall_score'] <= 100)
+
+    def test_local_scores_empty_text(self):
+        scores = CVAnalysisService().local_scores('')
+        self.assertEqual(scores['overall_score'], 0)
+
+
+@patch('builder.analysis_jobs.close_old_connections')
+@patch('builder.analysis_jobs._executor', ImmediateExecutor())
+class StartAnalysisTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_local_scores_returned_immediately_as_pending(self, _close):
+        analysis = start_analysis(CV_TEXT, self.user.id)
+        self.assertTrue(analysis['pending'])
+        self.assertEqual(analysis['strengths'], [])
+        self.assertIn('ats_score', analysis)
+
+    def test_job_completes_and_updates_analysis_row(self, _close):
+        uploaded_cv = UploadedCV.objects.create(
+            user=self.user, file='test_cv.pdf', original_filename='test_cv.pdf'
+        )
+        cv_analysis = CVAnalysis.objects.create(uploaded_cv=uploaded_cv, analysis_status='pending')
+
+        analysis = start_analysis(CV_TEXT, self.user.id, cv_analysis_id=cv_analysis.pk)
+
+        job = get_job(analysis['job_id'])
+        self.assertEqual(job['status'], 'complete')
+        self.assertTrue(job['analysis']['strengths'])
+        cv_analysis.refresh_from_db()
+        self.assertEqual(cv_analysis.analysis_status, 'complete')
+        self.assertTrue(cv_analysis.strengths)
+
+    def test_status_endpoint_is_scoped_to_owner(self, _close):
+        analysis = start_analysis(CV_TEXT, self.user.id)
+        url = reverse('builder:analysis_status', args=[analysis['job_id']])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'complete')
+
+        User.objects.create_user(username='other', password='testpass123')
+        self.client.login(username='other', password='testpass123')
+        self.assertEqual(self.client.get(url).status_code, 404)
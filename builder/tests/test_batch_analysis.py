@@ -0,0 +1,78 @@
+import json
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock
+from builder.ai_services import EnhancedAICoverLetterService
+from builder.batch_analysis import CVBatchAnalysisService, pack_batches
+
+
+def make_item(score=80):
+    return {
+        'overall_score': score,
+        'ats_score': score,
+        'keyword_score': score,
+        'strengths': ['Clear structure'],
+        'weaknesses': ['Few metrics'],
+        'recommendations': ['Add metrics'],
+        'skills': ['Python'],
+        'experience_level': 'Mid-level',
+        'industry': 'Technology',
+        'education_level': "Bachelor's Degree",
+    }
+
+
+class PackBatchesTest(SimpleTestCase):
+    def test_items_are_packed_under_budget(self):
+        items = {str(i): 'x' * 2000 for i in range(6)}  # ~500 tokens each
+        batches = pack_batches(items, token_budget=1500)
+        self.assertEqual(sum(len(batch) for batch in batches), 6)
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+
+    def test_oversized_item_gets_its_own_batch(self):
+        batches = pack_batches({'big': 'x' * 50000, 'small': 'x' * 100}, token_budget=500)
+        self.assertEqual(batches, [['big'], ['small']])
+
+
+class CVBatchAnalysisServiceTest(SimpleTestCase):
+    def setUp(self):
+        self.ai_service = EnhancedAICoverLetterService()
+        self.ai_service.client = MagicMock()
+        self.ai_service.analyze_cv_comprehensive = MagicMock(return_value=make_item(60))
+
+    def _respond_with(self, payload):
+        message = MagicMock(content=json.dumps(payload))
+        self.ai_service.client.chat.completions.create.return_value.choices = [MagicMock(message=message)]
+
+    def test_valid_items_come_from_one_request(self):
+        self._respond_with({'a': make_item(), 'b': make_item()})
+        results, stats = CVBatchAnalysisService(self.ai_service).analyze({'a': 'CV one', 'b': 'CV two'})
+
+        self.assertEqual(stats.batches, 1)
+        self.assertEqual(stats.retried, 0)
+        self.assertEqual(results['a']['overall_score'], 80)
+        self.ai_service.analyze_cv_comprehensive.assert_not_called()
+
+    def test_invalid_and_missing_items_are_retried_individually(self):
+        broken = make_item()
+        broken['ats_score'] = 'high'
+        self._respond_with({'a': make_item(), 'b': broken})
+
+        results, stats = CVBatchAnalysisService(self.ai_service).analyze(
+            {'a': 'CV one', 'b': 'CV two', 'c': 'CV three'}
+        )
+
+        self.assertEqual(sorted(stats.retried_ids), ['b', 'c'])
+        self.assertEqual(results['b']['overall_score'], 60)
+        self.assertEqual(self.ai_service.analyze_cv_comprehensive.call_count, 2)
+
+    def test_fenced_and_truncated_answers_keep_their_items(self):
+        fenced = '```json\n' + json.dumps({'a': make_item(), 'b': make_item()}) + '\n```'
+        message = MagicMock(content=fenced)
+        self.ai_service.client.chat.completions.create.return_value.choices = [MagicMock(message=message)]
+        _, stats = CVBatchAnalysisService(self.ai_service).analyze({'a': 'CV one', 'b': 'CV two'})
+        self.assertEqual(stats.retried, 0)
+
+        truncated = json.dumps({'a': make_item(), 'b': make_item()})[:-40]
+        message.content = truncated
+        results, stats = CVBatchAnalysisService(self.ai_service).analyze({'a': 'CV one', 'b': 'CV two'})
+        self.assertEqual(stats.retried_ids, ['b'])
+        self.assertEqual(results['a']['overall_score'], 80)
@@ -0,0 +1,161 @@
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from io import StringIO
+from django.test import TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from unittest.mock import patch
+from builder.bulk_ingest import BulkIngestor, collect_entries, read_entry
+from builder.file_handlers import TextExtractionError
+from builder.file_validators import FileValidator
+from builder.models import UploadedCV, CVAnalysis, CVFingerprintBand, StoredBlob
+from builder.simhash import BANDS
+from documents import make_pdf, make_docx, make_zip_with_encrypted_member
+
+CV_PDF = make_pdf(['Experience: Python developer with 5 years experience'])
+CV_DOCX = make_docx(['John Smith', 'Skills', 'Django, SQL, AWS'])
+
+
+
+class BulkIngestTest(TransactionTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=os.path.join(self.root, 'media'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='partner', password='testpass123')
+
+        self.source = os.path.join(self.root, 'cvs')
+        self._write('a/jane.pdf', CV_PDF)
+        self._write('b/jane.pdf', CV_PDF)  # same bytes and name in another folder
+        self._write('john.docx', CV_DOCX)
+        self._write('broken.pdf', b'%PDF-1.4 truncated')
+        self._write('.DS_Store', b'junk')
+
+    def _write(self, key, content):
+        path = os.path.join(self.source, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    def _manifest(self, ingestor):
+        with open(ingestor.manifest_path) as f:
+            return json.load(f)['entries']
+
+    def test_directory_is_ingested_in_batches(self):
+        ingestor = BulkIngestor(self.user, self.source, batch_size=2)
+        progress = []
+        stats = ingestor.run(progress=lambda stats, total: progress.append((stats.files, total)))
+
+        self.assertEqual((stats.files, stats.ingested, stats.duplicates, stats.failed), (4, 2, 1, 1))
+        self.assertEqual(progress, [(2, 4), (4, 4), (4, 4)])
+        self.assertEqual(
+            sorted(UploadedCV.objects.values_list('original_filename', flat=True)), ['jane.pdf', 'john.docx']
+        )
+        jane = UploadedCV.objects.get(original_filename='jane.pdf')
+        self.assertIn('Python developer', jane.extracted_text)
+        self.assertIn('experience', jane.sections['sections'])
+        self.assertEqual(jane.cvanalysis.analysis_status, 'pending')
+        self.assertEqual(StoredBlob.objects.get(name=jane.file.name).ref_count, 1)
+
+        entries = self._manifest(ingestor)
+        self.assertEqual(entries['a/jane.pdf'], {'status': 'ingested', 'uploaded_cv': str(jane.pk)})
+        self.assertEqual(entries['b/jane.pdf'], {'status': 'duplicate'})
+        self.assertEqual(entries['broken.pdf']['status'], 'failed')
+        self.assertNotIn('.DS_Store', entries)
+
+    def test_rerun_resumes_from_the_manifest(self):
+        BulkIngestor(self.user, self.source).run()
+        self._write('new.pdf', make_pdf(['Alex Brown', 'Education', 'BSc Physics']))
+
+        stats = BulkIngestor(self.user, self.source).run()
+
+        self.assertEqual((stats.files, stats.ingested, stats.skipped), (1, 1, 4))
+        self.assertEqual(UploadedCV.objects.count(), 3)
+
+    def test_lost_checkpoint_does_not_duplicate_rows(self):
+        ingestor = BulkIngestor(self.user, self.source)
+        ingestor.run()
+        os.remove(ingestor.manifest_path)
+
+        stats = BulkIngestor(self.user, self.source).run()
+
+        self.assertEqual((stats.ingested, stats.duplicates), (0, 3))
+        self.assertEqual(UploadedCV.objects.count(), 2)
+        self.assertEqual(CVAnalysis.objects.count(), 2)
+
+    def test_manifest_for_another_source_is_refused(self):
+        ingestor = BulkIngestor(self.user, self.source)
+        ingestor.run()
+        with self.assertRaises(ValueError):
+            BulkIngestor(self.user, self.root, manifest_path=ingestor.manifest_path)
+
+    def test_zip_source_and_command(self):
+        archive_path = os.path.join(self.root, 'cvs.zip')
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            archive.writestr('export/jane.pdf', CV_PDF)
+            archive.writestr('__MACOSX/export/._jane.pdf', b'junk')
+        self.assertEqual(collect_entries(archive_path), ['export/jane.pdf'])
+
+        out = StringIO()
+        call_command('ingest_cvs', archive_path, user='partner', workers=1, stdout=out)
+
+        self.assertIn('Ingested 1 CVs', out.getvalue())
+        self.assertEqual(UploadedCV.objects.get().original_filename, 'jane.pdf')
+        self.assertTrue(os.path.exists(archive_path + '.manifest.json'))
+
+    def test_unreadable_zip_members_fail_without_ending_the_run(self):
+        archive_path = os.path.join(self.root, 'cvs.zip')
+        with open(archive_path, 'wb') as f:
+            f.write(make_zip_with_encrypted_member('a_jane.pdf', 'b_secret.pdf', CV_PDF))
+        ingestor = BulkIngestor(self.user, archive_path, workers=1)
+
+        stats = ingestor.run()
+
+        self.assertEqual((stats.files, stats.ingested, stats.failed), (2, 1, 1))
+        entries = self._manifest(ingestor)
+        self.assertEqual(entries['b_secret.pdf'],
+                         {'status': 'failed', 'error': 'b_secret.pdf is password-protected or damaged'})
+
+    def test_crashed_worker_fails_only_its_entry(self):
+        def run(fn, source, key, max_chars):
+            if key == 'john.docx':
+                raise TextExtractionError("Extraction worker crashed")
+            return fn(source, key, max_chars)
+
+        ingestor = BulkIngestor(self.user, self.source, workers=1)
+        with patch('builder.bulk_ingest.ExtractionPool.run', side_effect=run):
+            stats = ingestor.run()
+
+        self.assertEqual((stats.files, stats.ingested, stats.failed), (4, 1, 2))
+        self.assertEqual(self._manifest(ingestor)['john.docx'],
+                         {'status': 'failed', 'error': 'Extraction worker crashed'})
+
+    def test_ingested_cvs_are_fingerprinted(self):
+        source = os.path.join(self.root, 'long')
+        os.makedirs(source)
+        with open(os.path.join(source, 'alex.docx'), 'wb') as f:
+            f.write(make_docx([
+                'Alex Brown',
+                'Data engineer building streaming pipelines with Kafka and Spark for a national '
+                'retailer, owning ingestion, data quality checks and the on-call rota for the team.',
+            ]))
+        BulkIngestor(self.user, source, workers=1).run()
+
+        uploaded_cv = UploadedCV.objects.get()
+        self.assertIsNotNone(uploaded_cv.simhash)
+        self.assertEqual(
+            CVFingerprintBand.objects.filter(uploaded_cv=uploaded_cv, user=self.user).count(), BANDS
+        )
+
+    def test_oversized_entries_are_not_read(self):
+        with patch.object(FileValidator, 'MAX_FILE_SIZE', 10), \
+                patch('builder.bulk_ingest.open') as open_file:
+            with self.assertRaises(ValidationError):
+                read_entry(self.source, 'john.docx')
+        open_file.assert_not_called()
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from unittest.mock import patch
+from builder.chunked_uploads import staging_path
+from builder.models import ChunkedUpload, UploadedCV
+from documents import make_pdf
+
+CV_PDF = make_pdf(['Jane Doe', 'Python developer with 5 years experience'] * 10)
+CHUNK = 256
+
+
+@override_settings(CHUNKED_UPLOAD_CHUNK_SIZE=CHUNK, EXTRACTION_POOL_ENABLED=False)
+@patch('builder.chunked_uploads.start_upload_processing')
+class ChunkedUploadTest(TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=os.path.join(root, 'media'), CHUNKED_UPLOAD_DIR=os.path.join(root, 'staging')
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def _start(self, content=CV_PDF, filename='cv.pdf', sha256=None):
+        return self.client.post(reverse('chunkedupload-list'), {
+            'filename': filename,
+            'size': len(content),
+            'sha256': sha256 or hashlib.sha256(content).hexdigest(),
+        })
+
+    def _put(self, upload_id, offset, data):
+        return self.client.put(
+            f"{reverse('chunkedupload-chunk', args=[upload_id])}?offset={offset}",
+            data=data, content_type='application/octet-stream'
+        )
+
+    def _send(self, upload_id, content=CV_PDF, start=0):
+        for offset in range(start, len(content), CHUNK):
+            response = self._put(upload_id, offset, content[offset:offset + CHUNK])
+            self.assertEqual(response.status_code, 200)
+        return response
+
+    def _finalize(self, upload_id):
+        return self.client.post(reverse('chunkedupload-finalize', args=[upload_id]))
+
+    def test_chunks_are_assembled_and_queued(self, start_processing):
+        session = self._start().json()
+        self.assertEqual((session['offset'], session['chunk_size']), (0, CHUNK))
+
+        last = self._send(session['id'])
+        self.assertEqual(last.json(), {'offset': len(CV_PDF), 'size': len(CV_PDF)})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._finalize(session['id'])
+        self.assertEqual(response.status_code, 201)
+
+        uploaded_cv = UploadedCV.objects.get()
+        self.assertEqual(response.json()['uploaded_cv'], str(uploaded_cv.pk))
+        self.assertEqual(response.json()['status_url'], reverse('builder:upload_status', args=[uploaded_cv.pk]))
+        self.assertEqual(uploaded_cv.processing_state, 'queued')
+        self.assertEqual(uploaded_cv.content_hash, hashlib.sha256(CV_PDF).hexdigest())
+        with uploaded_cv.file.open('rb') as f:
+            self.assertEqual(f.read(), CV_PDF)
+        start_processing.assert_called_once_with(uploaded_cv.pk, self.user.id)
+
+        upload = ChunkedUpload.objects.get()
+        self.assertFalse(os.path.exists(staging_path(upload)))
+        # Finalizing again (e.g. after a lost response) returns the same CV
+        self.assertEqual(self._finalize(session['id']).json()['uploaded_cv'], str(uploaded_cv.pk))
+
+    def test_interrupted_transfer_resumes_from_acknowledged_offset(self, _):
+        upload_id = self._start().json()['id']
+        self._put(upload_id, 0, CV_PDF[:CHUNK])
+
+        # A retry of the acknowledged chunk is told where to carry on
+        conflict = self._put(upload_id, 0, CV_PDF[:CHUNK])
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.json()['offset'], CHUNK)
+
+        offset = self.client.get(reverse('chunkedupload-detail', args=[upload_id])).json()['offset']
+        self.assertEqual(offset, CHUNK)
+        self._send(upload_id, start=offset)
+        self.assertEqual(self._finalize(upload_id).status_code, 201)
+
+    def test_checksum_mismatch_resets_the_session(self, start_processing):
+        upload_id = self._start(sha256='0' * 64).json()['id']
+        self._send(upload_id)
+
+        response = self._finalize(upload_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Checksum mismatch', response.json()['error'])
+        upload = ChunkedUpload.objects.get()
+        self.assertEqual(upload.offset, 0)
+        self.assertEqual(os.path.getsize(staging_path(upload)), 0)
+        self.assertFalse(UploadedCV.objects.exists())
+        start_processing.assert_not_called()
+
+    def test_incomplete_upload_cannot_be_finalized(self, _):
+        upload_id = self._start().json()['id']
+        self._put(upload_id, 0, CV_PDF[:CHUNK])
+        response = self._finalize(upload_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('incomplete', response.json()['error'])
+
+    def test_limits(self, _):
+        self.assertEqual(self._start(filename='cv.exe').status_code, 400)
+        self.assertEqual(self._start(content=b'x' * (5 * 1024 * 1024 + 1)).status_code, 400)
+
+        upload_id = self._start().json()['id']
+        self.assertEqual(self._put(upload_id, 0, CV_PDF[:CHUNK + 1]).status_code, 413)
+
+        other = User.objects.create_user(username='other', password='testpass123')
+        self.client.force_login(other)
+        self.assertEqual(self._put(upload_id, 0, CV_PDF[:CHUNK]).status_code, 404)
+        self.assertEqual(self._finalize(upload_id).status_code, 404)
+
+    def test_stale_sessions_are_discarded(self, _):
+        stale_id = self._start().json()['id']
+        fresh_id = self._start().json()['id']
+        ChunkedUpload.objects.filter(pk=stale_id).update(updated_at=timezone.now() - timedelta(hours=25))
+        stale_path = staging_path(ChunkedUpload.objects.get(pk=stale_id))
+
+        out = StringIO()
+        call_command('clear_chunked_uploads', stdout=out)
+
+        self.assertIn('Discarded 1', out.getvalue())
+        self.assertEqual([str(pk) for pk in ChunkedUpload.objects.values_list('pk', flat=True)], [fresh_id])
+        self.assertFalse(os.path.exists(stale_path))
@@ -0,0 +1,137 @@
+from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+import os
+from unittest.mock import patch
+from builder.analysis_jobs import start_cover_letter, get_job
+from builder.cover_letter_drafts import (
+    CompiledTemplate, get_compiled, parse_job_description, render_draft, default_cover_letter_template
+)
+from builder.models import AICoverLetter, Template
+
+
+class ImmediateExecutor:
+    """Runs submitted jobs inline so tests can assert on the final state"""
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+CV_TEXT = (
+    "Jane Doe - jane@example.com\n"
+    "Backend developer with 5 years experience in Python and SQL.\n"
+    "Reduced infrastructure costs by 20% in one year\n"
+    "BSc Computer Science, University of Leeds\n"
+    "Skills: Python, Django, Docker, Leadership"
+)
+
+JOB_DESCRIPTION = "Acme Labs is hiring a backend engineer with Docker and Python experience."
+
+
+class CompiledTemplateTest(TestCase):
+    def test_placeholders_are_filled_and_unknown_ones_left_visible(self):
+        compiled = CompiledTemplate("Dear {{ company }} team, {{job_title}} - {{ signature }}")
+        self.assertEqual(compiled.placeholders, {'company', 'job_title', 'signature'})
+        self.assertEqual(
+            compiled.render({'company': 'Acme', 'job_title': 'Engineer'}),
+            "Dear Acme team, Engineer - [signature]"
+        )
+
+    def test_template_is_compiled_once_until_content_changes(self):
+        template = Template.objects.create(
+            name='Short', description='', type='cover_letter',
+            template_content='Hello {{ company }}'
+        )
+        first = get_compiled(template)
+        self.assertIs(get_compiled(template), first)
+
+        template.template_content = 'Hi {{ company }}'
+        self.assertIsNot(get_compiled(template), first)
+
+    def test_draft_uses_cv_and_job_details(self):
+        template = Template.objects.create(
+            name='Short', description='', type='cover_letter', is_default=True,
+            template_content='{{ job_title }} at {{ company }}: {{ skills }}\n{{ achievements }}'
+        )
+        draft, insights = render_draft(CV_TEXT, 'Backend Engineer', JOB_DESCRIPTION, template)
+
+        self.assertTrue(draft.startswith('Backend Engineer at Acme Labs: Python, Docker'))
+        self.assertIn('- Reduced infrastructure costs by 20% in one year', draft)
+        self.assertIn('SQL', insights['skills'])
+
+    def test_default_template_prefers_matching_style(self):
+        Template.objects.create(name='A', description='', type='cover_letter', is_default=True,
+                                style='classic', template_content='a')
+        creative = Template.objects.create(name='B', description='', type='cover_letter',
+                                           style='creative', template_content='b')
+        self.assertEqual(default_cover_letter_template('creative'), creative)
+        self.assertEqual(default_cover_letter_template('standard').name, 'A')
+
+    def test_company_falls_back_when_not_found(self):
+        self.assertEqual(parse_job_description('Dev', 'we need a developer')['company'], 'your organization')
+
+
+@patch('builder.analysis_jobs.close_old_connections')
+@patch('builder.analysis_jobs._executor', ImmediateExecutor())
+class CoverLetterJobTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_llm_letter_replaces_draft(self, _close):
+        draft, _ = render_draft(CV_TEXT, 'Backend Engineer', JOB_DESCRIPTION)
+        letter = AICoverLetter.objects.create(
+            user=self.user, job_title='Backend Engineer',
+            job_description=JOB_DESCRIPTION, generated_letter=draft
+        )
+        with patch('builder.ai_services.EnhancedAICoverLetterService.generate_tailored_cover_letter',
+                   return_value='Tailored letter'):
+            job_id = start_cover_letter(letter.pk, self.user.id, draft, CV_TEXT,
+                                        'Backend Engineer', JOB_DESCRIPTION)
+
+        letter.refresh_from_db()
+        self.assertEqual(letter.generated_letter, 'Tailored letter')
+        response = self.client.get(reverse('builder:cover_letter_status', args=[job_id]))
+        self.assertEqual(response.json(), {'status': 'complete', 'cover_letter': 'Tailored letter'})
+
+    def test_ajax_draft_mode_skips_llm(self, _close):
+        with patch('builder.ai_services.EnhancedAICoverLetterService.generate_tailored_cover_letter') as llm:
+            response = self.client.post(
+                reverse('builder:ajax_generate_cover_letter'),
+                data={'job_title': 'Backend Engineer', 'job_description': JOB_DESCRIPTION,
+                      'cv_text': CV_TEXT, 'mode': 'draft'},
+                content_type='application/json'
+            )
+        self.assertTrue(response.json()['draft'])
+        self.assertIn('Acme Labs', response.json()['cover_letter'])
+        llm.assert_not_called()
+
+    def test_status_is_private_to_owner(self, _close):
+        job_id = start_cover_letter(None, self.user.id + 1, 'draft', '', 'x', 'y')
+        self.assertIsNotNone(get_job(job_id))
+        response = self.client.get(reverse('builder:cover_letter_status', args=[job_id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_result_page_polls_the_cover_letter_job(self, _close):
+        service = 'builder.ai_services.EnhancedAICoverLetterService'
+        with patch.dict(os.environ, {'OPENAI_API_KEY': 'sk-test'}), \
+                patch(f'{service}.extract_cv_insights', return_value={'skills': ['Python']}), \
+                patch(f'{service}.generate_tailored_cover_letter', return_value='Tailored letter'):
+            response = self.client.post(reverse('builder:enhanced_ai_cover_letter'), {
+                'job_title': 'Backend Engineer', 'job_description': JOB_DESCRIPTION, 'cv_text': CV_TEXT,
+                'tone': 'professional', 'template_type': 'standard',
+            })
+
+        self.assertEqual(response.status_code, 200)
+        job_id = response.context['cover_letter_job_id']
+        self.assertIsNotNone(job_id)
+        self.assertContains(response, reverse('builder:cover_letter_status', args=[job_id]))
+        self.assertContains(response, reverse('builder:dashboard'))
+
+    def test_cover_letter_job_is_not_an_analysis(self, _close):
+        job_id = start_cover_letter(None, self.user.id, 'draft', '', 'x', 'y')
+        response = self.client.get(reverse('builder:analysis_status', args=[job_id]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from unittest.mock import patch
+import PyPDF2
+from builder.file_handlers import CVFileHandler, TextExtractionError, UnsupportedFileTypeError
+from documents import make_pdf, make_docx
+
+PDF = 'application/pdf'
+DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+class CVFileHandlerExtractionTest(SimpleTestCase):
+    def test_pdf_from_in_memory_upload(self):
+        upload = SimpleUploadedFile('cv.pdf', make_pdf(['Jane Doe', 'Python developer']))
+        upload.read()  # validators leave the pointer at the end
+        self.assertEqual(CVFileHandler.extract_text(upload, PDF), 'Jane DoePython developer')
+
+    def test_pdf_stops_reading_pages_at_budget(self):
+        pdf = make_pdf(['x' * 100] * 10)
+        original = PyPDF2.PageObject.extract_text
+        with patch.object(PyPDF2.PageObject, 'extract_text', autospec=True,
+                          side_effect=lambda page, *args, **kwargs: original(page)) as extract:
+            text = CVFileHandler.extract_text_from_pdf(pdf, max_chars=250)
+        self.assertEqual(len(text), 250)
+        self.assertEqual(extract.call_count, 3)
+
+    def test_docx_respects_budget(self):
+        upload = SimpleUploadedFile('cv.docx', make_docx(['Experience'] * 50))
+        text = CVFileHandler.extract_text(upload, DOCX, max_chars=40)
+        self.assertEqual(len(text), 40)
+        self.assertTrue(text.startswith('Experience\nExperience'))
+
+    def test_mime_type_falls_back_to_extension(self):
+        upload = SimpleUploadedFile('cv.docx', make_docx(['Jane Doe']))
+        self.assertEqual(CVFileHandler.extract_text(upload), 'Jane Doe')
+
+    def test_errors(self):
+        with self.assertRaises(UnsupportedFileTypeError):
+            CVFileHandler.extract_text(b'plain', 'text/plain')
+        with self.assertRaises(TextExtractionError):
+            CVFileHandler.extract_text(b'not a pdf', PDF)
+
+    def test_storage_placeholders(self):
+        self.assertEqual(CVFileHandler.extract_text_for_storage(b'not a pdf', PDF), 'PDF text extraction failed')
+        self.assertEqual(CVFileHandler.extract_text_for_storage(make_pdf(['']), PDF), 'No text found in PDF')
+        self.assertEqual(
+            CVFileHandler.extract_text_for_storage(b'x', 'text/plain'),
+            'Text extraction not supported for this format'
+        )
@@ -0,0 +1,93 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from builder.ai_services import CVAnalysisService, EnhancedAICoverLetterService
+from builder.cv_sections import segment_cv, CVSections, SEGMENTER_VERSION
+from builder.document_cache import validate_and_extract
+from builder.models import ProcessedDocument
+from documents import make_pdf
+
+CV_TEXT = """Jane Doe
+jane@example.com | +1 555 123 4567
+
+Professional Summary
+Backend engineer with 8 years of experience.
+
+WORK EXPERIENCE Acme Corp 2018-2024
+- Cut API latency by 40%
+Experience with Python is listed here too.
+
+Education
+BSc Computer Science
+
+Skills: Python, SQL, Docker
+"""
+
+
+class SegmentCVTest(SimpleTestCase):
+    def test_sections_and_offsets(self):
+        segments = segment_cv(CV_TEXT)
+        self.assertEqual(segments['version'], SEGMENTER_VERSION)
+        self.assertEqual(
+            set(segments['sections']), {'contact', 'summary', 'experience', 'education', 'skills'}
+        )
+        start, content_start, end = segments['sections']['education'][0]
+        self.assertTrue(CV_TEXT[start:content_start].startswith('Education'))
+        self.assertEqual(CV_TEXT[content_start:end].strip(), 'BSc Computer Science')
+
+    def test_heading_forms(self):
+        sections = CVSections(CV_TEXT)
+        # Capitalised heading joined to its content, and "Heading: content"
+        self.assertTrue(sections.get('experience').startswith('Acme Corp 2018-2024'))
+        self.assertEqual(sections.get('skills'), 'Python, SQL, Docker')
+        # A sentence starting with a heading word is not a heading
+        self.assertIn('Experience with Python', sections.get('experience'))
+        self.assertTrue(sections.has_contact_details())
+        self.assertFalse(sections.has('certifications'))
+
+    def test_spans_are_clipped_to_truncated_text(self):
+        sections = CVSections(CV_TEXT[:120], segment_cv(CV_TEXT))
+        self.assertTrue(sections.has('summary'))
+        self.assertFalse(sections.has('skills'))
+
+    def test_prompt_text_keeps_every_section_within_budget(self):
+        text = CV_TEXT.replace('- Cut API latency by 40%', '- Cut API latency by 40%\n' + 'Shipped features. ' * 200)
+        excerpt = CVSections(text).for_prompt(600)
+        self.assertLessEqual(len(excerpt), 600)
+        for label in ('Summary:', 'Experience:', 'Skills:', 'Education:'):
+            self.assertIn(label, excerpt)
+        self.assertIn('BSc Computer Science', excerpt)
+        self.assertNotIn('jane@example.com', excerpt)
+
+    def test_text_without_headings_is_truncated_as_before(self):
+        self.assertEqual(CVSections('plain text ' * 100).for_prompt(50), ('plain text ' * 100)[:50])
+
+
+class SectionScoringTest(SimpleTestCase):
+    def setUp(self):
+        self.service = CVAnalysisService(ai_service=EnhancedAICoverLetterService())
+
+    def test_local_scores_use_stored_sections(self):
+        scores = self.service.local_scores(CV_TEXT, sections=segment_cv(CV_TEXT))
+        self.assertEqual(scores['section_scores'], {
+            'contact': 100, 'summary': 100, 'experience': 100,
+            'education': 100, 'skills': 100, 'certifications': 0,
+        })
+        # Three headed ATS sections, and "40%" / "8 years" in summary and experience
+        self.assertEqual(scores['ats_score'], 60 + 15 + 6)
+
+    def test_weaknesses_name_missing_sections(self):
+        weaknesses = self.service._identify_weaknesses(CVSections('Jane Doe\nSkills: Python'), {'skills': []})
+        self.assertIn('No clearly headed Experience section', weaknesses)
+
+
+@override_settings(EXTRACTION_POOL_ENABLED=False)
+class SectionsAtExtractionTest(TestCase):
+    def test_sections_are_stored_and_reused(self):
+        pdf = make_pdf(['Skills: Python, SQL'])
+        first = validate_and_extract(SimpleUploadedFile('cv.pdf', pdf), max_chars=3000)
+        self.assertTrue(CVSections(first.text, first.sections).has('skills'))
+        self.assertEqual(ProcessedDocument.objects.get().metadata['sections'], first.sections)
+
+        second = validate_and_extract(SimpleUploadedFile('cv.pdf', pdf), max_chars=3000)
+        self.assertTrue(second.cache_hit)
+        self.assertEqual(second.sections, first.sections)
@@ -0,0 +1,103 @@
+import hashlib
+import tempfile
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from unittest.mock import patch
+from builder.document_cache import validate_and_extract, store_analysis
+from builder.file_handlers import CVFileHandler
+from builder.models import ProcessedDocument, UploadedCV
+from documents import make_pdf
+
+CV_PDF = make_pdf(['Jane Doe', 'Python developer with 5 years experience'])
+
+
+class ImmediateExecutor:
+    """Runs submitted jobs inline so tests can assert on the final state"""
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+@override_settings(EXTRACTION_POOL_ENABLED=False)
+class DocumentCacheTest(TestCase):
+    def _upload(self, name='cv.pdf', content=CV_PDF):
+        return SimpleUploadedFile(name, content, content_type='application/pdf')
+
+    def test_reupload_uses_cached_text(self):
+        first = validate_and_extract(self._upload(), max_chars=3000)
+        self.assertFalse(first.cache_hit)
+        self.assertEqual(first.content_hash, hashlib.sha256(CV_PDF).hexdigest())
+
+        with patch.object(CVFileHandler, 'extract_text') as extract, \
+                patch('builder.document_cache.FileValidator.sniff_mime_type') as sniff:
+            second = validate_and_extract(self._upload('renamed.pdf'), max_chars=3000)
+
+        extract.assert_not_called()
+        sniff.assert_not_called()
+        self.assertTrue(second.cache_hit)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(ProcessedDocument.objects.get().hit_count, 1)
+
+    def test_cache_hit_still_checks_extension(self):
+        validate_and_extract(self._upload(), max_chars=3000)
+        with self.assertRaises(ValidationError):
+            validate_and_extract(self._upload('cv.docx'), max_chars=3000)
+
+    def test_truncated_text_is_not_reused_for_larger_budget(self):
+        validate_and_extract(self._upload(), max_chars=10)
+        again = validate_and_extract(self._upload(), max_chars=3000)
+        self.assertFalse(again.cache_hit)
+        self.assertIn('Python developer', again.text)
+
+    def test_failed_extraction_is_not_cached(self):
+        broken = self._upload(content=b'%PDF-1.4\nbroken')
+        result = validate_and_extract(broken, max_chars=3000, for_storage=True)
+        self.assertEqual(result.text, 'PDF text extraction failed')
+        self.assertFalse(ProcessedDocument.objects.exists())
+
+    def test_analysis_is_versioned(self):
+        first = validate_and_extract(self._upload(), max_chars=3000)
+        self.assertIsNone(first.analysis)
+        store_analysis(first.content_hash, {'overall_score': 81, 'job_id': 'x', 'pending': False})
+
+        cached = validate_and_extract(self._upload(), max_chars=3000)
+        self.assertEqual(cached.analysis, {'overall_score': 81})
+
+        with patch('builder.document_cache.ANALYZER_VERSION', 'next'):
+            self.assertIsNone(validate_and_extract(self._upload(), max_chars=3000).analysis)
+
+
+@override_settings(EXTRACTION_POOL_ENABLED=False, MEDIA_ROOT=tempfile.mkdtemp())
+class UploadReuseTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def _post(self):
+        return self.client.post(reverse('builder:upload_cv'), {
+            'title': 'My CV',
+            'file': SimpleUploadedFile('cv.pdf', CV_PDF, content_type='application/pdf'),
+        })
+
+    def test_reupload_creates_rows_from_cached_analysis(self):
+        extraction = validate_and_extract(SimpleUploadedFile('cv.pdf', CV_PDF), max_chars=3000)
+        store_analysis(extraction.content_hash, {
+            'overall_score': 81, 'ats_score': 77, 'strengths': ['Clear'], 'weaknesses': ['Short'],
+            'skills': ['Python'], 'experience_level': 'Mid-level',
+        })
+
+        with patch('builder.analysis_jobs._executor', ImmediateExecutor()), \
+                patch('builder.analysis_jobs.close_old_connections'), \
+                patch('builder.analysis_jobs.start_analysis') as start:
+            response = self._post()
+
+        start.assert_not_called()
+        self.assertEqual(response.status_code, 302)
+        uploaded_cv = UploadedCV.objects.get()
+        self.assertEqual(uploaded_cv.processing_state, 'done')
+        self.assertEqual(uploaded_cv.content_hash, extraction.content_hash)
+        self.assertEqual(uploaded_cv.cvanalysis.overall_score, 81)
+        self.assertEqual(uploaded_cv.cvanalysis.analysis_status, 'complete')
@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+from builder.docx_stream import extract_text_from_docx_stream
+from builder.file_handlers import CVFileHandler, TextExtractionError
+from documents import make_docx
+
+
+class StreamingDocxExtractionTest(SimpleTestCase):
+    def test_matches_python_docx_for_plain_paragraphs(self):
+        docx = make_docx(['Jane Doe', 'Senior Engineer', '', 'Python and SQL'])
+        self.assertEqual(extract_text_from_docx_stream(docx), CVFileHandler.extract_text_from_docx(docx))
+
+    def test_reads_tables_and_headers_in_order(self):
+        docx = make_docx(
+            ['Skills'],
+            table=[['Languages', 'Python, Go'], ['Databases', 'PostgreSQL']],
+            header='jane@example.com | +44 7700 900123'
+        )
+        text = extract_text_from_docx_stream(docx)
+        self.assertEqual(text.splitlines(), [
+            'jane@example.com | +44 7700 900123',
+            'Skills',
+            'Languages | Python, Go',
+            'Databases | PostgreSQL',
+        ])
+        # python-docx only walks body paragraphs
+        self.assertNotIn('PostgreSQL', CVFileHandler.extract_text_from_docx(docx))
+
+    def test_stops_at_budget(self):
+        docx = make_docx([f'Paragraph {i} ' + 'x' * 40 for i in range(500)])
+        text = extract_text_from_docx_stream(docx, max_chars=200)
+        self.assertEqual(len(text), 200)
+        self.assertTrue(text.startswith('Paragraph 0 '))
+
+    def test_invalid_file_raises_extraction_error(self):
+        with self.assertRaises(TextExtractionError):
+            extract_text_from_docx_stream(b'not a zip')
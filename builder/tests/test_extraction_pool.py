@@ -0,0 +1,140 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import PyPDF2
+from django.test import SimpleTestCase, override_settings
+from builder.extraction_pool import ExtractionPool, page_ranges, _pdf_head_job
+from builder.file_handlers import CVFileHandler, ExtractionTimeoutError, ExtractionBusyError, TextExtractionError
+from documents import make_pdf
+
+PDF = 'application/pdf'
+
+
+class ExtractionPoolTest(SimpleTestCase):
+    def setUp(self):
+        self.pool = ExtractionPool(workers=1, max_queue=0, timeout=5, memory_limit_mb=512)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_extracts_in_worker(self):
+        self.assertEqual(self.pool.extract(make_pdf(['Jane Doe']), PDF), 'Jane Doe')
+
+    def test_parse_errors_come_back_as_extraction_errors(self):
+        with self.assertRaises(TextExtractionError):
+            self.pool.extract(b'not a pdf', PDF)
+
+    def test_timeout_recycles_pool(self):
+        with self.assertRaises(ExtractionTimeoutError) as raised:
+            self.pool.run(time.sleep, 30, timeout=1)
+        self.assertIn('too long', raised.exception.user_message)
+        # The stuck worker is gone and the next job runs on a fresh pool
+        self.assertEqual(self.pool.extract(make_pdf(['After']), PDF), 'After')
+
+    def test_timeout_kills_only_the_overdue_worker(self):
+        pool = ExtractionPool(workers=2, max_queue=2, timeout=5, memory_limit_mb=512)
+        self.addCleanup(pool.shutdown)
+        pool.run(time.sleep, 0, timeout=30)  # both workers up
+        with ThreadPoolExecutor(1) as requests:
+            start = time.monotonic()
+            other = requests.submit(pool.run, time.sleep, 2, timeout=10)
+            time.sleep(0.5)
+            with self.assertRaises(ExtractionTimeoutError):
+                pool.run(time.sleep, 30, timeout=1)
+            other.result()
+            # Finished on the first attempt, not retried after a collateral kill
+            self.assertLess(time.monotonic() - start, 3.5)
+        self.assertEqual((pool.recycles, pool.collateral_jobs), (1, 0))
+        # The stuck job ends once its worker is killed
+        for _ in range(50):
+            if not pool._jobs:
+                break
+            time.sleep(0.1)
+        self.assertEqual(pool._jobs, {})
+
+    def test_memory_cap(self):
+        with self.assertRaises(MemoryError):
+            self.pool.run(bytearray, 2 * 1024 * 1024 * 1024)
+
+    def test_full_queue_is_rejected(self):
+        self.pool._slots.acquire()
+        try:
+            with self.assertRaises(ExtractionBusyError):
+                self.pool.extract(make_pdf(['x']), PDF)
+        finally:
+            self.pool._slots.release()
+
+
+class PageParallelExtractionTest(SimpleTestCase):
+    PAGES = [f'Page {number} experience' for number in range(1, 12)]
+
+    def setUp(self):
+        self.pool = ExtractionPool(workers=2, max_queue=0, timeout=10, memory_limit_mb=512,
+                                   parallel_page_threshold=4, pages_per_task=2)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_parallel_output_matches_serial_in_page_order(self):
+        pdf = make_pdf(self.PAGES)
+        with patch.object(self.pool, '_run_ordered', wraps=self.pool._run_ordered) as ordered:
+            text = self.pool.extract_pdf(pdf)
+        ordered.assert_called_once()
+        self.assertEqual(text, CVFileHandler.extract_text_from_pdf(pdf))
+        self.assertLess(text.index('Page 2 '), text.index('Page 10 '))
+
+    def test_short_pdf_stays_serial(self):
+        with patch.object(self.pool, '_run_ordered') as ordered:
+            text = self.pool.extract_pdf(make_pdf(self.PAGES[:3]))
+        ordered.assert_not_called()
+        self.assertIn('Page 3', text)
+
+    def test_budget_stops_remaining_ranges(self):
+        text = self.pool.extract_pdf(make_pdf(self.PAGES), max_chars=30)
+        self.assertEqual(text, CVFileHandler.extract_text_from_pdf(make_pdf(self.PAGES), max_chars=30))
+        self.assertNotIn('Page 11', text)
+
+    def test_head_job_parses_once(self):
+        pdf = make_pdf(self.PAGES)
+        with patch('builder.file_handlers.PyPDF2.PdfReader', wraps=PyPDF2.PdfReader) as reader:
+            page_count, first_range, complete, measurement = _pdf_head_job(pdf, 4, 2, 10000)
+        reader.assert_called_once()
+        self.assertEqual((page_count, complete, measurement.page_count), (11, False, 11))
+        self.assertEqual(first_range, CVFileHandler.extract_pdf_pages(pdf, 0, 2))
+
+        with patch('builder.file_handlers.PyPDF2.PdfReader', wraps=PyPDF2.PdfReader) as reader:
+            page_count, text, complete, _ = _pdf_head_job(make_pdf(self.PAGES[:3]), 4, 2, 10000)
+        reader.assert_called_once()
+        self.assertEqual((page_count, complete), (3, True))
+        self.assertIn('Page 3', text)
+
+    def test_in_memory_pdf_is_spooled_once_for_every_task(self):
+        sources = []
+        run_ordered = self.pool._run_ordered
+
+        def record(source, *args):
+            sources.append(source)
+            return run_ordered(source, *args)
+
+        with patch.object(self.pool, '_run_ordered', side_effect=record):
+            text = self.pool.extract_pdf(make_pdf(self.PAGES))
+        self.assertIn('Page 11', text)
+        # Tasks were given a path, which is removed afterwards
+        [path] = sources
+        self.assertIsInstance(path, str)
+        self.assertFalse(os.path.exists(path))
+
+    def test_page_ranges_cover_every_page(self):
+        self.assertEqual(page_ranges(5, 2), [(0, 2), (2, 4), (4, 5)])
+
+    @override_settings(EXTRACTION_POOL_ENABLED=True)
+    def test_page_parallel_mode_is_opt_in(self):
+        pdf = make_pdf(self.PAGES)
+        with patch('builder.extraction_pool.get_extraction_pool', return_value=self.pool), \
+                patch.object(self.pool, 'extract_pdf', wraps=self.pool.extract_pdf) as extract_pdf:
+            CVFileHandler.extract_text(pdf, PDF)
+            extract_pdf.assert_not_called()
+            with override_settings(EXTRACTION_PARALLEL_PAGES_ENABLED=True):
+                CVFileHandler.extract_text(pdf, PDF)
+            extract_pdf.assert_called_once()
@@ -0,0 +1,121 @@
+from io import StringIO
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command, CommandError
+from django.urls import reverse
+from unittest.mock import patch
+from builder.document_cache import validate_and_extract
+from builder.extraction_telemetry import ExtractionMeasurement, percentile, size_bucket, extraction_summary
+from builder.file_handlers import ExtractionTimeoutError
+from builder.models import ExtractionSample
+from documents import make_pdf, make_docx
+
+PDF_MIME = 'application/pdf'
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+class PercentileTest(SimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_size_buckets(self):
+        self.assertEqual(size_bucket(10 * 1024), '<100KB')
+        self.assertEqual(size_bucket(100 * 1024), '100-500KB')
+        self.assertEqual(size_bucket(3 * 1024 * 1024), '>2MB')
+
+    def test_worker_memory_takes_the_largest_growth(self):
+        measurement = ExtractionMeasurement(peak_rss_delta_kb=300)
+        measurement.merge_worker(ExtractionMeasurement(backend='pypdf2', page_count=4, peak_rss_delta_kb=100))
+        self.assertEqual((measurement.backend, measurement.page_count, measurement.peak_rss_delta_kb),
+                         ('pypdf2', 4, 300))
+
+
+@override_settings(EXTRACTION_POOL_ENABLED=False)
+class ExtractionRecordingTest(TestCase):
+    def test_cache_miss_records_a_sample(self):
+        pdf = make_pdf(['Jane Doe', 'Python developer', 'Education: BSc'])
+        validate_and_extract(SimpleUploadedFile('cv.pdf', pdf), max_chars=10000)
+
+        sample = ExtractionSample.objects.get()
+        self.assertEqual((sample.mime_type, sample.file_size, sample.page_count), (PDF_MIME, len(pdf), 3))
+        self.assertEqual((sample.backend, sample.outcome), ('pypdf2', 'ok'))
+        self.assertGreater(sample.chars, 0)
+        self.assertIsNotNone(sample.wall_ms)
+
+        # A cache hit costs no extraction, so it isn't sampled
+        validate_and_extract(SimpleUploadedFile('copy.pdf', pdf), max_chars=10000)
+        self.assertEqual(ExtractionSample.objects.count(), 1)
+
+    def test_page_count_comes_from_the_extracting_reader(self):
+        import PyPDF2
+        pdf = make_pdf(['Jane Doe', 'Python developer', 'Education: BSc'])
+        with patch('builder.file_handlers.PyPDF2.PdfReader', wraps=PyPDF2.PdfReader) as reader:
+            validate_and_extract(SimpleUploadedFile('cv.pdf', pdf), max_chars=10000)
+        self.assertEqual(ExtractionSample.objects.get().page_count, 3)
+        self.assertEqual(reader.call_count, 1)
+
+    def test_failures_are_recorded_with_their_outcome(self):
+        upload = SimpleUploadedFile('cv.docx', make_docx(['Jane Doe', 'Python developer']))
+        with patch('builder.document_cache.CVFileHandler.extract_text', side_effect=ExtractionTimeoutError('slow')):
+            with self.assertRaises(ExtractionTimeoutError):
+                validate_and_extract(upload, max_chars=10000)
+        self.assertEqual(ExtractionSample.objects.get().outcome, 'timeout')
+
+    @override_settings(EXTRACTION_TELEMETRY_ENABLED=False)
+    def test_telemetry_can_be_disabled(self):
+        validate_and_extract(SimpleUploadedFile('cv.pdf', make_pdf(['Jane Doe'])), max_chars=10000)
+        self.assertFalse(ExtractionSample.objects.exists())
+
+
+class ExtractionSummaryTest(TestCase):
+    def setUp(self):
+        for wall_ms in range(1, 21):
+            ExtractionSample.objects.create(mime_type=PDF_MIME, file_size=50 * 1024, wall_ms=wall_ms,
+                                            peak_rss_delta_kb=wall_ms * 10, chars=1000, page_count=2)
+        ExtractionSample.objects.create(mime_type=PDF_MIME, file_size=3 * 1024 * 1024, wall_ms=900,
+                                        outcome='timeout')
+        ExtractionSample.objects.create(mime_type=DOCX_MIME, file_size=20 * 1024, wall_ms=5, chars=800)
+
+    def test_percentiles_by_format_and_size(self):
+        summary = extraction_summary()
+        self.assertEqual(summary['samples'], 22)
+        pdf = summary['formats']['pdf']
+        self.assertEqual(list(pdf['by_size']), ['<100KB', '>2MB'])
+        small = pdf['by_size']['<100KB']
+        self.assertEqual((small['count'], small['wall_ms']['p50'], small['wall_ms']['p95']), (20, 10, 19))
+        self.assertEqual(small['peak_rss_delta_kb']['p99'], 200)
+        self.assertEqual(pdf['all']['outcomes'], {'ok': 20, 'timeout': 1})
+        self.assertEqual(summary['formats']['docx']['all']['count'], 1)
+
+    def test_staff_view_and_command(self):
+        User.objects.create_user(username='user', password='testpass123')
+        self.client.login(username='user', password='testpass123')
+        self.assertEqual(self.client.get(reverse('builder:extraction_stats')).status_code, 302)
+
+        User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.client.login(username='staff', password='testpass123')
+        response = self.client.get(reverse('builder:extraction_stats'), {'days': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['samples'], 22)
+
+        out = StringIO()
+        call_command('extraction_stats', stdout=out)
+        self.assertIn('pdf: 21 documents', out.getvalue())
+        self.assertIn('>2MB', out.getvalue())
+
+    def test_look_back_must_be_finite_and_bounded(self):
+        User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.client.login(username='staff', password='testpass123')
+        for days in ('inf', 'nan', '1e10', '0', '-1', 'week'):
+            response = self.client.get(reverse('builder:extraction_stats'), {'days': days})
+            self.assertEqual(response.status_code, 400, days)
+            self.assertIn('days must be', response.json()['error'])
+        self.assertEqual(self.client.get(reverse('builder:extraction_stats'), {'days': 3650}).status_code, 200)
+
+        with self.assertRaisesMessage(CommandError, 'days must be more than 0'):
+            call_command('extraction_stats', '--days', 'inf', stdout=StringIO())
@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.test import SimpleTestCase, override_settings
+from django.core.management import call_command
+from builder.extractors import ExtractorRegistry, ExtractorBackend, get_extractor_registry
+from builder.file_handlers import CVFileHandler, TextExtractionError, UnsupportedFileTypeError
+from documents import make_pdf, make_docx
+
+PDF = 'application/pdf'
+WORD = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+def _failing(source, max_chars):
+    raise TextExtractionError('broken')
+
+
+class ExtractorRegistryTest(SimpleTestCase):
+    def setUp(self):
+        self.registry = ExtractorRegistry()
+        self.registry.set_policy({})
+
+    def test_falls_back_on_failure_and_empty_output(self):
+        self.registry.register(ExtractorBackend('broken', (PDF,), _failing, priority=1))
+        self.registry.register(ExtractorBackend('empty', (PDF,), lambda source, max_chars: '', priority=2))
+        self.registry.register(ExtractorBackend('good', (PDF,), lambda source, max_chars: 'text', priority=3))
+        self.assertEqual(self.registry.extract(b'%PDF', PDF), 'text')
+
+    def test_raises_when_every_backend_fails(self):
+        self.registry.register(ExtractorBackend('broken', (PDF,), _failing))
+        with self.assertRaises(TextExtractionError):
+            self.registry.extract(b'%PDF', PDF)
+        with self.assertRaises(UnsupportedFileTypeError):
+            self.registry.extract(b'', 'text/plain')
+
+    def test_policy_order_overrides_priority(self):
+        self.registry.register(ExtractorBackend('slow', (PDF,), lambda source, max_chars: 'slow', priority=1))
+        self.registry.register(ExtractorBackend('fast', (PDF,), lambda source, max_chars: 'fast', priority=2))
+        self.assertEqual(self.registry.extract(b'', PDF), 'slow')
+        self.registry.set_policy({PDF: ['fast', 'missing-backend']})
+        self.assertEqual(self.registry.preferred(PDF), 'fast')
+        self.assertEqual([backend.name for backend in self.registry.backends_for(PDF)], ['fast'])
+
+    def test_builtin_backends_extract(self):
+        registry = get_extractor_registry()
+        self.assertEqual(registry.reference(PDF).name, 'pypdf2')
+        self.assertEqual(registry.extract(make_pdf(['Jane Doe']), PDF), 'Jane Doe')
+        self.assertEqual(CVFileHandler.extract_text_in_process(make_docx(['Skills']), WORD), 'Skills')
+
+    def test_docx_stream_is_not_tried_on_legacy_doc(self):
+        registry = get_extractor_registry()
+        self.assertEqual([backend.name for backend in registry.registered(WORD)], ['docx-stream', 'python-docx'])
+        self.assertEqual([backend.name for backend in registry.registered('application/msword')], ['python-docx'])
+
+
+class BenchmarkExtractorsCommandTest(SimpleTestCase):
+    def setUp(self):
+        self.corpus = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.corpus, ignore_errors=True)
+        for i in range(3):
+            with open(os.path.join(self.corpus, f'cv{i}.pdf'), 'wb') as f:
+                f.write(make_pdf([f'Candidate {i}', 'Python developer']))
+        with open(os.path.join(self.corpus, 'cv.docx'), 'wb') as f:
+            f.write(make_docx(['Candidate', 'Skills: SQL']))
+
+    def test_reports_and_writes_policy(self):
+        policy_file = os.path.join(self.corpus, 'policy.json')
+        registry = get_extractor_registry()
+        self.addCleanup(registry.set_policy, None)
+        out = StringIO()
+        with override_settings(EXTRACTOR_POLICY_FILE=policy_file):
+            call_command('benchmark_extractors', self.corpus, '--write-policy', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('application/pdf: 3 documents', output)
+        self.assertIn('pypdf2', output)
+        with open(policy_file) as f:
+            policy = json.load(f)
+        self.assertIn('pypdf2', policy[PDF])
+        self.assertEqual(set(policy[WORD]), {'docx-stream', 'python-docx'})
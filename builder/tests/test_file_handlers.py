@@ -3,7 +3,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth.models import User
 import tempfile
 import os
-from builder.file_handlers import CVFileHandler
+from builder.file_handlers import CVFileHandler, TextExtractionError
 from builder.models import UploadedCV
 
 
@@ -65,17 +65,17 @@ class CVFileHandlerTest(TestCase):
         self.assertTrue(os.path.exists(saved_path))
 
     def test_extract_text_from_pdf(self):
-        # Mock PDF content for testing
+        # Truncated PDF content: extraction failures are raised, not returned as text
         pdf_content = b'%PDF-1.4\n%Test PDF content\n(Hello World)'
-        text = self.handler.extract_text_from_pdf(pdf_content)
-        self.assertIsInstance(text, str)
+        with self.assertRaises(TextExtractionError):
+            self.handler.extract_text_from_pdf(pdf_content)
 
     def test_extract_text_from_docx(self):
         # This would need a proper DOCX file for testing
-        # For now, test the method exists and handles errors gracefully
+        # For now, test that a truncated file raises TextExtractionError
         docx_content = b'PK\x03\x04\x14\x00\x06\x00'
-        text = self.handler.extract_text_from_docx(docx_content)
-        self.assertIsInstance(text, str)
+        with self.assertRaises(TextExtractionError):
+            self.handler.extract_text_from_docx(docx_content)
 
 
 class UploadedCVIntegrationTest(TestCase):
@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from unittest.mock import patch
+from builder.file_validators import FileValidator, DOCX_MIME_TYPE
+from documents import make_pdf, make_docx
+
+
+class FileValidatorTest(SimpleTestCase):
+    def test_in_memory_upload_is_sniffed_from_header(self):
+        upload = SimpleUploadedFile('cv.pdf', make_pdf(['Jane Doe']))
+        with patch('builder.file_validators.magic.from_file') as from_file:
+            result = FileValidator.validate(upload)
+
+        from_file.assert_not_called()
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.mime_type, 'application/pdf')
+        self.assertEqual(result.extension, '.pdf')
+        self.assertEqual(result.size, upload.size)
+        self.assertEqual(upload.tell(), 0)
+
+    def test_docx_is_recognised(self):
+        result = FileValidator.validate(SimpleUploadedFile('cv.docx', make_docx(['Jane Doe'])))
+        self.assertEqual(result.mime_type, DOCX_MIME_TYPE)
+        self.assertTrue(result.extension_matches)
+
+    def test_zip_without_document_part_is_not_docx(self):
+        with patch('builder.file_validators.magic.from_buffer', return_value='application/zip'):
+            result = FileValidator.inspect(SimpleUploadedFile('cv.docx', b'PK\x03\x04 not really a zip'))
+        self.assertEqual(result.mime_type, 'application/zip')
+        self.assertFalse(result.is_valid)
+
+    def test_extension_mismatch(self):
+        result = FileValidator.inspect(SimpleUploadedFile('cv.docx', make_pdf(['Jane Doe'])))
+        self.assertFalse(result.extension_matches)
+        self.assertIn("doesn't match", result.errors[0])
+        with self.assertRaises(ValidationError):
+            result.raise_for_errors()
+
+    def test_size_limits_skip_sniffing(self):
+        with patch.object(FileValidator, 'sniff_mime_type') as sniff:
+            empty = FileValidator.inspect(SimpleUploadedFile('cv.pdf', b''))
+            with patch.object(FileValidator, 'MAX_FILE_SIZE', 10):
+                large = FileValidator.inspect(SimpleUploadedFile('cv.pdf', b'x' * 11))
+
+        sniff.assert_not_called()
+        self.assertIn('Empty file', empty.errors[0])
+        self.assertIn('maximum limit', large.errors[0])
+
+    def test_known_mime_type_is_not_sniffed_again(self):
+        with patch.object(FileValidator, 'sniff_mime_type') as sniff:
+            result = FileValidator.validate(SimpleUploadedFile('cv.pdf', b'%PDF'), mime_type='application/pdf')
+        sniff.assert_not_called()
+        self.assertTrue(result.is_valid)
+
+    def test_spooled_upload_is_sniffed_from_its_temp_file(self):
+        content = make_pdf(['Jane Doe'])
+        upload = TemporaryUploadedFile('cv.pdf', 'application/pdf', len(content), None)
+        upload.write(content)
+        upload.seek(0)
+        try:
+            with patch('builder.file_validators.magic.from_buffer') as from_buffer:
+                result = FileValidator.validate(upload)
+        finally:
+            upload.close()
+
+        from_buffer.assert_not_called()
+        self.assertEqual(result.mime_type, 'application/pdf')
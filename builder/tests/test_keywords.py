@@ -0,0 +1,40 @@
+from django.test import SimpleTestCase
+from builder.cv_analysis_service import CVAnalyzer
+from builder.keywords import KeywordMatcher, scan_keywords, words
+
+
+class KeywordMatcherTest(SimpleTestCase):
+    def test_matches_whole_words_only(self):
+        hits = scan_keywords('Project manager, misleading JavaScript demos in Rust')
+        self.assertNotIn('r', hits)
+        self.assertNotIn('lead', hits)
+        self.assertNotIn('java', hits)
+        self.assertIn('javascript', hits)
+        self.assertIn('manager', hits)
+
+    def test_punctuated_and_multi_word_keywords(self):
+        hits = scan_keywords('Head  of Platform: Node.js, CI/CD and machine\nlearning')
+        for keyword in ('head of', 'Node.js', 'ci/cd', 'Machine Learning'):
+            self.assertIn(keyword, hits)
+
+    def test_positions_and_counts(self):
+        matcher = KeywordMatcher(['data', 'data analysis', 'sql'])
+        hits = matcher.scan('Data analysis in SQL; more data, more SQL')
+        self.assertEqual(hits.positions['data'], [0, 5])
+        self.assertEqual(hits.positions['data analysis'], [0])
+        self.assertEqual(hits.counts(), {'data': 2, 'data analysis': 1, 'sql': 2})
+        self.assertEqual(hits.word_count, 8)
+        self.assertEqual(hits.matched(['sql', 'python', 'data']), ['sql', 'data'])
+
+    def test_non_ascii_punctuation_separates_words(self):
+        self.assertEqual(words('•Python—Django “AWS” café'), ['python', 'django', 'aws', 'café'])
+        self.assertIn('aws', scan_keywords('Skills: •AWS•Docker'))
+
+    def test_analyzer_scores_from_shared_hits(self):
+        analyzer = CVAnalyzer()
+        self.assertEqual(analyzer._determine_experience_level(scan_keywords('graduate trainee')), 'entry')
+        # "leadership" and "misleading" no longer count as "lead"
+        self.assertEqual(analyzer._determine_experience_level(scan_keywords('showed leadership')), 'mid')
+        self.assertEqual(analyzer._determine_experience_level(scan_keywords('engineering director')), 'senior')
+        hits = scan_keywords('python, machine learning, numpy and pandas')
+        self.assertAlmostEqual(analyzer._calculate_industry_match(hits, 'data_science'), 4 / 17 * 100)
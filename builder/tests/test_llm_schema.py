@@ -0,0 +1,94 @@
+import json
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock, patch
+from builder.ai_services import EnhancedAICoverLetterService
+from builder.model_router import ModelRouter
+from builder.llm_schema import CV_ANALYSIS_SCHEMA, CV_INSIGHTS_SCHEMA, parse_tolerant, repair_metrics
+
+
+class ParseTolerantTest(SimpleTestCase):
+    def test_fenced_json(self):
+        data, path = parse_tolerant('Here you go:\n```json\n{"skills": ["Python"]}\n```', ['skills'])
+        self.assertEqual(path, 'fenced')
+        self.assertEqual(data['skills'], ['Python'])
+
+    def test_truncated_json_is_salvaged(self):
+        content = '{"summary": "Backend developer", "skills": ["Python", "Django", "SQ'
+        data, path = parse_tolerant(content, ['summary', 'skills'])
+        self.assertEqual(path, 'salvaged')
+        self.assertEqual(data, {'summary': 'Backend developer', 'skills': ['Python', 'Django']})
+
+    def test_invalid_fields_are_reported_missing(self):
+        valid, missing = CV_ANALYSIS_SCHEMA.validate({'overall_score': '82%', 'ats_score': 'high'})
+        self.assertEqual(valid['overall_score'], 82)
+        self.assertIn('ats_score', missing)
+
+    def test_infinite_scores_are_invalid(self):
+        valid, missing = CV_ANALYSIS_SCHEMA.validate(
+            {'overall_score': 'inf', 'ats_score': 1e999, 'keyword_score': '1e999'}
+        )
+        self.assertEqual(valid, {})
+        self.assertEqual(missing[:3], ['overall_score', 'ats_score', 'keyword_score'])
+
+
+class CompleteJsonTest(SimpleTestCase):
+    def setUp(self):
+        self.service = EnhancedAICoverLetterService()
+        self.service.client = MagicMock()
+
+    def _respond_with(self, *contents):
+        self.service.client.chat.completions.create.side_effect = [
+            MagicMock(choices=[MagicMock(message=MagicMock(content=content))]) for content in contents
+        ]
+
+    def test_only_missing_fields_are_re_requested(self):
+        first = '{"skills": ["Python"], "experience": ["5 years"], "summary": "Dev"'
+        self._respond_with(first, json.dumps({'education': ['BSc'], 'achievements': ['Cut costs 20%']}))
+        before = repair_metrics().get('cv_insights', {}).get('field_repair', 0)
+
+        result = self.service.extract_cv_insights('Python developer CV')
+
+        self.assertEqual(result['skills'], ['Python'])
+        self.assertEqual(result['education'], ['BSc'])
+        self.assertEqual(result['achievements'], ['Cut costs 20%'])
+        repair_call = self.service.client.chat.completions.create.call_args_list[1]
+        repair_prompt = repair_call.kwargs['messages'][0]['content']
+        self.assertIn('- achievements:', repair_prompt)
+        self.assertNotIn('- skills:', repair_prompt)
+        self.assertEqual(repair_metrics()['cv_insights']['field_repair'], before + 1)
+
+    def test_fields_still_missing_after_repair_use_defaults(self):
+        self._respond_with('{"overall_score": 88}', 'not json at all')
+
+        result = self.service.analyze_cv_comprehensive('Python developer CV')
+
+        self.assertEqual(result['overall_score'], 88)
+        self.assertEqual(result['ats_score'], 75)
+        self.assertEqual(result['industry'], 'Not specified')
+        self.assertGreaterEqual(repair_metrics()['cv_analysis']['defaulted'], 1)
+
+    def test_analysis_has_every_schema_field(self):
+        self._respond_with('{"overall_score": "91.5", "skills": "Python; SQL"}', '{}')
+
+        result = self.service.analyze_cv_comprehensive('Python developer CV')
+
+        self.assertEqual(set(result), set(CV_ANALYSIS_SCHEMA.field_map))
+        self.assertEqual((result['overall_score'], result['skills']), (91, ['Python', 'SQL']))
+        self.assertEqual(result['strengths'], [])
+
+    def test_repairs_use_their_own_route(self):
+        router = ModelRouter()
+        self._respond_with('{"skills": ["Python"]}', '{}')
+
+        with patch('builder.ai_services.get_router', return_value=router):
+            self.service.extract_cv_insights('Python developer CV')
+
+        stats = router.stats()
+        self.assertEqual(stats['extract_cv_insights']['count'], 1)
+        self.assertEqual(stats['repair_json_fields']['count'], 1)
+
+    def test_insights_schema_fields_match_prompt(self):
+        self.assertEqual(
+            [field.name for field in CV_INSIGHTS_SCHEMA.fields],
+            ['skills', 'experience', 'education', 'achievements', 'summary']
+        )
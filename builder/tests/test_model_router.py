@@ -0,0 +1,58 @@
+from django.test import SimpleTestCase
+from builder.model_router import ModelRouter, percentile
+
+
+TIERS = [
+    {'name': 'fast', 'model': 'fast-model'},
+    {'name': 'standard', 'model': 'standard-model'},
+]
+
+ROUTES = {
+    'analyze': {
+        'slo_ms': 1000,
+        'rules': [
+            {'max_input_tokens': 100, 'tier': 'fast', 'max_tokens': 300},
+            {'tier': 'standard', 'max_tokens': 1200},
+        ],
+    },
+}
+
+
+class ModelRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = ModelRouter(tiers=TIERS, routes=ROUTES)
+
+    def test_short_input_goes_to_fast_tier(self):
+        decision = self.router.route('analyze', 'x' * 200)
+        self.assertEqual(decision.model, 'fast-model')
+        self.assertEqual(decision.max_tokens, 300)
+
+    def test_long_input_goes_to_standard_tier(self):
+        decision = self.router.route('analyze', 'x' * 2000)
+        self.assertEqual(decision.model, 'standard-model')
+        self.assertEqual(decision.max_tokens, 1200)
+
+    def test_unhealthy_model_falls_back_to_faster_tier(self):
+        decision = self.router.route('analyze', 'x' * 2000)
+        for _ in range(6):
+            self.router.record(decision, 50, ok=False)
+
+        fallback = self.router.route('analyze', 'x' * 2000)
+        self.assertEqual(fallback.model, 'fast-model')
+        self.assertIn('unhealthy', fallback.reason)
+
+    def test_slo_breach_steps_down_a_tier(self):
+        decision = self.router.route('analyze', 'x' * 2000)
+        for _ in range(10):
+            self.router.record(decision, 5000)
+
+        self.assertEqual(self.router.route('analyze', 'x' * 2000).model, 'fast-model')
+        self.assertEqual(self.router.stats()['analyze']['p95_ms'], 5000)
+
+    def test_unknown_route_uses_default(self):
+        decision = self.router.route('something_else', 'hello')
+        self.assertEqual(decision.tier, 'fast')
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 95), 0.0)
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
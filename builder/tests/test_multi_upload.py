@@ -0,0 +1,133 @@
+import io
+import json
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from unittest.mock import patch
+from builder.models import UploadedCV, CVAnalysis
+from builder.multi_upload import expand_uploads, process_uploads
+from documents import make_pdf, make_docx, make_zip_with_encrypted_member
+
+
+class ImmediateExecutor:
+    """Runs submitted jobs inline and returns completed futures"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@override_settings(EXTRACTION_POOL_ENABLED=False)
+@patch('builder.multi_upload.close_old_connections')
+@patch('builder.multi_upload._executor', ImmediateExecutor())
+@patch('builder.analysis_jobs._executor')
+class MultiUploadTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = Client()
+        self.client.login(username='testuser', password='testpass123')
+
+    def _files(self):
+        return [
+            SimpleUploadedFile('jane.pdf', make_pdf(['Jane Doe, Python developer'])),
+            SimpleUploadedFile('bundle.zip', make_zip({
+                'cvs/john.docx': make_docx(['John Smith', 'Skills: Django, SQL']),
+                'cvs/.DS_Store': b'junk',
+            })),
+            SimpleUploadedFile('notes.pdf', b'not a pdf at all'),
+        ]
+
+    def test_api_streams_a_result_per_file(self, _analysis_executor, _close):
+        response = self.client.post(reverse('uploadedcv-bulk-upload'), {'files': self._files()})
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        results = {line['filename']: line for line in lines[:-1]}
+        self.assertEqual(set(results), {'jane.pdf', 'john.docx', 'notes.pdf'})
+        self.assertEqual(results['jane.pdf']['status'], 'complete')
+        self.assertTrue(results['john.docx']['pending'])
+        self.assertIn('File validation failed', results['notes.pdf']['error'])
+        self.assertEqual(lines[-1], {'done': True, 'succeeded': 2, 'failed': 1})
+        self.assertEqual(UploadedCV.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(CVAnalysis.objects.filter(analysis_status='pending').count(), 2)
+
+    @override_settings(MULTI_UPLOAD_MAX_FILES=2)
+    def test_file_count_budget_includes_zip_members(self, _analysis_executor, _close):
+        response = self.client.post(reverse('uploadedcv-bulk-upload'), {'files': self._files()})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('at most 2 CVs', response.json()['error'])
+        self.assertFalse(UploadedCV.objects.exists())
+
+    @override_settings(MULTI_UPLOAD_MAX_TOTAL_SIZE=1000)
+    def test_zip_is_measured_by_declared_member_sizes(self, _analysis_executor, _close):
+        bomb = SimpleUploadedFile('bundle.zip', make_zip({'cv.pdf': b'%PDF' + b' ' * 100000}))
+        self.assertLess(bomb.size, 1000)
+        with self.assertRaisesMessage(ValidationError, 'combined limit'):
+            expand_uploads([bomb])
+
+    def test_unreadable_zip_member_is_rejected(self, _analysis_executor, _close):
+        cv = make_pdf(['Jane Doe, Python developer'])
+        bundle = SimpleUploadedFile('bundle.zip', make_zip_with_encrypted_member('jane.pdf', 'secret.pdf', cv))
+        with self.assertRaisesMessage(ValidationError, 'secret.pdf in bundle.zip is password-protected or damaged'):
+            expand_uploads([bundle])
+
+        bundle.seek(0)
+        response = self.client.post(reverse('uploadedcv-bulk-upload'), {'files': [bundle]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password-protected or damaged', response.json()['error'])
+        self.assertFalse(UploadedCV.objects.exists())
+
+    def test_html_view_lists_results(self, _analysis_executor, _close):
+        response = self.client.post(reverse('builder:upload_cvs'), {'files': self._files()})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(result['filename'] for result in response.context['results']),
+                         ['jane.pdf', 'john.docx', 'notes.pdf'])
+        self.assertContains(response, 'john.docx')
+
+
+class ProcessUploadsOrderTest(TestCase):
+    def test_results_are_yielded_as_files_finish(self):
+        slow_may_finish = threading.Event()
+
+        def extract(uploaded_file):
+            if uploaded_file.name == 'slow.pdf':
+                slow_may_finish.wait(5)
+            return uploaded_file.name
+
+        files = [SimpleUploadedFile('slow.pdf', b'a'), SimpleUploadedFile('fast.pdf', b'b')]
+        with patch('builder.multi_upload._executor', ThreadPoolExecutor(max_workers=2)), \
+                patch('builder.multi_upload._extract', side_effect=extract), \
+                patch('builder.multi_upload._store', side_effect=lambda user, f, name: {'filename': name}):
+            results = process_uploads(self, files)
+            first = next(results)
+            slow_may_finish.set()
+            rest = list(results)
+
+        self.assertEqual(first['filename'], 'fast.pdf')
+        self.assertEqual(rest, [{'filename': 'slow.pdf'}])
@@ -0,0 +1,158 @@
+import shutil
+import tempfile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from unittest.mock import patch
+from builder.analysis_jobs import start_analysis, get_job
+from builder.models import UploadedCV, CVAnalysis, CVFingerprintBand
+from builder.near_duplicates import index_upload, find_near_duplicates
+from builder.simhash import simhash, hamming_distance, bands, BANDS
+
+
+class ImmediateExecutor:
+    """Runs submitted jobs inline and records what was submitted"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(fn.__name__)
+        fn(*args, **kwargs)
+
+
+CV_TEXT = (
+    "Jane Doe - jane@example.com - +44 7700 900123\n"
+    "Summary: Backend engineer who enjoys turning messy requirements into reliable services.\n"
+    "Experience: Senior Python developer at Acme Payments since 2019, building Django REST "
+    "services that settle card transactions for retailers across Europe. Led a team of five "
+    "engineers, introduced contract testing, and cut deployment time from hours to minutes. "
+    "Previously a software engineer at Northwind Logistics writing route planning tools.\n"
+    "Education: BSc Computer Science, University of Leeds.\n"
+    "Skills: Python, Django, PostgreSQL, Docker, Kubernetes, AWS, mentoring, communication."
+)
+EDITED_CV_TEXT = CV_TEXT.replace('+44 7700 900123', '+44 7700 900456').replace('five', 'six')
+OTHER_CV_TEXT = (
+    "John Smith - john@example.com\n"
+    "Marketing manager with ten years in retail brand strategy, campaign planning, budgets "
+    "and vendor negotiation across European and Asian markets. Launched three private label "
+    "ranges and grew online revenue by a third. MBA from London Business School, fluent in "
+    "French and Spanish, comfortable presenting to boards and running agency pitches."
+)
+
+
+class SimHashTest(SimpleTestCase):
+    def test_contact_details_do_not_change_the_fingerprint(self):
+        phone_changed = CV_TEXT.replace('+44 7700 900123', '0161 496 0000').replace('jane@', 'j.doe@')
+        self.assertEqual(simhash(CV_TEXT), simhash(phone_changed))
+
+    def test_small_edit_stays_close_and_unrelated_text_does_not(self):
+        self.assertLessEqual(hamming_distance(simhash(CV_TEXT), simhash(EDITED_CV_TEXT)), 6)
+        self.assertGreater(hamming_distance(simhash(CV_TEXT), simhash(OTHER_CV_TEXT)), 12)
+
+    def test_short_text_has_no_fingerprint(self):
+        self.assertIsNone(simhash('Jane Doe, Python developer'))
+
+    def test_bands_cover_the_whole_fingerprint(self):
+        fingerprint = simhash(CV_TEXT)
+        parts = bands(fingerprint)
+        self.assertEqual(len(parts), BANDS)
+        rebuilt = sum(part << (band * 64 // BANDS) for band, part in enumerate(parts))
+        self.assertEqual(rebuilt, fingerprint & (2 ** 64 - 1))
+
+
+@override_settings(EXTRACTION_POOL_ENABLED=False, OPENAI_API_KEY='')
+@patch('builder.analysis_jobs.close_old_connections')
+class NearDuplicateReuseTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def _upload(self, text, user=None, name='cv.pdf'):
+        return UploadedCV.objects.create(
+            user=user or self.user, file=SimpleUploadedFile(name, b'%PDF-1.4'),
+            original_filename=name, extracted_text=text, processed=True
+        )
+
+    def _analyse(self, uploaded_cv, executor):
+        cv_analysis = CVAnalysis.objects.create(uploaded_cv=uploaded_cv, analysis_status='pending')
+        with patch('builder.analysis_jobs._executor', executor):
+            analysis = start_analysis(uploaded_cv.extracted_text, self.user.id, cv_analysis_id=cv_analysis.pk)
+        uploaded_cv.refresh_from_db()
+        return analysis
+
+    def test_index_is_per_user(self, _):
+        mine = self._upload(CV_TEXT)
+        other_user = User.objects.create_user(username='other', password='testpass123')
+        theirs = self._upload(CV_TEXT, user=other_user)
+        unrelated = self._upload(OTHER_CV_TEXT)
+        for uploaded_cv in (mine, theirs, unrelated):
+            index_upload(uploaded_cv)
+
+        self.assertEqual(CVFingerprintBand.objects.filter(uploaded_cv=mine).count(), BANDS)
+        matches = find_near_duplicates(self.user.id, simhash(EDITED_CV_TEXT))
+        self.assertEqual([candidate for candidate, _ in matches], [mine])
+        self.assertGreater(matches[0][1], 0.9)
+
+    def test_edited_upload_reuses_adjusted_analysis(self, _):
+        executor = ImmediateExecutor()
+        original = self._upload(CV_TEXT)
+        first = self._analyse(original, executor)
+        self.assertEqual(executor.submitted, ['_run_llm_analysis'])
+        self.assertTrue(first['pending'])
+        original_analysis = get_job(first['job_id'])['analysis']
+
+        edited = self._upload(EDITED_CV_TEXT, name='cv-v2.pdf')
+        second = self._analyse(edited, executor)
+
+        self.assertEqual(executor.submitted, ['_run_llm_analysis'])  # no second LLM pass
+        self.assertFalse(second['pending'])
+        self.assertEqual(get_job(second['job_id'])['status'], 'complete')
+        self.assertEqual(second['strengths'], original_analysis['strengths'])
+        self.assertEqual(edited.near_duplicate_of, original)
+        self.assertGreater(edited.near_duplicate_similarity, 0.9)
+        self.assertEqual(edited.cvanalysis.analysis_status, 'complete')
+
+        # A third version is matched against the fully analysed original
+        third = self._upload(EDITED_CV_TEXT.replace('Leeds', 'York'), name='cv-v3.pdf')
+        self._analyse(third, executor)
+        self.assertEqual(third.near_duplicate_of, original)
+
+    def test_unrelated_upload_gets_a_fresh_analysis(self, _):
+        executor = ImmediateExecutor()
+        self._analyse(self._upload(CV_TEXT), executor)
+        other = self._upload(OTHER_CV_TEXT)
+        self.assertTrue(self._analyse(other, executor)['pending'])
+        self.assertEqual(executor.submitted, ['_run_llm_analysis', '_run_llm_analysis'])
+        self.assertIsNone(other.near_duplicate_of)
+
+    @override_settings(NEAR_DUPLICATE_REUSE=False)
+    def test_reuse_can_be_disabled(self, _):
+        executor = ImmediateExecutor()
+        self._analyse(self._upload(CV_TEXT), executor)
+        edited = self._upload(EDITED_CV_TEXT)
+        self.assertTrue(self._analyse(edited, executor)['pending'])
+        self.assertIsNotNone(edited.simhash)
+        self.assertIsNone(edited.near_duplicate_of)
+
+    def test_api_lists_near_duplicates(self, _):
+        executor = ImmediateExecutor()
+        original = self._upload(CV_TEXT)
+        self._analyse(original, executor)
+        edited = self._upload(EDITED_CV_TEXT, name='cv-v2.pdf')
+        self._analyse(edited, executor)
+        self._analyse(self._upload(OTHER_CV_TEXT), executor)
+
+        response = self.client.get(reverse('uploadedcv-near-duplicates', args=[original.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.json()], [str(edited.pk)])
+        self.assertTrue(response.json()[0]['reused_this_analysis'])
+
+        detail = self.client.get(reverse('uploadedcv-detail', args=[edited.pk])).json()
+        self.assertEqual(detail['near_duplicate_of'], str(original.pk))
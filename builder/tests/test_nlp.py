@@ -0,0 +1,59 @@
+import threading
+import time
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch
+from builder import nlp
+
+
+class SlowLoader:
+    """Stands in for spacy.load; slow enough for concurrent first calls to overlap"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def __call__(self, name):
+        self.calls.append(name)
+        if self.error:
+            raise self.error
+        time.sleep(0.05)
+        return object()
+
+
+class SharedPipelineTest(SimpleTestCase):
+    def setUp(self):
+        self.loader = SlowLoader()
+        for patcher in (patch.object(nlp, '_nlp', None), patch.object(nlp, '_load_model', self.loader)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @override_settings(SPACY_MODEL='en_core_web_md')
+    def test_loaded_once_and_shared_across_threads(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(nlp.get_nlp())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loader.calls, ['en_core_web_md'])
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertIs(nlp.get_nlp(), results[0])
+
+    @patch('builder.nlp.gc.freeze')
+    def test_preload_loads_and_freezes(self, freeze):
+        self.assertTrue(nlp.preload_nlp())
+        self.assertEqual(len(self.loader.calls), 1)
+        freeze.assert_called_once()
+
+    @patch('builder.nlp.gc.freeze')
+    def test_missing_model_does_not_stop_start_up(self, freeze):
+        self.loader.error = OSError("Can't find model 'en_core_web_sm'")
+        with self.assertLogs('builder.nlp', 'WARNING'):
+            self.assertFalse(nlp.preload_nlp())
+        freeze.assert_not_called()
+
+    @override_settings(SPACY_PRELOAD=False)
+    def test_preload_can_be_disabled(self):
+        self.assertFalse(nlp.preload_nlp())
+        self.assertEqual(self.loader.calls, [])
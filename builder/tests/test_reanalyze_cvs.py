@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from unittest.mock import patch
+from builder import nlp
+from builder.cv_analysis_service import CVAnalyzer
+from builder.cv_sections import CVSections, SEGMENTER_VERSION
+from builder.models import UploadedCV, CVAnalysis
+
+ORGANISATIONS = ('acme', 'northwind')
+
+
+class Entity:
+    def __init__(self, text):
+        self.text = text
+        self.label_ = 'ORG'
+
+
+class KeywordPipeline:
+    """Tags known organisation names; records how texts arrive"""
+
+    def __init__(self):
+        self.single_calls = 0
+        self.piped = []
+
+    def _doc(self, text):
+        doc = type('Doc', (), {})()
+        doc.ents = [Entity(word) for word in text.split() if word in ORGANISATIONS]
+        return doc
+
+    def __call__(self, text):
+        self.single_calls += 1
+        return self._doc(text)
+
+    def pipe(self, texts, as_tuples=False, batch_size=1000, n_process=1):
+        self.piped.append((batch_size, n_process))
+        for text, context in texts:
+            yield self._doc(text), context
+
+
+class ReanalyzeCVsTest(TestCase):
+    def setUp(self):
+        self.pipeline = KeywordPipeline()
+        for patcher in (patch.object(nlp, '_nlp', None), patch.object(nlp, '_load_model', lambda name: self.pipeline)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=os.path.join(root, 'media'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Passed explicitly; the default is relative to the working directory
+        self.checkpoint = os.path.join(root, 'checkpoint.json')
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.cvs = sorted(
+            (self._upload(f'Senior developer at Acme number {i}. Developed and managed services.')
+             for i in range(5)),
+            key=lambda cv: cv.pk
+        )
+        self._upload('')  # nothing to analyse
+        CVAnalysis.objects.create(
+            uploaded_cv=self.cvs[0], overall_score=10, strengths=['Clear writing'], analysis_status='complete'
+        )
+        # Local scores written at upload, waiting for the LLM
+        CVAnalysis.objects.create(
+            uploaded_cv=self.cvs[1], overall_score=40, ats_compatibility=62, analysis_status='pending',
+            keywords={'present': [], 'missing': ['kubernetes']}, strengths=['Clear writing']
+        )
+
+    def _upload(self, text):
+        return UploadedCV.objects.create(
+            user=self.user, file=SimpleUploadedFile('cv.pdf', b'%PDF-1.4'),
+            original_filename='cv.pdf', extracted_text=text
+        )
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command('reanalyze_cvs', '--checkpoint', self.checkpoint, '--batch-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_backfill_updates_and_creates_analyses(self):
+        output = self._run('--nlp-batch-size', '8', '--processes', '2')
+
+        self.assertIn('Re-analysed 4 CVs (3 new analyses)', output)
+        self.assertIn('docs/s', output)
+        self.assertEqual(self.pipeline.piped, [(8, 2)])
+        self.assertEqual(self.pipeline.single_calls, 0)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+        # The LLM's analysis is not touched
+        completed = CVAnalysis.objects.get(uploaded_cv=self.cvs[0])
+        self.assertEqual((completed.overall_score, completed.analysis_status), (10, 'complete'))
+
+        pending = CVAnalysis.objects.get(uploaded_cv=self.cvs[1])
+        self.assertNotEqual(pending.overall_score, 40)
+        self.assertEqual(pending.experience_level, 'Mid Level')
+        # Only the rule-based scores are rewritten; no job description, so ATS and missing keywords stay
+        self.assertEqual(pending.keywords, {'present': ['acme'], 'missing': ['kubernetes']})
+        self.assertEqual((pending.ats_compatibility, pending.strengths), (62, ['Clear writing']))
+
+        created = CVAnalysis.objects.filter(uploaded_cv__in=self.cvs[2:])
+        self.assertEqual(created.count(), 3)
+        self.assertEqual(set(created.values_list('analysis_status', flat=True)), {'pending'})
+        self.assertEqual(created[0].keywords, {'present': ['acme'], 'missing': []})
+
+    def test_job_description_rewrites_ats_and_missing_keywords(self):
+        path = os.path.join(os.path.dirname(self.checkpoint), 'job.txt')
+        with open(path, 'w') as f:
+            f.write('Senior developer at northwind')
+
+        self._run('--job-description', path)
+
+        pending = CVAnalysis.objects.get(uploaded_cv=self.cvs[1])
+        expected = CVAnalyzer().analyze_cv(self.cvs[1].extracted_text, 'Senior developer at northwind')
+        self.assertEqual(pending.ats_compatibility, round(expected.ats_score))
+        self.assertEqual(pending.keywords, {'present': ['acme'], 'missing': ['northwind']})
+
+    def test_resumes_after_the_checkpointed_key(self):
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'last_pk': str(self.cvs[2].pk), 'processed': 3}, f)
+
+        output = self._run()
+
+        self.assertIn('Resuming after', output)
+        self.assertIn('Re-analysed 2 CVs', output)
+        self.assertEqual(CVAnalysis.objects.get(uploaded_cv=self.cvs[1]).overall_score, 40)
+        self.assertEqual(
+            set(CVAnalysis.objects.values_list('uploaded_cv_id', flat=True)),
+            {self.cvs[0].pk, self.cvs[1].pk, self.cvs[3].pk, self.cvs[4].pk}
+        )
+
+    def test_piped_results_match_single_analysis(self):
+        analyzer = CVAnalyzer()
+        text = self.cvs[1].extracted_text
+        [(piped, context)] = list(analyzer.analyze_many([(text, None, 'ctx')]))
+        self.assertEqual(context, 'ctx')
+        self.assertEqual(piped, analyzer.analyze_cv(text))
+
+    def test_stored_sections_are_used(self):
+        sections = {'version': SEGMENTER_VERSION, 'sections': {'experience': [[0, 0, 20]]}}
+        with patch('builder.cv_analysis_service.CVSections', wraps=CVSections) as cv_sections:
+            list(CVAnalyzer().analyze_many([(self.cvs[1].extracted_text, sections, None)]))
+        cv_sections.assert_called_once_with(self.cvs[1].extracted_text, sections)
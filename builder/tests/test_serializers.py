@@ -0,0 +1,10 @@
+from django.test import SimpleTestCase
+from builder.serializers import UploadedCVSerializer
+
+
+class UploadedCVSerializerTest(SimpleTestCase):
+    def test_server_managed_fields_are_read_only(self):
+        fields = UploadedCVSerializer().fields
+        for name in ('processing_state', 'processing_error', 'content_hash', 'sections'):
+            self.assertTrue(fields[name].read_only, name)
+        self.assertFalse(fields['original_filename'].read_only)
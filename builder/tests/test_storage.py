@@ -0,0 +1,101 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from builder.models import UploadedCV, StoredBlob
+from builder.storage import get_cv_storage
+
+CV_BYTES = b'%PDF-1.4 identical cv bytes'
+CV_HASH = hashlib.sha256(CV_BYTES).hexdigest()
+BLOB_NAME = f"uploaded_cvs/{CV_HASH[:2]}/{CV_HASH[2:4]}/{CV_HASH}.pdf"
+
+
+class ContentAddressedStorageTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.storage = get_cv_storage()
+        self.user = User.objects.create_user(username='tester', password='testpass123')
+
+    def _upload(self, name='cv.pdf', content=CV_BYTES):
+        uploaded_cv = UploadedCV(user=self.user, original_filename=name)
+        uploaded_cv.file.save(name, ContentFile(content), save=True)
+        return uploaded_cv
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self._upload('cv.pdf')
+        second = self._upload('renamed.PDF')
+
+        self.assertEqual(first.file.name, BLOB_NAME)
+        self.assertEqual(second.file.name, BLOB_NAME)
+        self.assertEqual(StoredBlob.objects.get(name=BLOB_NAME).ref_count, 2)
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(BLOB_NAME))), [f"{CV_HASH}.pdf"])
+        with first.file.open('rb') as f:
+            self.assertEqual(f.read(), CV_BYTES)
+
+    def test_precomputed_hash_is_trusted(self):
+        content = ContentFile(CV_BYTES)
+        content.content_hash = CV_HASH
+        name = self.storage.save('uploaded_cvs/cv.pdf', content)
+        self.assertEqual(name, BLOB_NAME)
+        self.assertTrue(self.storage.exists(BLOB_NAME))
+
+    def test_last_reference_deletes_blob_and_shards(self):
+        first = self._upload()
+        second = self._upload()
+
+        first.file.delete(save=False)
+        self.assertTrue(self.storage.exists(BLOB_NAME))
+        self.assertEqual(StoredBlob.objects.get(name=BLOB_NAME).ref_count, 1)
+
+        second.file.delete(save=False)
+        self.assertFalse(self.storage.exists(BLOB_NAME))
+        self.assertFalse(StoredBlob.objects.filter(name=BLOB_NAME).exists())
+        self.assertEqual(os.listdir(self.storage.path('uploaded_cvs')), [])
+
+    def test_different_content_gets_different_blob(self):
+        first = self._upload(content=CV_BYTES)
+        second = self._upload(content=b'%PDF-1.4 another cv')
+        self.assertNotEqual(first.file.name, second.file.name)
+        self.assertEqual(StoredBlob.objects.count(), 2)
+
+    def test_deleting_rows_releases_references(self):
+        first = self._upload()
+        self._upload()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(StoredBlob.objects.get(name=BLOB_NAME).ref_count, 1)
+
+        # Cascades release their references too
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertFalse(self.storage.exists(BLOB_NAME))
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_gc_command_reconciles_lost_references(self):
+        kept = self._upload()
+        orphan = self._upload(content=b'%PDF-1.4 deleted with its user')
+        orphan_name = orphan.file.name
+        # The release runs on commit, which the test transaction never reaches,
+        # as if the process died between the delete and its commit hook
+        UploadedCV.objects.filter(pk=orphan.pk).delete()
+
+        out = StringIO()
+        call_command('gc_cv_blobs', '--dry-run', stdout=out)
+        self.assertTrue(self.storage.exists(orphan_name))
+        self.assertIn('would remove 1 blobs', out.getvalue())
+
+        call_command('gc_cv_blobs', stdout=StringIO())
+        self.assertFalse(self.storage.exists(orphan_name))
+        self.assertFalse(StoredBlob.objects.filter(name=orphan_name).exists())
+        self.assertTrue(self.storage.exists(kept.file.name))
+        self.assertEqual(StoredBlob.objects.get(name=kept.file.name).ref_count, 1)
@@ -0,0 +1,52 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from builder.file_handlers import CVTextProcessor, CVTextScan
+from builder.management.commands.benchmark_text_processor import SAMPLE_CV, legacy_clean_text
+
+CV_TEXT = (
+    "Jane Doe\n"
+    "jane.doe@example.com  |  +1 (555) 123-4567\n"
+    "LinkedIn.com/in/JaneDoe • https://github.com/janedoe • https://www.janedoe.dev.\n\n"
+    "Senior engineer: Python, JavaScript, PostgreSQL and Machine\nLearning on AWS & Docker."
+)
+
+
+class CVTextScanTest(SimpleTestCase):
+    def test_scan_returns_every_field(self):
+        scan = CVTextProcessor.scan(CV_TEXT)
+        self.assertIsInstance(scan, CVTextScan)
+        self.assertEqual(scan.email, 'jane.doe@example.com')
+        self.assertEqual(scan.phone, '+1 (555) 123-4567')
+        self.assertEqual(scan.linkedin, 'LinkedIn.com/in/JaneDoe')
+        self.assertEqual(scan.github, 'https://github.com/janedoe')
+        self.assertEqual(scan.portfolio, 'https://www.janedoe.dev')
+        self.assertEqual(len(scan.urls), 3)
+        self.assertEqual(scan.skills, ['Python', 'JavaScript', 'AWS', 'Docker', 'Machine Learning'])
+
+    def test_skills_match_whole_words_only(self):
+        skills = CVTextProcessor.extract_skills('JavaScript, PostgreSQL, GitHub and digital agility')
+        self.assertEqual(skills, ['JavaScript'])
+        self.assertEqual(CVTextProcessor.extract_skills('Go and Rust', ['Go', 'Rust', 'C']), ['Go', 'Rust'])
+
+    def test_scan_and_extract_skills_agree(self):
+        for text in ('Machine-Learning and node js', CV_TEXT, SAMPLE_CV):
+            self.assertEqual(CVTextProcessor.scan(text).skills, CVTextProcessor.extract_skills(text))
+        self.assertEqual(CVTextProcessor.scan('Machine-Learning and node js').skills,
+                         ['Node.js', 'Machine Learning'])
+        self.assertEqual(CVTextProcessor.scan('Go, Rust', skills=['Go', 'C']).skills, ['Go'])
+
+    def test_normalised_text_matches_clean_text(self):
+        for text in (CV_TEXT, SAMPLE_CV, 'plain ascii - text; with: punctuation!'):
+            self.assertEqual(CVTextProcessor.scan(text).text, legacy_clean_text(text))
+            self.assertEqual(CVTextProcessor.clean_text(text), legacy_clean_text(text))
+
+    def test_empty_text(self):
+        scan = CVTextProcessor.scan('')
+        self.assertEqual((scan.text, scan.email, scan.urls, scan.skills), ('', None, [], []))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_text_processor', '--number', '1', '--repeat', '1', stdout=out)
+        self.assertIn('Overall speedup', out.getvalue())
+        self.assertIn('skills no longer matched: Java', out.getvalue())
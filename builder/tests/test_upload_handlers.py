@@ -0,0 +1,96 @@
+import hashlib
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from unittest.mock import patch
+from builder.file_validators import FileValidator, HEADER_BYTES
+from builder.upload_handlers import CVUploadHandler, cv_upload_view, upload_error
+from documents import make_pdf
+
+CV_PDF = make_pdf(['Jane Doe', 'Python developer with 5 years experience'])
+
+
+class CVUploadHandlerTest(SimpleTestCase):
+    def _request(self, content, name='cv.pdf'):
+        request = RequestFactory().post('/upload/', {'title': 'CV', 'file': SimpleUploadedFile(name, content)})
+        request.upload_handlers = [CVUploadHandler(request)]
+        return request
+
+    def test_upload_is_hashed_and_spooled_while_streaming(self):
+        content = CV_PDF + b'%' + b'x' * 200000  # several parser chunks
+        request = self._request(content)
+        uploaded_file = request.FILES['file']
+
+        self.assertIsInstance(uploaded_file, TemporaryUploadedFile)
+        self.assertEqual(uploaded_file.content_hash, hashlib.sha256(content).hexdigest())
+        self.assertEqual(uploaded_file.header, content[:HEADER_BYTES])
+        self.assertEqual(uploaded_file.size, len(content))
+        self.assertEqual(request.POST['title'], 'CV')
+        uploaded_file.close()
+
+    def test_validator_sniffs_the_captured_header(self):
+        uploaded_file = self._request(CV_PDF).FILES['file']
+        with patch('builder.file_validators.magic.from_file') as from_file:
+            result = FileValidator.validate(uploaded_file)
+        from_file.assert_not_called()
+        self.assertEqual(result.mime_type, 'application/pdf')
+        uploaded_file.close()
+
+    def test_oversized_upload_is_aborted(self):
+        request = self._request(b'x' * 300000)
+        with patch.object(CVUploadHandler, 'max_file_size', 100000), \
+                patch.object(CVUploadHandler, 'receive_data_chunk', autospec=True,
+                             side_effect=CVUploadHandler.receive_data_chunk) as receive:
+            files = request.FILES
+
+        self.assertNotIn('file', files)
+        self.assertIn('maximum limit', upload_error(request, 'file'))
+        # Stopped at the chunk that crossed the limit, not at the end of the file
+        self.assertLess(receive.call_count, 300000 // CVUploadHandler.chunk_size)
+
+    def test_no_error_for_accepted_upload(self):
+        request = self._request(CV_PDF)
+        request.FILES['file'].close()
+        self.assertIsNone(upload_error(request, 'file'))
+
+    def test_combined_size_limit_across_files(self):
+        request = RequestFactory().post('/upload/', {
+            'files': [SimpleUploadedFile('a.pdf', b'x' * 80000), SimpleUploadedFile('b.pdf', b'x' * 80000)]
+        })
+        with override_settings(MULTI_UPLOAD_MAX_TOTAL_SIZE=100000):
+            request.upload_handlers = [CVUploadHandler(request)]
+            files = request.FILES
+
+        self.assertEqual(len(files.getlist('files')), 1)
+        self.assertIn('combined limit', upload_error(request, 'files'))
+
+
+@cv_upload_view
+def _upload_view(request):
+    return HttpResponse(type(request.FILES['file']).__name__ + ' ' + getattr(request.FILES['file'], 'content_hash', ''))
+
+
+class CVUploadViewTest(SimpleTestCase):
+    def _request(self, token=None):
+        data = {'file': SimpleUploadedFile('cv.pdf', CV_PDF)}
+        if token:
+            data['csrfmiddlewaretoken'] = token
+        request = RequestFactory().post('/upload/', data)
+        request._dont_enforce_csrf_checks = False
+        return request
+
+    def test_only_decorated_views_use_the_cv_handler(self):
+        request = RequestFactory().post('/templates/', {'file': SimpleUploadedFile('preview.png', b'x')})
+        self.assertFalse(any(isinstance(handler, CVUploadHandler) for handler in request.upload_handlers))
+
+        token = get_token(RequestFactory().get('/'))
+        request = self._request(token)
+        request.COOKIES['csrftoken'] = token
+        response = _upload_view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), f'TemporaryUploadedFile {hashlib.sha256(CV_PDF).hexdigest()}')
+
+    def test_csrf_is_still_checked(self):
+        response = _upload_view(self._request())
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,127 @@
+import tempfile
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from unittest.mock import patch
+from builder.document_cache import validate_and_extract, store_analysis
+from builder.models import UploadedCV, CVAnalysis
+from documents import make_pdf
+
+CV_PDF = make_pdf(['Jane Doe', 'Python developer with 5 years experience'])
+
+
+class ImmediateExecutor:
+    """Runs submitted jobs inline so tests can assert on the final state"""
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+class DeferredExecutor:
+    """Holds submitted jobs until run() so the queued state can be observed"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.jobs.append((fn, args, kwargs))
+
+    def run(self):
+        for fn, args, kwargs in self.jobs:
+            fn(*args, **kwargs)
+        self.jobs = []
+
+
+@override_settings(EXTRACTION_POOL_ENABLED=False, MEDIA_ROOT=tempfile.mkdtemp(), OPENAI_API_KEY='')
+@patch('builder.analysis_jobs.close_old_connections')
+class UploadProcessingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def _post(self, name='cv.pdf', content=CV_PDF):
+        return self.client.post(reverse('builder:upload_cv'), {
+            'title': 'My CV',
+            'file': SimpleUploadedFile(name, content, content_type='application/pdf'),
+        })
+
+    def _status(self, uploaded_cv):
+        return self.client.get(reverse('builder:upload_status', args=[uploaded_cv.pk])).json()
+
+    def test_post_queues_and_redirects(self, _):
+        executor = DeferredExecutor()
+        with patch('builder.analysis_jobs._executor', executor):
+            response = self._post()
+
+            uploaded_cv = UploadedCV.objects.get()
+            self.assertRedirects(
+                response, f"{reverse('builder:upload_cv')}?uploaded_cv={uploaded_cv.pk}",
+                fetch_redirect_response=False
+            )
+            self.assertEqual(uploaded_cv.processing_state, 'queued')
+            self.assertEqual(uploaded_cv.extracted_text, '')
+            self.assertEqual(self._status(uploaded_cv), {
+                'state': 'queued', 'label': 'Queued', 'error': '', 'job_id': None
+            })
+
+            executor.run()   # extraction, which queues the analysis job
+            executor.run()   # the analysis job itself
+
+        uploaded_cv.refresh_from_db()
+        self.assertEqual(uploaded_cv.processing_state, 'done')
+        self.assertIn('Python developer', uploaded_cv.extracted_text)
+        self.assertTrue(uploaded_cv.processed)
+        self.assertEqual(uploaded_cv.cvanalysis.analysis_status, 'complete')
+
+        status = self._status(uploaded_cv)
+        self.assertEqual(status['state'], 'done')
+        self.assertTrue(status['job_id'])
+
+        page = self.client.get(response.url)
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual(page.context['cv_analysis'], uploaded_cv.cvanalysis)
+        self.assertIn('overall_score', page.context['analysis'])
+
+    def test_cached_analysis_finishes_without_llm(self, _):
+        extraction = validate_and_extract(SimpleUploadedFile('cv.pdf', CV_PDF), max_chars=3000)
+        store_analysis(extraction.content_hash, {'overall_score': 81, 'ats_score': 77})
+
+        with patch('builder.analysis_jobs._executor', ImmediateExecutor()), \
+                patch('builder.analysis_jobs.start_analysis') as start:
+            self._post()
+
+        start.assert_not_called()
+        uploaded_cv = UploadedCV.objects.get()
+        self.assertEqual(uploaded_cv.processing_state, 'done')
+        self.assertEqual(uploaded_cv.cvanalysis.overall_score, 81)
+        self.assertTrue(self._status(uploaded_cv)['job_id'])
+
+    def test_failed_extraction_is_reported(self, _):
+        with patch('builder.analysis_jobs._executor', ImmediateExecutor()), \
+                patch('builder.analysis_jobs.validate_and_extract', side_effect=RuntimeError('boom')):
+            response = self._post()
+
+        uploaded_cv = UploadedCV.objects.get()
+        self.assertEqual(uploaded_cv.processing_state, 'failed')
+        self.assertFalse(CVAnalysis.objects.exists())
+        self.assertEqual(self._status(uploaded_cv)['error'], 'Upload failed. Please try again.')
+
+        page = self.client.get(response.url)
+        self.assertNotIn('analysis', page.context)
+        self.assertContains(page, 'Upload failed. Please try again.')
+
+    def test_invalid_file_is_rejected_before_storing(self, _):
+        with patch('builder.analysis_jobs._executor', ImmediateExecutor()):
+            response = self._post(name='cv.txt', content=b'\x00\x01binary')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(UploadedCV.objects.exists())
+
+    def test_status_is_private(self, _):
+        other = User.objects.create_user(username='other', password='testpass123')
+        uploaded_cv = UploadedCV.objects.create(
+            user=other, file=SimpleUploadedFile('cv.pdf', CV_PDF), processing_state='queued'
+        )
+        response = self.client.get(reverse('builder:upload_status', args=[uploaded_cv.pk]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,101 @@
+"""
+Upload handler that does the per-byte work while the upload streams in.
+
+Each chunk is hashed (SHA-256), the first HEADER_BYTES are kept for MIME
+sniffing and the running sizes are checked against the limits, so an
+oversized file (or a multi-file request over the combined limit) is abandoned
+as soon as it crosses the limit rather than after it has been received. Files
+are always spooled to disk. The resulting upload carries content_hash and
+header attributes, which document_cache, FileValidator and
+ContentAddressedStorage use instead of reading the bytes again.
+
+The handler is only installed on the CV upload views (see cv_upload_view);
+every other upload on the site keeps Django's default handlers and limits.
+"""
+
+import hashlib
+import logging
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler, StopUpload
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from .file_validators import FileValidator, HEADER_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class CVUploadHandler(TemporaryFileUploadHandler):
+    """Spool uploads to disk, hashing, capturing the header and enforcing the size limit on the way"""
+
+    max_file_size = FileValidator.MAX_FILE_SIZE
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        # Combined limit for multi-file uploads (see builder/multi_upload.py)
+        self.max_total_size = getattr(settings, 'MULTI_UPLOAD_MAX_TOTAL_SIZE', 20 * 1024 * 1024)
+        self.total_size = 0
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.sha256 = hashlib.sha256()
+        self.header = bytearray()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_file_size:
+            self._reject(
+                self.field_name, self.file_name,
+                f"File size exceeds maximum limit of {self.max_file_size // (1024*1024)}MB"
+            )
+        self.total_size += len(raw_data)
+        if self.total_size > self.max_total_size:
+            self._reject(
+                self.field_name, self.file_name,
+                f"Files exceed the combined limit of {self.max_total_size // (1024*1024)}MB"
+            )
+        self.sha256.update(raw_data)
+        if len(self.header) < HEADER_BYTES:
+            self.header += raw_data[:HEADER_BYTES - len(self.header)]
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.content_hash = self.sha256.hexdigest()
+        uploaded_file.header = bytes(self.header)
+        return uploaded_file
+
+    def _reject(self, field_name, file_name, message):
+        """Record why the file is missing and stop reading the request body"""
+        logger.warning(f"Upload {file_name} aborted: {message}")
+        if not hasattr(self.request, 'upload_errors'):
+            self.request.upload_errors = {}
+        self.request.upload_errors[field_name] = message
+        raise StopUpload(connection_reset=True)
+
+
+def cv_upload_view(view):
+    """
+    Decorate a view that receives CV files so its uploads go through CVUploadHandler
+
+    Upload handlers can't be changed once the CSRF check has read request.POST,
+    so the view is exempted from the middleware's check, the handler is
+    installed, and the check then runs inside the view as usual.
+    """
+    protected = csrf_protect(view)
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers = [CVUploadHandler(request)]
+        return protected(request, *args, **kwargs)
+    return wrapper
+
+
+def upload_error(request, field_name: str) -> Optional[str]:
+    """
+    Why a file field is missing from request.FILES, if the upload handler
+    rejected it; only meaningful once request.FILES has been read
+    """
+    return getattr(request, 'upload_errors', {}).get(field_name)
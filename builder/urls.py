@@ -3,6 +3,7 @@ from . import views
 
 from .views_template_preview import template_preview
 from .views_cv_editor import edit_cv_template, save_cv_draft
+from .views_upload_cvs import upload_cvs
 
 app_name = 'builder'
 
@@ -25,11 +26,16 @@ urlpatterns = [
     # New AI-powered features
     path('upload-cv/', views.upload_cv_analyzer, name='upload_cv'),
     path('upload-cv-enhanced/', views.upload_cv, name='upload_cv_enhanced'),
+    path('upload-cvs/', upload_cvs, name='upload_cvs'),
     path('ai-cover-letter/', views.ai_cover_letter, name='ai_cover_letter'),
     path('templates/', views.templates, name='templates'),
     path('templates/<str:template_name>/', views.load_cv_template, name='load_template'),
     path('cover-letter-templates/', views.cover_letter_templates, name='cover_letter_templates'),
     path('cv-analyzer/', views.cv_analyzer, name='cv_analyzer'),
+    path('analysis-status/<str:job_id>/', views.analysis_status, name='analysis_status'),
+    path('upload-status/<uuid:pk>/', views.upload_status, name='upload_status'),
+    path('ai-route-stats/', views.ai_route_stats, name='ai_route_stats'),
+    path('extraction-stats/', views.extraction_stats, name='extraction_stats'),
     path('cv/template/<str:template_name>/', views.load_cv_template, name='load_cv_template'),
     path('cv/save/', views.save_cv_content, name='save_cv_content'),
     path('template/<int:pk>/', views.template_detail, name='template_detail'),
@@ -39,6 +45,7 @@ urlpatterns = [
     # Enhanced AI features
     path('enhanced-ai-cover-letter/', views.enhanced_ai_cover_letter, name='enhanced_ai_cover_letter'),
     path('ajax/generate-cover-letter/', views.ajax_generate_cover_letter, name='ajax_generate_cover_letter'),
+    path('cover-letter-status/<str:job_id>/', views.cover_letter_status, name='cover_letter_status'),
     path('edit-letter/<uuid:pk>/', views.edit_generated_letter, name='edit_generated_letter'),
     path('cv-analysis/<int:pk>/', views.cv_analysis_detail, name='cv_analysis_detail'),
     
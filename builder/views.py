@@ -2,6 +2,7 @@ import json
 import logging
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.http import JsonResponse, HttpResponseNotFound, HttpResponse
 from django.template.loader import render_to_string
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
@@ -9,6 +10,16 @@ from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.contrib.auth import login
 from .ai_services import EnhancedAICoverLetterService
+from .analysis_jobs import start_analysis, start_cover_letter, get_job, get_upload_job_id
+from .cover_letter_drafts import default_cover_letter_template, render_draft
+from .file_handlers import (
+    TextExtractionError, UnsupportedFileTypeError, ExtractionUnavailableError, DEFAULT_MAX_CHARS
+)
+from .document_cache import validate_and_extract
+from .upload_handlers import cv_upload_view, upload_error
+from .model_router import get_router
+from .llm_schema import repair_metrics
+from .extraction_telemetry import extraction_summary, summary_since
 from .views_upload_cv_optimized import upload_cv_optimized
 from .views_upload_cv_analyzer import upload_cv_analyzer
 from .models import AICoverLetter, CVAnalysis, CV, UploadedCV, Template, Experience, Education, Project
@@ -88,30 +99,14 @@ def enhanced_ai_cover_letter(request):
                     except Exception as e:
                         cv_text = f"Error reading file: {str(e)}"
                 
-                # Generate cover letter
+                # Draft from a cover letter template right away; the tailored
+                # LLM letter replaces it in the background
                 service = EnhancedAICoverLetterService()
                 try:
-                    if not service.client:
-                        logger.error("OpenAI API key not configured")
-                        messages.error(request, "OpenAI API is not properly configured. Please try again later or contact support.")
-                        return render(request, 'builder/enhanced_ai_cover_letter.html', {'form': form})
-
-                    cv_insights = service.extract_cv_insights(cv_text)
-                    if not cv_insights:
-                        logger.error("Failed to extract CV insights")
-                        messages.error(request, "Failed to analyze CV. Please try again.")
-                        return render(request, 'builder/enhanced_ai_cover_letter.html', {'form': form})
-
+                    template = default_cover_letter_template(template_type)
+                    cover_letter, cv_insights = render_draft(cv_text, job_title, job_description, template)
                     job_match = service.match_cv_to_job(cv_insights, job_title, job_description)
-                    if not job_match:
-                        logger.error("Failed to match CV to job")
-                        messages.error(request, "Failed to match CV with job requirements. Please try again.")
-                        return render(request, 'builder/enhanced_ai_cover_letter.html', {'form': form})
 
-                    cover_letter = service.generate_tailored_cover_letter(
-                        cv_insights, job_match, job_title, job_description, tone, template_type
-                    )
-                
                     # Save to database
                     ai_cover_letter = AICoverLetter.objects.create(
                         user=request.user,
@@ -122,6 +117,15 @@ def enhanced_ai_cover_letter(request):
                         tone=tone,
                         template_type=template_type
                     )
+
+                    job_id = None
+                    if service.client:
+                        job_id = start_cover_letter(
+                            ai_cover_letter.pk, request.user.id, cover_letter, cv_text,
+                            job_title, job_description, tone, template_type
+                        )
+                    else:
+                        logger.warning("OpenAI API key not configured; returning template draft only")
                 except Exception as e:
                     logger.error(f"Error generating cover letter: {str(e)}")
                     messages.error(request, "An error occurred while generating your cover letter. Please try again.")
@@ -131,7 +135,8 @@ def enhanced_ai_cover_letter(request):
                     'cover_letter': cover_letter,
                     'cv_insights': cv_insights,
                     'job_match': job_match,
-                    'ai_cover_letter': ai_cover_letter
+                    'ai_cover_letter': ai_cover_letter,
+                    'cover_letter_job_id': job_id
                 })
                 
             except Exception as e:
@@ -186,6 +191,18 @@ def ajax_generate_cover_letter(request):
         if not all([job_title, job_description]):
             return JsonResponse({'error': 'Missing required fields'}, status=400)
         
+        if data.get('mode') == 'draft':
+            cover_letter, cv_insights = render_draft(
+                cv_text, job_title, job_description,
+                default_cover_letter_template(data.get('template_type'))
+            )
+            return JsonResponse({
+                'success': True,
+                'draft': True,
+                'cover_letter': cover_letter,
+                'cv_insights': cv_insights
+            })
+        
         logger.info(f"Starting AJAX cover letter generation for job: {job_title}")
         service = EnhancedAICoverLetterService()
         logger.info("AI service initialized for AJAX request")
@@ -497,12 +514,17 @@ def generate_cover_letter(request):
     return enhanced_ai_cover_letter(request)
 
 @login_required
+@cv_upload_view
 def upload_cv(request):
     """Upload CV view with file upload functionality"""
     from .forms import UploadedCVForm
     
     if request.method == 'POST':
         form = UploadedCVForm(request.POST, request.FILES)
+        rejected = upload_error(request, 'file')
+        if rejected:
+            messages.error(request, f"File validation failed: {rejected}")
+            return render(request, 'builder/upload_cv.html', {'form': form})
         if form.is_valid():
             try:
                 uploaded_cv = form.save(commit=False)
@@ -512,43 +534,21 @@ def upload_cv(request):
                 uploaded_file = request.FILES['file']
                 uploaded_cv.original_filename = uploaded_file.name
                 
-                # Validate file security
-                from .file_validators import FileValidator
+                # Validate and extract, reusing cached artifacts for identical bytes
                 try:
-                    FileValidator.validate_file(uploaded_file)
-                    actual_mime_type = FileValidator.get_file_type(uploaded_file)
+                    extraction = validate_and_extract(uploaded_file, max_chars=5000, for_storage=True)
                 except ValidationError as e:
                     messages.error(request, f"File validation failed: {str(e)}")
                     return redirect('builder:upload_cv')
+                except ExtractionUnavailableError as e:
+                    logger.warning(f"Extraction unavailable for {uploaded_file.name}: {str(e)}")
+                    messages.error(request, e.user_message)
+                    return render(request, 'builder/upload_cv.html', {'form': form})
                 
-                # Extract text from PDF/DOCX with proper error handling
                 try:
-                    if actual_mime_type == 'application/pdf':
-                        try:
-                            import PyPDF2
-                            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-                            text = ""
-                            for page in pdf_reader.pages:
-                                text += page.extract_text()
-                            uploaded_cv.extracted_text = text[:5000] if text.strip() else "No text found in PDF"
-                        except Exception as pdf_error:
-                            logger.error(f"PDF extraction failed: {str(pdf_error)}")
-                            uploaded_cv.extracted_text = "PDF text extraction failed"
-                            
-                    elif actual_mime_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword']:
-                        try:
-                            import docx
-                            doc = docx.Document(uploaded_file)
-                            text = ""
-                            for paragraph in doc.paragraphs:
-                                text += paragraph.text + "\n"
-                            uploaded_cv.extracted_text = text[:5000] if text.strip() else "No text found in document"
-                        except Exception as docx_error:
-                            logger.error(f"DOCX extraction failed: {str(docx_error)}")
-                            uploaded_cv.extracted_text = "Document text extraction failed"
-                    else:
-                        uploaded_cv.extracted_text = "Text extraction not supported for this format"
-                        
+                    uploaded_cv.extracted_text = extraction.text
+                    uploaded_cv.content_hash = extraction.content_hash
+                    uploaded_cv.sections = extraction.sections
                     uploaded_cv.processed = True
                     uploaded_cv.save()
                     
@@ -623,57 +623,45 @@ def cover_letter_templates(request):
     return render(request, 'builder/cover_letter_templates.html')
 
 @login_required
+@cv_upload_view
 def cv_analyzer(request):
     """CV Analyzer view with AI-powered analysis"""
     if request.method == 'POST':
         try:
             cv_file = request.FILES.get('cv_file')
             if not cv_file:
-                messages.error(request, 'Please upload a CV file.')
+                messages.error(request, upload_error(request, 'cv_file') or 'Please upload a CV file.')
                 return render(request, 'builder/cv_analyzer.html')
             
-            # Validate file
-            from .file_validators import FileValidator
+            # Validate and extract, reusing cached artifacts for identical bytes
             try:
-                FileValidator.validate_file(cv_file)
-                actual_mime_type = FileValidator.get_file_type(cv_file)
+                extraction = validate_and_extract(cv_file, max_chars=DEFAULT_MAX_CHARS)
             except ValidationError as e:
                 messages.error(request, f"File validation failed: {str(e)}")
                 return render(request, 'builder/cv_analyzer.html')
-            
-            # Extract text from CV
-            cv_text = ""
-            try:
-                if actual_mime_type == 'application/pdf':
-                    import PyPDF2
-                    pdf_reader = PyPDF2.PdfReader(cv_file)
-                    for page in pdf_reader.pages:
-                        cv_text += page.extract_text()
-                elif actual_mime_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword']:
-                    import docx
-                    doc = docx.Document(cv_file)
-                    for paragraph in doc.paragraphs:
-                        cv_text += paragraph.text + "\n"
-                else:
-                    messages.error(request, 'Unsupported file format.')
-                    return render(request, 'builder/cv_analyzer.html')
-                    
-                if not cv_text.strip():
-                    messages.error(request, 'No text found in the uploaded file.')
-                    return render(request, 'builder/cv_analyzer.html')
-                    
-            except Exception as e:
+            except UnsupportedFileTypeError:
+                messages.error(request, 'Unsupported file format.')
+                return render(request, 'builder/cv_analyzer.html')
+            except ExtractionUnavailableError as e:
+                logger.warning(f"Extraction unavailable for {cv_file.name}: {str(e)}")
+                messages.error(request, e.user_message)
+                return render(request, 'builder/cv_analyzer.html')
+            except TextExtractionError as e:
                 logger.error(f"Text extraction failed: {str(e)}")
                 messages.error(request, 'Failed to extract text from the CV. Please try a different file.')
                 return render(request, 'builder/cv_analyzer.html')
             
-            # Analyze CV using AI service
-            logger.info("Starting CV analysis...")
-            service = EnhancedAICoverLetterService()
+            cv_text = extraction.text
+            if not cv_text:
+                messages.error(request, 'No text found in the uploaded file.')
+                return render(request, 'builder/cv_analyzer.html')
             
-            # Get comprehensive analysis
-            analysis_data = service.analyze_cv_comprehensive(cv_text)
-            logger.info("CV analysis completed successfully")
+            # Render local scores now; LLM sections are polled in as they complete
+            logger.info("Starting CV analysis...")
+            analysis_data = extraction.analysis or start_analysis(
+                cv_text, request.user.id, content_hash=extraction.content_hash,
+                sections=extraction.sections
+            )
             
             return render(request, 'builder/cv_analyzer.html', {
                 'analysis': analysis_data,
@@ -687,6 +675,63 @@ def cv_analyzer(request):
     
     return render(request, 'builder/cv_analyzer.html')
 
+@login_required
+def analysis_status(request, job_id):
+    """Polling endpoint for background CV analysis jobs"""
+    job = get_job(job_id)
+    if not job or job.get('user_id') != request.user.id or 'analysis' not in job:
+        return JsonResponse({'error': 'Analysis not found'}, status=404)
+    
+    return JsonResponse({
+        'status': job['status'],
+        'analysis': job['analysis']
+    })
+
+@login_required
+def upload_status(request, pk):
+    """Polling endpoint for background upload processing"""
+    uploaded_cv = UploadedCV.objects.filter(pk=pk, user=request.user).only(
+        'processing_state', 'processing_error'
+    ).first()
+    if not uploaded_cv:
+        return JsonResponse({'error': 'Upload not found'}, status=404)
+    
+    return JsonResponse({
+        'state': uploaded_cv.processing_state,
+        'label': uploaded_cv.get_processing_state_display(),
+        'error': uploaded_cv.processing_error,
+        'job_id': get_upload_job_id(pk)
+    })
+
+@login_required
+def cover_letter_status(request, job_id):
+    """Polling endpoint for background cover letter generation"""
+    job = get_job(job_id)
+    if not job or job.get('user_id') != request.user.id or 'cover_letter' not in job:
+        return JsonResponse({'error': 'Cover letter not found'}, status=404)
+    
+    return JsonResponse({
+        'status': job['status'],
+        'cover_letter': job['cover_letter']
+    })
+
+@staff_member_required
+def ai_route_stats(request):
+    """Per-route model latency and JSON repair stats for this worker process"""
+    return JsonResponse({
+        'routes': get_router().stats(),
+        'json_repair': repair_metrics()
+    })
+
+@staff_member_required
+def extraction_stats(request):
+    """Extraction cost percentiles by format and size bucket over the last ?days= days"""
+    try:
+        since = summary_since(request.GET.get('days', 7))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(extraction_summary(since=since))
+
 def template_detail(request, pk):
     """Template detail view"""
     return render(request, 'builder/template_detail.html', {'pk': pk})
@@ -722,9 +767,7 @@ def delete_uploaded_cv(request, pk):
     
     if request.method == 'POST':
         try:
-            # Delete the file from storage
-            if uploaded_cv.file:
-                uploaded_cv.file.delete(save=False)
+            # The file's storage reference is released by the post_delete signal
             uploaded_cv.delete()
             messages.success(request, 'Uploaded CV deleted successfully!')
             return redirect('dashboard')
@@ -3,106 +3,73 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.exceptions import ValidationError
+from django.urls import reverse
 from .forms import UploadedCVForm
 from .models import UploadedCV, CVAnalysis
-from .ai_services import EnhancedAICoverLetterService
+from .file_validators import FileValidator
+from .upload_handlers import cv_upload_view, upload_error
+from .analysis_jobs import start_upload_processing, get_upload_job_id, get_job
 
 logger = logging.getLogger(__name__)
 
 @login_required
+@cv_upload_view
 def upload_cv_analyzer(request):
-    """Upload CV with integrated analyzer on the same page"""
+    """Upload CV with integrated analyzer on the same page
+    
+    The POST only validates the header and stores the file; extraction and
+    analysis run in the background and the page polls the upload status
+    endpoint, reloading with ?uploaded_cv=<id> once results are available.
+    """
     from .forms import UploadedCVForm
     
     if request.method == 'POST':
         form = UploadedCVForm(request.POST, request.FILES)
+        rejected = upload_error(request, 'file')
+        if rejected:
+            messages.error(request, f"File validation failed: {rejected}")
+            return render(request, 'builder/upload_cv_analyzer.html', {'form': form})
         if form.is_valid():
+            uploaded_file = request.FILES['file']
+            try:
+                FileValidator.validate(uploaded_file)
+            except ValidationError as e:
+                messages.error(request, f"File validation failed: {e.messages[0]}")
+                return render(request, 'builder/upload_cv_analyzer.html', {'form': form})
+            
             try:
                 uploaded_cv = form.save(commit=False)
                 uploaded_cv.user = request.user
-                
-                # Process the uploaded file
-                uploaded_file = request.FILES['file']
                 uploaded_cv.original_filename = uploaded_file.name
-                
-                # Validate file security
-                from .file_validators import FileValidator
-                try:
-                    FileValidator.validate_file(uploaded_file)
-                    actual_mime_type = FileValidator.get_file_type(uploaded_file)
-                except ValidationError as e:
-                    messages.error(request, f"File validation failed: {str(e)}")
-                    return render(request, 'builder/upload_cv_analyzer.html', {'form': form})
-                
-                # Fast text extraction with error handling
-                cv_text = ""
-                try:
-                    if actual_mime_type == 'application/pdf':
-                        try:
-                            import PyPDF2
-                            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-                            text = ""
-                            for page in pdf_reader.pages:
-                                text += page.extract_text() or ""
-                            cv_text = text[:3000] if text.strip() else "No text found in PDF"
-                        except Exception as pdf_error:
-                            logger.error(f"PDF extraction failed: {str(pdf_error)}")
-                            cv_text = "PDF text extraction failed"
-                            
-                    elif actual_mime_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword']:
-                        try:
-                            import docx
-                            doc = docx.Document(uploaded_file)
-                            text = ""
-                            for paragraph in doc.paragraphs:
-                                text += paragraph.text + "\n"
-                            cv_text = text[:3000] if text.strip() else "No text found in document"
-                        except Exception as docx_error:
-                            logger.error(f"DOCX extraction failed: {str(docx_error)}")
-                            cv_text = "Document text extraction failed"
-                    else:
-                        cv_text = "Text extraction not supported for this format"
-                        
-                    uploaded_cv.extracted_text = cv_text
-                    uploaded_cv.title = form.cleaned_data.get('title', '')
-                    uploaded_cv.description = form.cleaned_data.get('description', '')
-                    uploaded_cv.processed = True
-                    uploaded_cv.save()
-                    
-                    # Generate actual CV analysis using AI service
-                    service = EnhancedAICoverLetterService()
-                    analysis = service.analyze_cv_comprehensive(cv_text)
-                    
-                    # Create CV analysis record
-                    cv_analysis = CVAnalysis.objects.create(
-                        uploaded_cv=uploaded_cv,
-                        overall_score=analysis.get('overall_score', 75),
-                        strengths=analysis.get('strengths', ['Good structure', 'Clear formatting']),
-                        improvements=analysis.get('weaknesses', ['Add more keywords', 'Include metrics']),
-                        keywords={'present': analysis.get('skills', []), 'missing': []},
-                        experience_level=analysis.get('experience_level', 'Mid-level'),
-                        ats_compatibility=analysis.get('ats_score', 80)
-                    )
-                    
-                    return render(request, 'builder/upload_cv_analyzer.html', {
-                        'analysis': analysis,
-                        'uploaded_cv': uploaded_cv,
-                        'cv_analysis': cv_analysis,
-                        'form': form
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"File processing failed: {str(e)}")
-                    uploaded_cv.extracted_text = f"Error processing file: {str(e)}"
-                    uploaded_cv.save()
-                    
+                uploaded_cv.content_hash = getattr(uploaded_file, 'content_hash', None) or ''
+                uploaded_cv.processing_state = 'queued'
+                uploaded_cv.save()
+                start_upload_processing(uploaded_cv.pk, request.user.id)
             except Exception as e:
                 logger.error(f"Upload failed: {str(e)}")
                 return render(request, 'builder/upload_cv_analyzer.html', {
                     'form': form,
                     'error': 'Upload failed. Please try again.'
                 })
+            
+            return redirect(f"{reverse('builder:upload_cv')}?uploaded_cv={uploaded_cv.pk}")
     else:
         form = UploadedCVForm()
     
-    return render(request, 'builder/upload_cv_analyzer.html', {'form': form})
+    context = {'form': form}
+    uploaded_cv_id = request.GET.get('uploaded_cv')
+    if request.method == 'GET' and uploaded_cv_id:
+        try:
+            uploaded_cv = UploadedCV.objects.filter(pk=uploaded_cv_id, user=request.user).first()
+        except ValidationError:
+            uploaded_cv = None  # not a UUID
+        if uploaded_cv:
+            context['uploaded_cv'] = uploaded_cv
+            job = get_job(get_upload_job_id(uploaded_cv.pk) or '')
+            if job and job.get('user_id') == request.user.id:
+                context['analysis'] = job['analysis']
+                context['cv_analysis'] = CVAnalysis.objects.filter(uploaded_cv=uploaded_cv).first()
+            elif uploaded_cv.processing_state == 'failed':
+                messages.error(request, uploaded_cv.processing_error or 'Upload failed. Please try again.')
+    
+    return render(request, 'builder/upload_cv_analyzer.html', context)
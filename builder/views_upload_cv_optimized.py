@@ -5,17 +5,25 @@ from django.contrib import messages
 from django.core.exceptions import ValidationError
 from .forms import UploadedCVForm
 from .models import UploadedCV, CVAnalysis
+from .file_handlers import ExtractionUnavailableError
+from .document_cache import validate_and_extract
+from .upload_handlers import cv_upload_view, upload_error
 from .ai_services import EnhancedAICoverLetterService
 
 logger = logging.getLogger(__name__)
 
 @login_required
+@cv_upload_view
 def upload_cv_optimized(request):
     """Optimized upload CV view with integrated analysis"""
     from .forms import UploadedCVForm
     
     if request.method == 'POST':
         form = UploadedCVForm(request.POST, request.FILES)
+        rejected = upload_error(request, 'file')
+        if rejected:
+            messages.error(request, f"File validation failed: {rejected}")
+            return render(request, 'builder/upload_cv_enhanced.html', {'form': form})
         if form.is_valid():
             try:
                 uploaded_cv = form.save(commit=False)
@@ -25,45 +33,22 @@ def upload_cv_optimized(request):
                 uploaded_file = request.FILES['file']
                 uploaded_cv.original_filename = uploaded_file.name
                 
-                # Validate file security
-                from .file_validators import FileValidator
+                # Validate and extract, reusing cached artifacts for identical bytes
                 try:
-                    FileValidator.validate_file(uploaded_file)
-                    actual_mime_type = FileValidator.get_file_type(uploaded_file)
+                    extraction = validate_and_extract(uploaded_file, max_chars=3000, for_storage=True)
                 except ValidationError as e:
                     messages.error(request, f"File validation failed: {str(e)}")
                     return render(request, 'builder/upload_cv_enhanced.html', {'form': form})
+                except ExtractionUnavailableError as e:
+                    logger.warning(f"Extraction unavailable for {uploaded_file.name}: {str(e)}")
+                    messages.error(request, e.user_message)
+                    return render(request, 'builder/upload_cv_enhanced.html', {'form': form})
                 
-                # Fast text extraction with error handling
-                cv_text = ""
                 try:
-                    if actual_mime_type == 'application/pdf':
-                        try:
-                            import PyPDF2
-                            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-                            text = ""
-                            for page in pdf_reader.pages:
-                                text += page.extract_text()
-                            cv_text = text[:3000] if text.strip() else "No text found in PDF"
-                        except Exception as pdf_error:
-                            logger.error(f"PDF extraction failed: {str(pdf_error)}")
-                            cv_text = "PDF text extraction failed"
-                            
-                    elif actual_mime_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword']:
-                        try:
-                            import docx
-                            doc = docx.Document(uploaded_file)
-                            text = ""
-                            for paragraph in doc.paragraphs:
-                                text += paragraph.text + "\n"
-                            cv_text = text[:3000] if text.strip() else "No text found in document"
-                        except Exception as docx_error:
-                            logger.error(f"DOCX extraction failed: {str(docx_error)}")
-                            cv_text = "Document text extraction failed"
-                    else:
-                        cv_text = "Text extraction not supported for this format"
-                        
+                    cv_text = extraction.text
                     uploaded_cv.extracted_text = cv_text
+                    uploaded_cv.content_hash = extraction.content_hash
+                    uploaded_cv.sections = extraction.sections
                     uploaded_cv.processed = True
                     uploaded_cv.save()
                     
@@ -0,0 +1,39 @@
+import logging
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.core.exceptions import ValidationError
+from .multi_upload import expand_uploads, process_uploads, upload_budget
+from .upload_handlers import cv_upload_view, upload_error
+
+logger = logging.getLogger(__name__)
+
+@login_required
+@cv_upload_view
+def upload_cvs(request):
+    """Upload several CVs or zip files of CVs at once
+    
+    The page streams results from the bulk upload API as each file finishes;
+    a plain form post (no JavaScript) is processed here and shows every
+    result once the last file is done.
+    """
+    budget = upload_budget()
+    context = {
+        'max_files': budget['max_files'],
+        'max_total_mb': budget['max_total_size'] // (1024 * 1024),
+    }
+    
+    if request.method == 'POST':
+        files = request.FILES.getlist('files')
+        rejected = upload_error(request, 'files')
+        if rejected:
+            messages.error(request, f"File validation failed: {rejected}")
+        elif not files:
+            messages.error(request, 'Please choose at least one CV.')
+        else:
+            try:
+                context['results'] = list(process_uploads(request.user, expand_uploads(files)))
+            except ValidationError as e:
+                messages.error(request, f"File validation failed: {e.messages[0]}")
+    
+    return render(request, 'builder/upload_cvs.html', context)
@@ -98,6 +98,16 @@ if 'DATABASE_URL' in os.environ:
         conn_health_checks=True,
     )
 
+# Cache
+# Background analysis jobs are polled through the cache, so multi-worker
+# deployments should point this at a shared backend (e.g. Redis).
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='cv-builder'),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -118,6 +128,19 @@ AUTH_PASSWORD_VALIDATORS = [
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 100
+# Multi-file and zip uploads (see builder/multi_upload.py)
+MULTI_UPLOAD_MAX_FILES = config('MULTI_UPLOAD_MAX_FILES', default=10, cast=int)
+MULTI_UPLOAD_MAX_TOTAL_SIZE = config('MULTI_UPLOAD_MAX_TOTAL_SIZE', default=20 * 1024 * 1024, cast=int)
+MULTI_UPLOAD_WORKERS = config('MULTI_UPLOAD_WORKERS', default=4, cast=int)
+# Resumable chunked uploads (see builder/chunked_uploads.py); staged under the
+# system temp directory unless CHUNKED_UPLOAD_DIR is set
+CHUNKED_UPLOAD_CHUNK_SIZE = config('CHUNKED_UPLOAD_CHUNK_SIZE', default=512 * 1024, cast=int)
+CHUNKED_UPLOAD_DIR = config('CHUNKED_UPLOAD_DIR', default='')
+CHUNKED_UPLOAD_EXPIRY_HOURS = config('CHUNKED_UPLOAD_EXPIRY_HOURS', default=24, cast=int)
+# Near-duplicate uploads reuse an earlier analysis (see builder/near_duplicates.py);
+# distance is in bits of a 64-bit SimHash, at most 7
+NEAR_DUPLICATE_REUSE = config('NEAR_DUPLICATE_REUSE', default=True, cast=bool)
+NEAR_DUPLICATE_MAX_DISTANCE = config('NEAR_DUPLICATE_MAX_DISTANCE', default=6, cast=int)
 
 # Internationalization
 LANGUAGE_CODE = 'en-us'
@@ -148,6 +171,35 @@ LOGOUT_REDIRECT_URL = '/'
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 os.environ['OPENAI_API_KEY'] = OPENAI_API_KEY  # Make sure it's available in environment
 
+# AI model routing (see builder/model_router.py). Tiers are ordered fastest
+# first; routes pick a tier and max_tokens per service method.
+AI_MODEL_TIERS = [
+    {'name': 'fast', 'model': config('AI_MODEL_FAST', default='gpt-3.5-turbo')},
+    {'name': 'standard', 'model': config('AI_MODEL_STANDARD', default='gpt-4o-mini')},
+]
+
+# CV text extraction runs in an isolated process pool (see builder/extraction_pool.py)
+EXTRACTION_POOL_ENABLED = config('EXTRACTION_POOL_ENABLED', default=True, cast=bool)
+EXTRACTION_POOL_WORKERS = config('EXTRACTION_POOL_WORKERS', default=2, cast=int)
+EXTRACTION_MAX_QUEUE = config('EXTRACTION_MAX_QUEUE', default=8, cast=int)
+EXTRACTION_TIMEOUT_SECONDS = config('EXTRACTION_TIMEOUT_SECONDS', default=15, cast=float)
+EXTRACTION_MEMORY_LIMIT_MB = config('EXTRACTION_MEMORY_LIMIT_MB', default=1024, cast=int)
+EXTRACTION_MAX_TASKS_PER_WORKER = config('EXTRACTION_MAX_TASKS_PER_WORKER', default=50, cast=int)
+# Splitting long PDFs into page ranges across workers; off until
+# `manage.py benchmark_pdf_extraction` on real multi-page CVs shows a speedup.
+# PDFs with at least EXTRACTION_PARALLEL_PAGE_THRESHOLD pages are then split.
+EXTRACTION_PARALLEL_PAGES_ENABLED = config('EXTRACTION_PARALLEL_PAGES_ENABLED', default=False, cast=bool)
+EXTRACTION_PARALLEL_PAGE_THRESHOLD = config('EXTRACTION_PARALLEL_PAGE_THRESHOLD', default=8, cast=int)
+EXTRACTION_PAGES_PER_TASK = config('EXTRACTION_PAGES_PER_TASK', default=2, cast=int)
+# Store size, pages, wall time and memory per extraction (see builder/extraction_telemetry.py)
+EXTRACTION_TELEMETRY_ENABLED = config('EXTRACTION_TELEMETRY_ENABLED', default=True, cast=bool)
+# Backend order per MIME type, written by `manage.py benchmark_extractors --write-policy`
+EXTRACTOR_POLICY_FILE = config('EXTRACTOR_POLICY_FILE', default=str(BASE_DIR / 'extractor_policy.json'))
+
+# One NER-only spaCy pipeline per process (see builder/nlp.py), loaded in the gunicorn master
+SPACY_MODEL = config('SPACY_MODEL', default='en_core_web_sm')
+SPACY_PRELOAD = config('SPACY_PRELOAD', default=True, cast=bool)
+
 # Crispy Forms configuration removed as crispy-forms is not used
 
 # Security settings for production
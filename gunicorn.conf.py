@@ -0,0 +1,18 @@
+"""
+Gunicorn settings, read from the working directory at start-up.
+
+on_starting runs in the master before any worker is forked. Loading the spaCy
+model there lets every worker share one copy of it instead of each loading
+its own on first use. Set SPACY_PRELOAD=False to skip it.
+"""
+import os
+
+
+def on_starting(server):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    django.setup()
+
+    from builder.nlp import preload_nlp
+    if preload_nlp():
+        server.log.info("spaCy model loaded before forking workers")